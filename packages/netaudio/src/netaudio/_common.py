@@ -6,14 +6,21 @@ import io
 import json as json_module
 import xml.etree.ElementTree as ET
 from contextlib import asynccontextmanager
-from fnmatch import fnmatch
 from typing import Any, Callable, Optional
 
 import typer
 
 from netaudio import DanteBrowser, DanteDevice
 from netaudio.common.app_config import settings
-from netaudio.daemon.client import device_request_via_daemon, get_devices_from_daemon
+from netaudio.daemon.client import (
+    DaemonRequestError,
+    device_request_via_daemon,
+    device_requests_via_daemon,
+    get_device_views_from_daemon,
+    get_devices_from_daemon,
+)
+from netaudio.daemon.query import DeviceQuery
+from netaudio.daemon.wire import DeviceMap
 from netaudio.dante.application import DanteApplication
 from netaudio.dante.const import DEVICE_CONTROL_PORT, DEVICE_SETTINGS_PORT, SERVICE_ARC
 
@@ -83,14 +90,33 @@ def _get_state():
     return state
 
 
-async def _discover() -> dict[str, DanteDevice]:
-    devices = await get_devices_from_daemon()
+def _device_query(fields: tuple[str, ...] | None = None, filtered: bool = True) -> DeviceQuery:
+    if not filtered:
+        return DeviceQuery(fields=list(fields) if fields is not None else None)
+
+    state = _get_state()
+    return DeviceQuery(
+        names=list(state.names),
+        server_names=list(state.server_names),
+        hosts=list(state.hosts),
+        macs=list(state.macs),
+        fields=list(fields) if fields is not None else None,
+    )
+
+
+async def _discover(filtered: bool = False, fields: tuple[str, ...] | None = None) -> dict[str, DanteDevice]:
+    # Filtered callers only read the devices matched by the CLI filters, so the
+    # daemon can select and project them instead of sending the whole registry
+    devices = await get_devices_from_daemon(_device_query(fields, filtered))
 
     if devices is None:
         application = DanteApplication()
         await application.startup()
         try:
-            devices = await application.discover_and_populate(timeout=settings.mdns_timeout)
+            devices = await application.discover_and_populate(
+                timeout=settings.mdns_timeout,
+                expect=settings.expect_devices,
+            )
         finally:
             await application.shutdown()
 
@@ -101,6 +127,40 @@ def discover() -> dict[str, DanteDevice]:
     return asyncio.run(_discover())
 
 
+async def _discover_stream():
+    # Streaming output only reads devices, so the daemon's read-only views are enough
+    devices = await get_device_views_from_daemon(_device_query())
+
+    if devices is not None:
+        for _, device in sort_devices(devices):
+            yield device
+        return
+
+    application = DanteApplication()
+    await application.startup()
+    try:
+        async for device in application.discover_stream(
+            timeout=settings.mdns_timeout,
+            expect=settings.expect_devices,
+        ):
+            yield device
+    finally:
+        await application.shutdown()
+
+
+def stream_devices(handle_device: Callable[[DanteDevice], None]) -> int:
+    async def _run() -> int:
+        count = 0
+        async for device in _discover_stream():
+            if not filter_devices({device.server_name: device}):
+                continue
+            handle_device(device)
+            count += 1
+        return count
+
+    return asyncio.run(_run())
+
+
 def _get_arc_port(device: DanteDevice) -> int:
     if device.services:
         for service_data in device.services.values():
@@ -126,6 +186,30 @@ async def _send_via_daemon(packet: bytes, device_ip, port: int) -> bytes | None:
     return await device_request_via_daemon(packet, str(device_ip), port)
 
 
+async def _send_all(send: Callable, requests: list[tuple[bytes, Any, int]]) -> list[bytes | None]:
+    if send is _send_via_daemon:
+        try:
+            responses = await device_requests_via_daemon(requests)
+        except DaemonRequestError as e:
+            typer.echo(f"Error: {e}", err=True)
+            raise typer.Exit(code=ExitCode.ERROR)
+        # None means the daemon never ran the batch, so sending each request is safe
+        if responses is not None:
+            return responses
+
+    responses: list[bytes | None] = [None] * len(requests)
+    by_device: dict[str, list[int]] = {}
+    for index, (_, device_ip, _) in enumerate(requests):
+        by_device.setdefault(str(device_ip), []).append(index)
+
+    async def _send_device(indexes: list[int]) -> None:
+        for index in indexes:
+            responses[index] = await send(*requests[index])
+
+    await asyncio.gather(*[_send_device(indexes) for indexes in by_device.values()])
+    return responses
+
+
 def _make_app_sender(app: DanteApplication) -> Callable:
     async def _send(packet: bytes, device_ip, port: int) -> bytes | None:
         ip = str(device_ip)
@@ -169,11 +253,10 @@ def _make_capture_store():
 
 
 @asynccontextmanager
-async def _command_context():
-    state = _get_state()
+async def _command_context(filtered: bool = False, fields: tuple[str, ...] | None = None):
     store, session_id = _make_capture_store()
 
-    devices = await get_devices_from_daemon()
+    devices = await get_devices_from_daemon(_device_query(fields, filtered))
     if devices is not None:
         if store and session_id:
             typer.echo(f"Capture: recording to session #{session_id} (via daemon — request only)", err=True)
@@ -190,7 +273,7 @@ async def _command_context():
 
     await app.startup()
     try:
-        devices = await app.discover_and_populate(timeout=settings.mdns_timeout)
+        devices = await app.discover_and_populate(timeout=settings.mdns_timeout, expect=settings.expect_devices)
         if store and session_id:
             typer.echo(f"Capture: recording to session #{session_id}", err=True)
         yield devices or {}, _make_app_sender(app)
@@ -201,6 +284,10 @@ async def _command_context():
 
 
 async def _populate_controls(devices: dict[str, DanteDevice]) -> None:
+    # Daemon devices arrive populated and have no application to populate them with
+    if isinstance(devices, DeviceMap):
+        return
+
     unpopulated = {
         server_name: device
         for server_name, device in devices.items()
@@ -225,53 +312,8 @@ async def _populate_controls(devices: dict[str, DanteDevice]) -> None:
         await application.shutdown()
 
 
-def _normalize_mac(mac: str) -> str:
-    raw = mac.replace(":", "").replace("-", "").replace(".", "").lower()
-    if len(raw) == 16 and raw[6:10] == "fffe":
-        raw = raw[:6] + raw[10:]
-    elif len(raw) == 16 and raw.endswith("0000"):
-        raw = raw[:12]
-    return raw
-
-
-def _strip_separators(mac: str) -> str:
-    return mac.replace(":", "").replace("-", "").replace(".", "").lower()
-
-
-def _mac_matches(device_mac: str, pattern: str) -> bool:
-    raw_device = _strip_separators(device_mac)
-    raw_pattern = _strip_separators(pattern)
-
-    if raw_device == raw_pattern:
-        return True
-
-    return _normalize_mac(device_mac) == _normalize_mac(pattern)
-
-
 def filter_devices(devices: dict[str, DanteDevice]) -> dict[str, DanteDevice]:
-    state = _get_state()
-
-    if not state.names and not state.hosts and not state.server_names and not state.macs:
-        return devices
-
-    filtered = {}
-
-    for server_name, device in devices.items():
-        if state.names and not any(fnmatch(device.name or "", pat) for pat in state.names):
-            continue
-
-        if state.hosts and not any(str(device.ipv4) == h for h in state.hosts):
-            continue
-
-        if state.server_names and not any(fnmatch(server_name, pat) for pat in state.server_names):
-            continue
-
-        if state.macs and not any(_mac_matches(device.mac_address or "", pat) for pat in state.macs):
-            continue
-
-        filtered[server_name] = device
-
-    return filtered
+    return _device_query().select(devices)
 
 
 def sort_devices(devices: dict[str, DanteDevice]) -> list[tuple[str, DanteDevice]]:
@@ -285,6 +327,10 @@ def sort_devices(devices: dict[str, DanteDevice]) -> list[tuple[str, DanteDevice
         "server-name": lambda item: item[0],
     }
 
+    if isinstance(devices, DeviceMap):
+        views = sorted(devices.views().items(), key=sort_keys[state.sort_field], reverse=state.sort_reverse)
+        return [(server_name, devices[server_name]) for server_name, _ in views]
+
     return sorted(devices.items(), key=sort_keys[state.sort_field], reverse=state.sort_reverse)
 
 
@@ -450,6 +496,79 @@ def output_table(
         typer.echo(_format_yaml(json_data))
 
 
+STREAM_MIN_COLUMN_WIDTH = 12
+
+
+class StreamOutput:
+    def __init__(self, headers: list[str], title: Optional[str] = None):
+        from netaudio.cli import OutputFormat
+
+        self.headers = headers
+        self.title = title
+        self.output_format = _get_state().output_format
+        self._streaming = self.output_format in (
+            OutputFormat.plain,
+            OutputFormat.table,
+            OutputFormat.csv,
+            OutputFormat.json,
+        )
+        self._header_written = False
+        self._widths: list[int] = []
+        self._rows: list[list[str]] = []
+        self._json_data: list[Any] = []
+
+    def emit(self, rows: list[list[str]], json_data: Any = None) -> None:
+        from netaudio.cli import OutputFormat
+
+        if json_data is None:
+            json_data = [dict(zip(self.headers, row)) for row in rows]
+
+        if not self._streaming:
+            self._rows.extend(rows)
+            self._json_data.extend(json_data)
+            return
+
+        if self.output_format == OutputFormat.json:
+            for item in json_data:
+                typer.echo(json_module.dumps(item, default=str))
+            return
+
+        if self.output_format == OutputFormat.csv:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            if not self._header_written:
+                writer.writerow(self.headers)
+            writer.writerows(rows)
+            self._header_written = True
+            typer.echo(buffer.getvalue().rstrip("\n"))
+            return
+
+        # Later rows are not known yet, so columns start at the header width and widen to fit
+        text_rows = [[str(value) for value in row] for row in rows]
+        if not self._header_written:
+            display_headers = _iconize_headers(self.headers)
+            self._widths = [max(len(header), STREAM_MIN_COLUMN_WIDTH) for header in display_headers]
+            for row in text_rows:
+                self._widen(row)
+            typer.echo(self._format_row(display_headers))
+            self._header_written = True
+
+        for row in text_rows:
+            self._widen(row)
+            typer.echo(self._format_row(row))
+
+    def _widen(self, row: list[str]) -> None:
+        for index, value in enumerate(row[: len(self._widths)]):
+            self._widths[index] = max(self._widths[index], len(value))
+
+    def _format_row(self, row: list[str]) -> str:
+        return "  ".join(value.ljust(width) for value, width in zip(row, self._widths)).rstrip()
+
+    def close(self) -> None:
+        if not self._streaming and self._rows:
+            output_table(self.headers, self._rows, json_data=self._json_data, title=self.title)
+
+
 def output_single(data: Any, device: Optional[DanteDevice] = None) -> None:
     from netaudio.cli import OutputFormat
     state = _get_state()
@@ -470,13 +589,16 @@ def output_single(data: Any, device: Optional[DanteDevice] = None) -> None:
 
 
 def find_device(devices: dict[str, DanteDevice], identifier: str) -> Optional[DanteDevice]:
-    for server_name, device in devices.items():
+    # Daemon devices are matched on their views so only the match is materialised
+    candidates = devices.views() if isinstance(devices, DeviceMap) else devices
+
+    for server_name, device in candidates.items():
         if device.name == identifier:
-            return device
+            return devices[server_name]
         if device.ipv4 and str(device.ipv4) == identifier:
-            return device
+            return devices[server_name]
         if server_name == identifier or server_name.startswith(identifier + "."):
-            return device
+            return devices[server_name]
 
     return None
 
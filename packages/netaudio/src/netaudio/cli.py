@@ -139,6 +139,7 @@ def _global_options(
     sort: str = typer.Option("mac", "--sort", help="Sort field[:asc|desc]. Fields: mac, name, ip, model, server-name.", envvar="NETAUDIO_SORT"),
     no_color: bool = typer.Option(False, "--no-color", help="Disable colored output.", envvar="NETAUDIO_NO_COLOR"),
     timeout: float = typer.Option(5.0, "--timeout", help="mDNS discovery timeout in seconds.", envvar="NETAUDIO_TIMEOUT"),
+    expect: Optional[int] = typer.Option(None, "--expect", min=1, help="Stop discovery once this many devices are ready.", envvar="NETAUDIO_EXPECT"),
     lock_state_timeout: float = typer.Option(4.0, "--lock-state-timeout", help="Lock state collection timeout in seconds.", envvar="NETAUDIO_LOCK_STATE_TIMEOUT"),
     interface: Optional[str] = typer.Option(None, "--interface", help="Network interface to use.", envvar="NETAUDIO_INTERFACE"),
     log_level: str = typer.Option("WARNING", "--log-level", help="Log level (DEBUG, INFO, WARNING, ERROR).", envvar="NETAUDIO_LOG_LEVEL"),
@@ -167,6 +168,7 @@ def _global_options(
 
     settings.lock_state_timeout = lock_state_timeout
     settings.mdns_timeout = timeout
+    settings.expect_devices = expect
     settings.no_color = no_color
 
     if interface:
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import asyncio
+import json
 from typing import Optional
 
 import typer
 
+from netaudio.daemon.query import CONTROL_FIELDS
 from netaudio.dante.device_commands import DanteDeviceCommands
 
 from netaudio._common import (
@@ -18,6 +20,7 @@ from netaudio._common import (
     output_single,
     output_table,
     sort_devices,
+    stream_devices,
 )
 from netaudio._exit_codes import ExitCode
 from netaudio.icons import icon
@@ -25,12 +28,71 @@ from netaudio.icons import icon
 app = typer.Typer(help="Manage device channels.", no_args_is_help=True)
 
 
+def _channel_list_data(device) -> dict:
+    return {
+        "name": device.name,
+        "tx_channels": {
+            channel.name: {"number": channel.number, "name": channel.name, "friendly_name": channel.friendly_name}
+            for channel in sorted(device.tx_channels.values(), key=lambda channel: channel.number)
+        },
+        "rx_channels": {
+            channel.name: {"number": channel.number, "name": channel.name, "friendly_name": channel.friendly_name}
+            for channel in sorted(device.rx_channels.values(), key=lambda channel: channel.number)
+        },
+    }
+
+
+def _output_channel_tables(server_name: str, device) -> None:
+    device_label = device.name or server_name
+
+    if device.tx_channels:
+        headers = ["#", "Name", "Friendly Name"]
+        rows = [
+            [str(channel.number), channel.name, channel.friendly_name or ""]
+            for channel in sorted(device.tx_channels.values(), key=lambda channel: channel.number)
+        ]
+        output_table(headers, rows, title=f"{device_label} TX Channels")
+
+    if device.rx_channels:
+        headers = ["#", "Name", "Friendly Name"]
+        rows = [
+            [str(channel.number), channel.name, channel.friendly_name or ""]
+            for channel in sorted(device.rx_channels.values(), key=lambda channel: channel.number)
+        ]
+        output_table(headers, rows, title=f"{device_label} RX Channels")
+
+
+def _channel_list_stream() -> None:
+    from netaudio.cli import OutputFormat, state
+
+    data = {}
+
+    def _emit(device) -> None:
+        if state.output_format == OutputFormat.json:
+            typer.echo(json.dumps({device.server_name: _channel_list_data(device)}, default=str))
+        elif state.output_format in (OutputFormat.xml, OutputFormat.yaml):
+            data[device.server_name] = _channel_list_data(device)
+        else:
+            _output_channel_tables(device.server_name, device)
+
+    stream_devices(_emit)
+
+    if data:
+        output_single(data)
+
+
 @app.command("list")
-def channel_list():
+def channel_list(
+    stream: bool = typer.Option(False, "--stream", help="Print each device's channels as soon as they have been queried."),
+):
     """List channels on devices."""
 
+    if stream:
+        _channel_list_stream()
+        return
+
     async def _run():
-        devices = await _discover()
+        devices = await _discover(filtered=True, fields=CONTROL_FIELDS)
         await _populate_controls(devices)
         devices = filter_devices(devices)
 
@@ -39,38 +101,12 @@ def channel_list():
         if state.output_format in (OutputFormat.json, OutputFormat.xml, OutputFormat.yaml):
             data = {}
             for server_name, device in sort_devices(devices):
-                data[server_name] = {
-                    "name": device.name,
-                    "tx_channels": {
-                        channel.name: {"number": channel.number, "name": channel.name, "friendly_name": channel.friendly_name}
-                        for channel in sorted(device.tx_channels.values(), key=lambda channel: channel.number)
-                    },
-                    "rx_channels": {
-                        channel.name: {"number": channel.number, "name": channel.name, "friendly_name": channel.friendly_name}
-                        for channel in sorted(device.rx_channels.values(), key=lambda channel: channel.number)
-                    },
-                }
+                data[server_name] = _channel_list_data(device)
             output_single(data)
             return
 
         for server_name, device in sort_devices(devices):
-            device_label = device.name or server_name
-
-            if device.tx_channels:
-                headers = ["#", "Name", "Friendly Name"]
-                rows = [
-                    [str(channel.number), channel.name, channel.friendly_name or ""]
-                    for channel in sorted(device.tx_channels.values(), key=lambda channel: channel.number)
-                ]
-                output_table(headers, rows, title=f"{device_label} TX Channels")
-
-            if device.rx_channels:
-                headers = ["#", "Name", "Friendly Name"]
-                rows = [
-                    [str(channel.number), channel.name, channel.friendly_name or ""]
-                    for channel in sorted(device.rx_channels.values(), key=lambda channel: channel.number)
-                ]
-                output_table(headers, rows, title=f"{device_label} RX Channels")
+            _output_channel_tables(server_name, device)
 
     asyncio.run(_run())
 
@@ -86,7 +122,7 @@ def name(
     commands = DanteDeviceCommands()
 
     async def _run():
-        async with _command_context() as (devices, send):
+        async with _command_context(filtered=True, fields=CONTROL_FIELDS) as (devices, send):
             filtered = filter_devices(devices)
             server_name, device = _resolve_one(filtered)
 
@@ -124,7 +160,7 @@ def gain(
     commands = DanteDeviceCommands()
 
     async def _run():
-        async with _command_context() as (devices, send):
+        async with _command_context(filtered=True, fields=CONTROL_FIELDS) as (devices, send):
             filtered = filter_devices(devices)
             server_name, device = _resolve_one(filtered)
 
@@ -8,6 +8,7 @@ from typing import Optional
 
 import typer
 
+from netaudio.daemon.query import SUMMARY_FIELDS
 from netaudio.dante.device_commands import DanteDeviceCommands
 
 from netaudio._common import (
@@ -15,6 +16,7 @@ from netaudio._common import (
     _discover,
     _get_arc_port,
     _populate_controls,
+    _send_all,
     filter_devices,
     output_single,
     output_table,
@@ -111,7 +113,7 @@ def sample_rate(
     commands = DanteDeviceCommands()
 
     async def _run():
-        async with _command_context() as (devices, send):
+        async with _command_context(filtered=True, fields=SUMMARY_FIELDS) as (devices, send):
             filtered = filter_devices(devices)
             targets = _resolve_targets(filtered, all_devices)
 
@@ -130,8 +132,7 @@ def sample_rate(
                 raise typer.Exit(code=ExitCode.ERROR)
 
             packet, _, port = commands.command_set_sample_rate(rate)
-            for server_name, device in targets:
-                await send(packet, device.ipv4, port)
+            await _send_all(send, [(packet, device.ipv4, port) for _, device in targets])
 
     asyncio.run(_run())
 
@@ -146,7 +147,7 @@ def encoding(
     commands = DanteDeviceCommands()
 
     async def _run():
-        async with _command_context() as (devices, send):
+        async with _command_context(filtered=True, fields=SUMMARY_FIELDS) as (devices, send):
             filtered = filter_devices(devices)
             targets = _resolve_targets(filtered, all_devices)
 
@@ -165,8 +166,7 @@ def encoding(
                 raise typer.Exit(code=ExitCode.ERROR)
 
             packet, _, port = commands.command_set_encoding(bits)
-            for server_name, device in targets:
-                await send(packet, device.ipv4, port)
+            await _send_all(send, [(packet, device.ipv4, port) for _, device in targets])
 
     asyncio.run(_run())
 
@@ -181,7 +181,7 @@ def latency(
     commands = DanteDeviceCommands()
 
     async def _run():
-        async with _command_context() as (devices, send):
+        async with _command_context(filtered=True, fields=SUMMARY_FIELDS) as (devices, send):
             filtered = filter_devices(devices)
             targets = _resolve_targets(filtered, all_devices)
 
@@ -196,9 +196,7 @@ def latency(
                 return
 
             packet, service_type = commands.command_set_latency(value)
-            for server_name, device in targets:
-                arc_port = _get_arc_port(device)
-                await send(packet, device.ipv4, arc_port)
+            await _send_all(send, [(packet, device.ipv4, _get_arc_port(device)) for _, device in targets])
 
     asyncio.run(_run())
 
@@ -225,7 +223,7 @@ def aes67(
     commands = DanteDeviceCommands()
 
     async def _run():
-        async with _command_context() as (devices, send):
+        async with _command_context(filtered=True, fields=SUMMARY_FIELDS) as (devices, send):
             filtered = filter_devices(devices)
             targets = _resolve_targets(filtered, all_devices)
 
@@ -265,8 +263,7 @@ def aes67(
 
             is_enabled = enabled.lower() == "on"
             packet, _, port = commands.command_enable_aes67(is_enabled)
-            for server_name, device in targets:
-                await send(packet, device.ipv4, port)
+            await _send_all(send, [(packet, device.ipv4, port) for _, device in targets])
 
     asyncio.run(_run())
 
@@ -281,7 +278,7 @@ def preferred_leader(
     commands = DanteDeviceCommands()
 
     async def _run():
-        async with _command_context() as (devices, send):
+        async with _command_context(filtered=True, fields=SUMMARY_FIELDS) as (devices, send):
             filtered = filter_devices(devices)
             targets = _resolve_targets(filtered, all_devices)
 
@@ -346,7 +343,9 @@ def interface(
                 application = DanteApplication()
                 await application.startup()
                 try:
-                    devices = await application.discover_and_populate(timeout=settings.mdns_timeout)
+                    devices = await application.discover_and_populate(
+                        timeout=settings.mdns_timeout, expect=settings.expect_devices
+                    )
                     devices = filter_devices(devices or {})
                 finally:
                     await application.shutdown()
@@ -402,7 +401,7 @@ def interface(
                 typer.echo("Error: --ip, --netmask, --dns, and --gateway are required for static mode.", err=True)
                 raise typer.Exit(code=ExitCode.ERROR)
 
-        async with _command_context() as (devices, send):
+        async with _command_context(filtered=True, fields=SUMMARY_FIELDS) as (devices, send):
             filtered = filter_devices(devices)
             targets = _resolve_targets(filtered, all_devices)
 
@@ -10,6 +10,7 @@ import typer
 
 logger = logging.getLogger("netaudio")
 
+from netaudio.daemon.query import SUMMARY_FIELDS
 from netaudio.dante.const import BLUETOOTH_MODEL_IDS, HEARTBEAT_LOCK_UNRELIABLE_MODEL_IDS
 from netaudio.dante.device_commands import DanteDeviceCommands
 from netaudio.dante.device_operations import _device_lock_operation, LOCK_OPERATION_LOCK, LOCK_OPERATION_UNLOCK, validate_dante_name, validate_pin
@@ -25,6 +26,8 @@ from netaudio._common import (
     output_single,
     output_table,
     sort_devices,
+    stream_devices,
+    StreamOutput,
 )
 from netaudio.icons import icon, icon_only
 
@@ -95,7 +98,7 @@ async def _lock_via_relay(pin: str, action: str) -> dict | None:
         device_name = state.hosts[0]
 
     if not device_name:
-        devices = await _discover()
+        devices = await _discover(filtered=True, fields=SUMMARY_FIELDS)
         filtered = filter_devices(devices)
         _, device = _resolve_one(filtered)
         device_name = device.name or device.server_name
@@ -163,17 +166,126 @@ def _get_lock_key() -> bytes:
     raise typer.Exit(code=1)
 
 
+COMPACT_LIST_HEADERS = ["Name", "IP Address", "MAC Address", "Model", "Lock", "TX", "RX", "Last Seen", "Server Name"]
+VERBOSE_LIST_EXTRAS = ["Manufacturer", "Product Version", "Board", "Firmware", "Software", "Sample Rate", "Encoding", "Bit Depth", "Latency", "Flows", "AES67", "Preferred Leader", "PTP Role"]
+
+
+def _device_list_headers(verbose: bool, bluetooth: bool) -> list[str]:
+    if not verbose:
+        return list(COMPACT_LIST_HEADERS)
+
+    headers = COMPACT_LIST_HEADERS + VERBOSE_LIST_EXTRAS
+    if bluetooth:
+        headers.append("Bluetooth")
+    return headers
+
+
+def _device_list_row(server_name: str, device, verbose: bool, bluetooth: bool) -> list[str]:
+    last_seen = getattr(device, "last_seen", None)
+    name_display = device.name or ""
+
+    if device.is_locked is True:
+        lock_display = icon("lock") or "locked"
+    elif device.is_locked is False:
+        lock_display = ""
+    else:
+        lock_display = ""
+
+    row = [
+        name_display,
+        str(device.ipv4) if device.ipv4 else "",
+        _format_mac(device.mac_address),
+        device.dante_model or device.model_id or "",
+        lock_display,
+        str(len(device.tx_channels) if device.tx_channels else (device.tx_count or 0)),
+        str(len(device.rx_channels) if device.rx_channels else (device.rx_count or 0)),
+        _format_last_seen(last_seen),
+        server_name,
+    ]
+
+    if verbose:
+        row.append(device.manufacturer or "")
+        row.append(device.product_version or "")
+        row.append(device.board_name or device.dante_model_id or "")
+        row.append(device.firmware_version or "")
+        row.append(device.software_version or "")
+        row.append(str(device.sample_rate or ""))
+
+        encoding = getattr(device, "encoding", None)
+        row.append(f"PCM{encoding}" if encoding is not None else "")
+
+        bit_depth = getattr(device, "bit_depth", None)
+        row.append(str(bit_depth) if bit_depth is not None else "")
+
+        latency = getattr(device, "latency", None)
+        row.append(f"{latency}ms" if latency is not None else "")
+
+        tx_flows = getattr(device, "tx_flow_count", None)
+        rx_flows = getattr(device, "rx_flow_count", None)
+        if tx_flows is not None or rx_flows is not None:
+            row.append(f"{tx_flows or 0}/{rx_flows or 0}")
+        else:
+            row.append("")
+
+        aes67_configured = getattr(device, "aes67_configured", None)
+        aes67_current = getattr(device, "aes67_current", None)
+        if aes67_current is not None and aes67_configured is not None and aes67_current != aes67_configured:
+            current_label = "on" if aes67_current else "off"
+            configured_label = "on" if aes67_configured else "off"
+            row.append(f"{current_label}->{configured_label} (reboot required)")
+        elif aes67_configured is not None:
+            row.append("on" if aes67_configured else "off")
+        elif aes67_current is not None:
+            row.append("on" if aes67_current else "off")
+        else:
+            row.append("")
+
+        preferred_leader = getattr(device, "preferred_leader", None)
+        if preferred_leader is not None:
+            row.append("on" if preferred_leader else "off")
+        else:
+            row.append("")
+
+        ptp_v1_role = getattr(device, "ptp_v1_role", None)
+        row.append(ptp_v1_role or "")
+
+        if bluetooth:
+            row.append(device.bluetooth_device or "")
+
+    return row
+
+
+def _device_list_stream() -> None:
+    from netaudio.cli import state
+
+    # Rows are printed before the whole network is known, so the Bluetooth
+    # column cannot be conditional on what the other devices turn out to be.
+    output = StreamOutput(_device_list_headers(state.verbose, bluetooth=True))
+
+    def _emit(device) -> None:
+        row = _device_list_row(device.server_name, device, state.verbose, bluetooth=True)
+        output.emit([row], json_data=[DanteDeviceSerializer.to_json(device)])
+
+    stream_devices(_emit)
+    output.close()
+
+
 @app.command("list")
 def device_list(
     json_flag: bool = typer.Option(False, "-j", "--json", help="Shorthand for --output=json."),
+    stream: bool = typer.Option(False, "--stream", help="Print each device as soon as it has been queried."),
 ):
     """List discovered Dante devices."""
 
-    async def _run():
-        from netaudio.cli import OutputFormat, state
-        if json_flag:
-            state.output_format = OutputFormat.json
+    from netaudio.cli import OutputFormat, state
+    if json_flag:
+        state.output_format = OutputFormat.json
 
+    if stream:
+        _device_list_stream()
+        return
+
+    async def _run():
         devices = await _discover()
         await _populate_controls(devices)
         _collect_lock_state(devices)
@@ -182,90 +294,12 @@ def device_list(
         sorted_devices = list(sort_devices(devices))
 
         any_bluetooth = any(device.model_id in BLUETOOTH_MODEL_IDS for _, device in sorted_devices)
-
-        compact_headers = ["Name", "IP Address", "MAC Address", "Model", "Lock", "TX", "RX", "Last Seen", "Server Name"]
-        verbose_extras = ["Manufacturer", "Product Version", "Board", "Firmware", "Software", "Sample Rate", "Encoding", "Bit Depth", "Latency", "Flows", "AES67", "Preferred Leader", "PTP Role"]
-        if any_bluetooth:
-            verbose_extras.append("Bluetooth")
-        verbose_headers = compact_headers + verbose_extras
-
-        headers = verbose_headers if state.verbose else compact_headers
+        headers = _device_list_headers(state.verbose, any_bluetooth)
         rows = []
         json_data = {}
 
         for server_name, device in sorted_devices:
-            last_seen = getattr(device, "last_seen", None)
-            name_display = device.name or ""
-
-            if device.is_locked is True:
-                lock_display = icon("lock") or "locked"
-            elif device.is_locked is False:
-                lock_display = ""
-            else:
-                lock_display = ""
-
-            row = [
-                name_display,
-                str(device.ipv4) if device.ipv4 else "",
-                _format_mac(device.mac_address),
-                device.dante_model or device.model_id or "",
-                lock_display,
-                str(len(device.tx_channels) if device.tx_channels else (device.tx_count or 0)),
-                str(len(device.rx_channels) if device.rx_channels else (device.rx_count or 0)),
-                _format_last_seen(last_seen),
-                server_name,
-            ]
-
-            if state.verbose:
-                row.append(device.manufacturer or "")
-                row.append(device.product_version or "")
-                row.append(device.board_name or device.dante_model_id or "")
-                row.append(device.firmware_version or "")
-                row.append(device.software_version or "")
-                row.append(str(device.sample_rate or ""))
-
-                encoding = getattr(device, "encoding", None)
-                row.append(f"PCM{encoding}" if encoding is not None else "")
-
-                bit_depth = getattr(device, "bit_depth", None)
-                row.append(str(bit_depth) if bit_depth is not None else "")
-
-                latency = getattr(device, "latency", None)
-                row.append(f"{latency}ms" if latency is not None else "")
-
-                tx_flows = getattr(device, "tx_flow_count", None)
-                rx_flows = getattr(device, "rx_flow_count", None)
-                if tx_flows is not None or rx_flows is not None:
-                    row.append(f"{tx_flows or 0}/{rx_flows or 0}")
-                else:
-                    row.append("")
-
-                aes67_configured = getattr(device, "aes67_configured", None)
-                aes67_current = getattr(device, "aes67_current", None)
-                if aes67_current is not None and aes67_configured is not None and aes67_current != aes67_configured:
-                    current_label = "on" if aes67_current else "off"
-                    configured_label = "on" if aes67_configured else "off"
-                    row.append(f"{current_label}->{configured_label} (reboot required)")
-                elif aes67_configured is not None:
-                    row.append("on" if aes67_configured else "off")
-                elif aes67_current is not None:
-                    row.append("on" if aes67_current else "off")
-                else:
-                    row.append("")
-
-                preferred_leader = getattr(device, "preferred_leader", None)
-                if preferred_leader is not None:
-                    row.append("on" if preferred_leader else "off")
-                else:
-                    row.append("")
-
-                ptp_v1_role = getattr(device, "ptp_v1_role", None)
-                row.append(ptp_v1_role or "")
-
-                if any_bluetooth:
-                    row.append(device.bluetooth_device or "")
-
-            rows.append(row)
+            rows.append(_device_list_row(server_name, device, state.verbose, any_bluetooth))
             json_data[server_name] = DanteDeviceSerializer.to_json(device)
 
         output_table(headers, rows, json_data=json_data, devices=devices)
@@ -278,7 +312,7 @@ def device_show():
     """Show detailed device information."""
 
     async def _run():
-        devices = await _discover()
+        devices = await _discover(filtered=True)
         await _populate_controls(devices)
         filtered = filter_devices(devices)
         _, device = _resolve_one(filtered)
@@ -295,7 +329,7 @@ def identify():
     commands = DanteDeviceCommands()
 
     async def _run():
-        async with _command_context() as (devices, send):
+        async with _command_context(filtered=True, fields=SUMMARY_FIELDS) as (devices, send):
             filtered = filter_devices(devices)
             if not filtered:
                 typer.echo("Error: device not found.", err=True)
@@ -314,7 +348,7 @@ def reboot():
     """Reboot a device."""
 
     async def _run():
-        devices = await _discover()
+        devices = await _discover(filtered=True, fields=SUMMARY_FIELDS)
         await _populate_controls(devices)
         filtered = filter_devices(devices)
         if not filtered:
@@ -331,7 +365,7 @@ def factory_reset():
     """Factory reset a device (clears name, channels, routes, config)."""
 
     async def _run():
-        devices = await _discover()
+        devices = await _discover(filtered=True, fields=SUMMARY_FIELDS)
         await _populate_controls(devices)
         filtered = filter_devices(devices)
         _, device = _resolve_one(filtered)
@@ -433,7 +467,7 @@ def lock_status():
         from netaudio.common.app_config import settings as app_settings
         from netaudio.dante.const import DEVICE_HEARTBEAT_PORT, MULTICAST_GROUP_HEARTBEAT
 
-        devices = await _discover()
+        devices = await _discover(filtered=True, fields=SUMMARY_FIELDS)
         filtered = filter_devices(devices)
 
         if not filtered:
@@ -564,7 +598,7 @@ async def _resolve_lock_ip() -> str:
     if state.hosts:
         return state.hosts[0]
 
-    devices = await _discover()
+    devices = await _discover(filtered=True, fields=SUMMARY_FIELDS)
     filtered = filter_devices(devices)
     _, device = _resolve_one(filtered)
     return str(device.ipv4)
@@ -579,7 +613,7 @@ def name(
     commands = DanteDeviceCommands()
 
     async def _run():
-        async with _command_context() as (devices, send):
+        async with _command_context(fields=SUMMARY_FIELDS) as (devices, send):
             filtered = filter_devices(devices)
             server_name, device = _resolve_one(filtered)
 
@@ -879,7 +913,7 @@ def start():
     from netaudio.daemon.client import meter_start_on_daemon
 
     async def _run():
-        devices = await _discover()
+        devices = await _discover(filtered=True, fields=SUMMARY_FIELDS)
         filtered = filter_devices(devices)
         if not filtered:
             typer.echo("No device found.", err=True)
@@ -897,7 +931,7 @@ def stop():
     from netaudio.daemon.client import meter_stop_on_daemon
 
     async def _run():
-        devices = await _discover()
+        devices = await _discover(filtered=True, fields=SUMMARY_FIELDS)
         filtered = filter_devices(devices)
         if not filtered:
             typer.echo("No device found.", err=True)
@@ -927,7 +961,9 @@ def measure_timeout(
         await application.startup()
 
         try:
-            devices = await application.discover_and_populate(timeout=app_settings.mdns_timeout)
+            devices = await application.discover_and_populate(
+                timeout=app_settings.mdns_timeout, expect=app_settings.expect_devices
+            )
             filtered = filter_devices(devices)
             if not filtered:
                 typer.echo("No device found.", err=True)
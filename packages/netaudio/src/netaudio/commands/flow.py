@@ -34,7 +34,9 @@ async def _get_device_and_app(device_name: str):
 
     application = DanteApplication()
     await application.startup()
-    devices = await application.discover_and_populate(timeout=settings.mdns_timeout)
+    devices = await application.discover_and_populate(
+        timeout=settings.mdns_timeout, expect=settings.expect_devices
+    )
     devices = devices or {}
     devices = filter_devices(devices)
 
@@ -18,6 +18,8 @@ from netaudio._common import (
     output_table,
     parse_qualified_name,
     sort_devices,
+    stream_devices,
+    StreamOutput,
 )
 from netaudio._exit_codes import ExitCode
 from netaudio.icons import icon, icon_only
@@ -25,12 +27,88 @@ from netaudio.icons import icon, icon_only
 app = typer.Typer(help="Manage audio subscriptions.", no_args_is_help=True)
 
 
+SUBSCRIPTION_LIST_HEADERS = ["RX Channel", "RX Device", "TX Channel", "TX Device", "Status"]
+
+_STATE_ANSI = {
+    "connected": "32",
+    "in_progress": "33",
+    "resolved": "33",
+    "idle": "33",
+    "unresolved": "31",
+    "error": "31",
+    "none": "90",
+}
+
+_STATE_ICONS = {
+    "connected": "connected",
+    "in_progress": "info",
+    "resolved": "info",
+    "idle": "info",
+    "unresolved": "error",
+    "error": "error",
+    "none": "offline",
+}
+
+
+def _status_label(code):
+    from netaudio._common import ansi
+    from netaudio.dante.const import SUBSCRIPTION_STATUS_INFO
+
+    info = SUBSCRIPTION_STATUS_INFO.get(code)
+    if not info:
+        return ""
+    status_state, label, _ = info
+    status_icon = icon(_STATE_ICONS.get(status_state, ""))
+    ansi_code = _STATE_ANSI.get(status_state, "")
+    if not ansi_code:
+        return f"{status_icon}{label}"
+    return ansi(ansi_code, f"{status_icon}{label}")
+
+
+def _subscription_row(subscription) -> list[str]:
+    return [
+        subscription.rx_channel_name or "",
+        subscription.rx_device_name or "",
+        subscription.tx_channel_name or "",
+        subscription.tx_device_name or "",
+        _status_label(subscription.status_code),
+    ]
+
+
+def _subscription_list_stream() -> None:
+    from netaudio.dante.device_serializer import DanteDeviceSerializer
+
+    output = StreamOutput(SUBSCRIPTION_LIST_HEADERS)
+    found = 0
+
+    def _emit(device) -> None:
+        nonlocal found
+        if not device.subscriptions:
+            return
+        found += len(device.subscriptions)
+        output.emit(
+            [_subscription_row(subscription) for subscription in device.subscriptions],
+            json_data=[DanteDeviceSerializer.subscription_to_json(subscription) for subscription in device.subscriptions],
+        )
+
+    stream_devices(_emit)
+    output.close()
+
+    if not found:
+        typer.echo("No active subscriptions.")
+
+
 @app.command("list")
-def subscription_list():
+def subscription_list(
+    stream: bool = typer.Option(False, "--stream", help="Print each device's subscriptions as soon as they have been queried."),
+):
     """List all active subscriptions."""
 
+    if stream:
+        _subscription_list_stream()
+        return
+
     async def _run():
-        from netaudio.dante.const import SUBSCRIPTION_STATUS_INFO
         from netaudio.dante.device_serializer import DanteDeviceSerializer
 
         devices = await _discover()
@@ -47,53 +125,10 @@ def subscription_list():
             typer.echo("No active subscriptions.")
             return
 
-        from netaudio._common import ansi
-
-        _STATE_ANSI = {
-            "connected": "32",
-            "in_progress": "33",
-            "resolved": "33",
-            "idle": "33",
-            "unresolved": "31",
-            "error": "31",
-            "none": "90",
-        }
-
-        _STATE_ICONS = {
-            "connected": "connected",
-            "in_progress": "info",
-            "resolved": "info",
-            "idle": "info",
-            "unresolved": "error",
-            "error": "error",
-            "none": "offline",
-        }
-
-        def _status_label(code):
-            info = SUBSCRIPTION_STATUS_INFO.get(code)
-            if not info:
-                return ""
-            status_state, label, _ = info
-            status_icon = icon(_STATE_ICONS.get(status_state, ""))
-            ansi_code = _STATE_ANSI.get(status_state, "")
-            if not ansi_code:
-                return f"{status_icon}{label}"
-            return ansi(ansi_code, f"{status_icon}{label}")
-
-        headers = ["RX Channel", "RX Device", "TX Channel", "TX Device", "Status"]
-        rows = []
+        rows = [_subscription_row(subscription) for subscription in all_subscriptions]
         json_data = [DanteDeviceSerializer.subscription_to_json(s) for s in all_subscriptions]
 
-        for subscription in all_subscriptions:
-            rows.append([
-                subscription.rx_channel_name or "",
-                subscription.rx_device_name or "",
-                subscription.tx_channel_name or "",
-                subscription.tx_device_name or "",
-                _status_label(subscription.status_code),
-            ])
-
-        output_table(headers, rows, json_data=json_data)
+        output_table(SUBSCRIPTION_LIST_HEADERS, rows, json_data=json_data)
 
     asyncio.run(_run())
 
@@ -8,6 +8,7 @@ from netaudio.dante.const import DEFAULT_MULTICAST_METERING_PORT
 DEFAULT_MDNS_TIMEOUT = 5
 DEFAULT_RELAY_PORT = 9000
 DEFAULT_INTERFACE = None
+DEFAULT_DEVICE_UPDATE_WINDOW = 0.25
 
 
 def get_available_interfaces():
@@ -25,6 +26,7 @@ def get_available_interfaces():
 class AppSettings:
     def __init__(self):
         self._mdns_timeout: float = DEFAULT_MDNS_TIMEOUT
+        self.expect_devices: int | None = None
         self.dump_payloads: bool = False
         self.debug: bool = False
         self.no_color: bool = False
@@ -35,6 +37,9 @@ class AppSettings:
         self.metering_port: int = int(os.environ.get("NETAUDIO_METERING_PORT", DEFAULT_MULTICAST_METERING_PORT))
         self.relay_port: int = int(os.environ.get("NETAUDIO_RELAY_PORT", DEFAULT_RELAY_PORT))
         self.lock_state_timeout: float = float(os.environ.get("NETAUDIO_LOCK_STATE_TIMEOUT", 4))
+        self.device_update_window: float = float(
+            os.environ.get("NETAUDIO_DEVICE_UPDATE_WINDOW", DEFAULT_DEVICE_UPDATE_WINDOW)
+        )
         self._device_lock_key: bytes | None = None
         lock_key_value = os.environ.get("NETAUDIO_DEVICE_LOCK_KEY")
         if lock_key_value:
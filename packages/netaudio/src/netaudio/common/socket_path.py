@@ -48,6 +48,10 @@ def get_socket_path() -> Path:
     return get_socket_dir() / "netaudio.sock"
 
 
+def get_device_cache_path() -> Path:
+    return get_socket_dir() / "devices.cache"
+
+
 def ensure_socket_dir() -> Path:
     socket_dir = get_socket_dir()
     socket_dir.mkdir(parents=True, exist_ok=True)
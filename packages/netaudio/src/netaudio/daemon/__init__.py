@@ -1,8 +1,11 @@
 from netaudio.daemon.client import (
+    DaemonConnection,
+    get_device_views_from_daemon,
     get_devices_from_daemon,
     meter_snapshot_from_daemon,
     meter_start_on_daemon,
     meter_status_from_daemon,
     meter_stop_on_daemon,
 )
+from netaudio.daemon.query import DeviceQuery
 from netaudio.daemon.server import NetaudioDaemon, run_daemon
@@ -0,0 +1,99 @@
+import json
+
+CHANGE_STREAM_KEY = "netaudio:daemon:changes"
+CHANGE_STREAM_MAXLEN = 10000
+
+KIND_DEVICE = "device"
+KIND_TX_CHANNEL = "tx_channel"
+KIND_RX_CHANNEL = "rx_channel"
+KIND_SUBSCRIPTION = "subscription"
+
+OP_ADD = "add"
+OP_UPDATE = "update"
+OP_REMOVE = "remove"
+
+
+def _text(value) -> str:
+    return "" if value is None else str(value)
+
+
+def _device_fields(device) -> dict[str, str]:
+    return {
+        "name": _text(device.name),
+        "ipv4": _text(device.ipv4),
+        "mac": _text(device.mac_address),
+        "model_id": _text(device.model_id),
+        "online": "1" if device.online else "0",
+        "sample_rate": _text(device.sample_rate),
+        "encoding": _text(device.encoding),
+        "latency": _text(device.latency),
+        "tx_count": _text(device.tx_count),
+        "rx_count": _text(device.rx_count),
+    }
+
+
+def _channel_fields(channel) -> dict[str, str]:
+    return {"name": _text(channel.name), "friendly_name": _text(channel.friendly_name)}
+
+
+def _subscription_fields(subscription) -> dict[str, str]:
+    return {
+        "tx_device": _text(subscription.tx_device_name),
+        "tx_channel": _text(subscription.tx_channel_name),
+        "status": _text(subscription.status_code),
+    }
+
+
+def device_state(device) -> dict[tuple[str, str], dict[str, str]]:
+    state = {(KIND_DEVICE, ""): _device_fields(device)}
+
+    for number, channel in sorted((device.tx_channels or {}).items()):
+        state[(KIND_TX_CHANNEL, str(number))] = _channel_fields(channel)
+
+    for number, channel in sorted((device.rx_channels or {}).items()):
+        state[(KIND_RX_CHANNEL, str(number))] = _channel_fields(channel)
+
+    for subscription in device.subscriptions or []:
+        if subscription.rx_channel_name:
+            state[(KIND_SUBSCRIPTION, subscription.rx_channel_name)] = _subscription_fields(subscription)
+
+    return state
+
+
+def change_record(server_name: str, kind: str, item_id: str, op: str, fields: dict | None = None) -> dict[str, str]:
+    record = {"server_name": server_name, "kind": kind, "id": item_id, "op": op}
+    if fields:
+        record["fields"] = json.dumps(fields, separators=(",", ":"))
+    return record
+
+
+class DeviceChangeLog:
+    def __init__(self):
+        self._states: dict[str, dict[tuple[str, str], dict[str, str]]] = {}
+
+    def changes(self, device) -> list[dict[str, str]]:
+        server_name = device.server_name
+        previous = self._states.get(server_name, {})
+        current = device_state(device)
+        records = []
+
+        for (kind, item_id), fields in current.items():
+            old = previous.get((kind, item_id))
+            if old is None:
+                records.append(change_record(server_name, kind, item_id, OP_ADD, fields))
+                continue
+
+            changed = {field: value for field, value in fields.items() if old.get(field) != value}
+            if changed:
+                records.append(change_record(server_name, kind, item_id, OP_UPDATE, changed))
+
+        for kind, item_id in sorted(previous.keys() - current.keys()):
+            records.append(change_record(server_name, kind, item_id, OP_REMOVE))
+
+        self._states[server_name] = current
+        return records
+
+    def removed(self, server_name: str) -> list[dict[str, str]]:
+        if self._states.pop(server_name, None) is None:
+            return []
+        return [change_record(server_name, KIND_DEVICE, "", OP_REMOVE)]
@@ -1,48 +1,253 @@
 import asyncio
 import json
 import logging
-import pickle
 import struct
 
 from netaudio.common.socket_path import daemon_is_accessible, open_daemon_connection
 from netaudio.daemon.protocol import (
+    CMD_DEVICE_BATCH,
     CMD_DEVICE_REQUEST,
-    CMD_GET_DEVICES,
+    CMD_GET_DEVICES_SINCE,
     CMD_METER_SNAPSHOT,
     CMD_METER_START,
     CMD_METER_STATUS,
     CMD_METER_STOP,
+    CMD_MULTIPLEX,
+    CMD_QUERY_DEVICES,
     CMD_REPORT_UNRESPONSIVE,
+    MULTIPLEX_ACK,
+    STATUS_EMPTY,
+    STATUS_ERROR,
+    STATUS_OK,
+    decode_batch_results,
+    encode_batch,
+    encode_frame,
+    encode_string,
+    read_frame,
 )
-from netaudio.dante.device import DanteDevice
+from netaudio.daemon.device_cache import DeviceStateCache
+from netaudio.daemon.query import DeviceQuery
+from netaudio.daemon.wire import WIRE_MAGIC, DeviceMap, DeviceView, WireFormatError, decode_document, device_views
 
 logger = logging.getLogger("netaudio")
 
+CONNECT_TIMEOUT = 1.0
 
-async def get_devices_from_daemon() -> dict[str, DanteDevice] | None:
-    if not daemon_is_accessible():
+ONE_SHOT_NO_REPLY = (CMD_REPORT_UNRESPONSIVE, CMD_METER_START, CMD_METER_STOP)
+
+
+class DaemonRequestError(Exception):
+    pass
+
+
+class DaemonConnection:
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._pending: dict[int, asyncio.Future] = {}
+        self._request_counter = 0
+        self._closed = False
+        self.loop = asyncio.get_running_loop()
+        self._read_task = asyncio.create_task(self._read_responses())
+
+    @classmethod
+    async def open(cls, timeout: float = CONNECT_TIMEOUT) -> "DaemonConnection | None":
+        reader, writer = await asyncio.wait_for(open_daemon_connection(), timeout=timeout)
+
+        writer.write(CMD_MULTIPLEX)
+        await writer.drain()
+
+        try:
+            ack = await asyncio.wait_for(reader.readexactly(len(MULTIPLEX_ACK)), timeout=timeout)
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+            ack = None
+
+        if ack != MULTIPLEX_ACK:
+            logger.debug("Daemon does not support multiplexed connections")
+            writer.close()
+            return None
+
+        return cls(reader, writer)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def _next_request_id(self) -> int:
+        self._request_counter = (self._request_counter + 1) & 0xFFFFFFFF
+        return self._request_counter
+
+    async def request(self, command: bytes, payload: bytes = b"", timeout: float = 5.0) -> tuple[int, bytes]:
+        if self._closed:
+            raise ConnectionError("Daemon connection closed")
+
+        request_id = self._next_request_id()
+        future = self.loop.create_future()
+        self._pending[request_id] = future
+
+        try:
+            self._writer.write(encode_frame(request_id, command[0], payload))
+            await self._writer.drain()
+            status, body = await asyncio.wait_for(future, timeout=timeout)
+        finally:
+            self._pending.pop(request_id, None)
+
+        if status == STATUS_ERROR:
+            raise DaemonRequestError(body.decode("utf-8", errors="replace"))
+
+        return status, body
+
+    async def _read_responses(self) -> None:
+        try:
+            while True:
+                request_id, status, body = await read_frame(self._reader)
+                future = self._pending.get(request_id)
+                if future is not None and not future.done():
+                    future.set_result((status, body))
+        except (asyncio.IncompleteReadError, ConnectionError, OSError):
+            pass
+        finally:
+            self._closed = True
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Daemon connection closed"))
+            self._writer.close()
+
+    async def close(self) -> None:
+        self._read_task.cancel()
+        try:
+            await self._read_task
+        except asyncio.CancelledError:
+            pass
+
+
+_connection: DaemonConnection | None = None
+_connecting: asyncio.Task | None = None
+_multiplex_unsupported = False
+
+
+async def _open_shared_connection() -> DaemonConnection | None:
+    global _connection, _multiplex_unsupported
+
+    _connection = await DaemonConnection.open()
+    if _connection is None:
+        _multiplex_unsupported = True
+    return _connection
+
+
+async def get_daemon_connection() -> DaemonConnection | None:
+    global _connecting
+
+    if _multiplex_unsupported:
         return None
 
-    try:
-        reader, writer = await asyncio.wait_for(
-            open_daemon_connection(),
-            timeout=1.0,
-        )
+    loop = asyncio.get_running_loop()
+
+    if _connection is not None and not _connection.closed and _connection.loop is loop:
+        return _connection
+
+    if _connecting is None or _connecting.done() or _connecting.get_loop() is not loop:
+        _connecting = asyncio.create_task(_open_shared_connection())
+
+    return await asyncio.shield(_connecting)
 
-        writer.write(CMD_GET_DEVICES)
+
+async def close_daemon_connection() -> None:
+    global _connection
+
+    if _connection is not None and _connection.loop is asyncio.get_running_loop():
+        await _connection.close()
+    _connection = None
+
+
+async def _one_shot_request(command: bytes, payload: bytes, timeout: float, streams=None) -> tuple[int, bytes]:
+    if streams is None:
+        streams = await asyncio.wait_for(open_daemon_connection(), timeout=CONNECT_TIMEOUT)
+    reader, writer = streams
+
+    try:
+        writer.write(command + payload)
         await writer.drain()
 
-        length_data = await asyncio.wait_for(reader.readexactly(4), timeout=1.0)
+        if command in ONE_SHOT_NO_REPLY:
+            return STATUS_OK, b""
+
+        status = STATUS_OK
+        if command == CMD_DEVICE_REQUEST:
+            flag = await asyncio.wait_for(reader.readexactly(1), timeout=timeout)
+            status = STATUS_OK if flag == b"\x01" else STATUS_EMPTY
+
+        length_data = await asyncio.wait_for(reader.readexactly(4), timeout=timeout)
         length = struct.unpack(">I", length_data)[0]
 
-        data = await asyncio.wait_for(reader.readexactly(length), timeout=2.0)
-        devices = pickle.loads(data)
+        body = b""
+        if length > 0:
+            body = await asyncio.wait_for(reader.readexactly(length), timeout=timeout)
 
+        return status, body
+    finally:
         writer.close()
         await writer.wait_closed()
 
-        logger.info(f"Daemon: {len(devices)} devices")
-        return devices
+
+async def daemon_request(command: bytes, payload: bytes = b"", timeout: float = 5.0) -> tuple[int, bytes]:
+    connection = await get_daemon_connection()
+
+    if connection is None:
+        return await _one_shot_request(command, payload, timeout)
+
+    return await connection.request(command, payload, timeout=timeout)
+
+
+async def _sync_device_cache() -> DeviceStateCache:
+    cache = DeviceStateCache.load()
+
+    _, data = await daemon_request(CMD_GET_DEVICES_SINCE, cache.request_payload(), timeout=3.0)
+    document = decode_document(data)
+
+    if not cache.can_apply(document):
+        # The daemon's schema changed since the cache was written
+        cache.reset()
+        _, data = await daemon_request(CMD_GET_DEVICES_SINCE, cache.request_payload(), timeout=3.0)
+        document = decode_document(data)
+
+    logger.debug(
+        f"Daemon delta: {len(document['devices'])} changed, {len(document['removed'])} removed, "
+        f"version {cache.version} -> {document['version']}"
+    )
+    cache.apply(document)
+    cache.save()
+    return cache
+
+
+async def _query_device_views(query: DeviceQuery) -> dict[str, DeviceView]:
+    payload = query.to_payload()
+    _, data = await daemon_request(CMD_QUERY_DEVICES, struct.pack(">I", len(payload)) + payload, timeout=3.0)
+    document = decode_document(data)
+
+    if not document.get("query"):
+        # Daemons without query support answer unknown commands with every device
+        logger.debug("Daemon ignored the device query, filtering locally")
+
+    return query.select(device_views(document["schema"], document["devices"]))
+
+
+async def get_device_views_from_daemon(query: DeviceQuery | None = None) -> dict[str, DeviceView] | None:
+    if not daemon_is_accessible():
+        return None
+
+    try:
+        if query is None or (not query.filters and query.fields is None):
+            views = (await _sync_device_cache()).views()
+        else:
+            views = await _query_device_views(query)
+
+        logger.info(f"Daemon: {len(views)} devices")
+        return views
 
     except FileNotFoundError:
         return None
@@ -51,29 +256,28 @@ async def get_devices_from_daemon() -> dict[str, DanteDevice] | None:
     except asyncio.TimeoutError:
         logger.warning("Daemon connection timed out")
         return None
+    except WireFormatError as e:
+        logger.debug(f"Daemon sent an unsupported payload: {e}")
+        return None
     except Exception as e:
         logger.debug(f"Daemon connection error: {e}")
         return None
 
 
+async def get_devices_from_daemon(query: DeviceQuery | None = None) -> DeviceMap | None:
+    views = await get_device_views_from_daemon(query)
+    if views is None:
+        return None
+
+    return DeviceMap(views)
+
+
 async def report_unresponsive_device(server_name: str) -> None:
     if not daemon_is_accessible():
         return
 
     try:
-        reader, writer = await asyncio.wait_for(
-            open_daemon_connection(),
-            timeout=1.0,
-        )
-
-        name_bytes = server_name.encode("utf-8")
-        writer.write(CMD_REPORT_UNRESPONSIVE)
-        writer.write(struct.pack(">I", len(name_bytes)))
-        writer.write(name_bytes)
-        await writer.drain()
-
-        writer.close()
-        await writer.wait_closed()
+        await daemon_request(CMD_REPORT_UNRESPONSIVE, encode_string(server_name), timeout=1.0)
 
     except Exception as e:
         logger.debug(f"Failed to report dead device: {e}")
@@ -84,26 +288,9 @@ async def meter_snapshot_from_daemon(server_name: str) -> dict | None:
         return None
 
     try:
-        reader, writer = await asyncio.wait_for(
-            open_daemon_connection(),
-            timeout=1.0,
-        )
-
-        name_bytes = server_name.encode("utf-8")
-        writer.write(CMD_METER_SNAPSHOT)
-        writer.write(struct.pack(">I", len(name_bytes)))
-        writer.write(name_bytes)
-        await writer.drain()
-
-        length_data = await asyncio.wait_for(reader.readexactly(4), timeout=5.0)
-        length = struct.unpack(">I", length_data)[0]
-
-        data = await asyncio.wait_for(reader.readexactly(length), timeout=5.0)
+        _, data = await daemon_request(CMD_METER_SNAPSHOT, encode_string(server_name), timeout=5.0)
         result = json.loads(data)
 
-        writer.close()
-        await writer.wait_closed()
-
         if "error" in result:
             logger.debug(f"Daemon metering error: {result['error']}")
             return None
@@ -127,22 +314,8 @@ async def meter_start_on_daemon(server_name: str, client_id: str) -> None:
         return
 
     try:
-        reader, writer = await asyncio.wait_for(
-            open_daemon_connection(),
-            timeout=1.0,
-        )
-
-        name_bytes = server_name.encode("utf-8")
-        id_bytes = client_id.encode("utf-8")
-        writer.write(CMD_METER_START)
-        writer.write(struct.pack(">I", len(name_bytes)))
-        writer.write(name_bytes)
-        writer.write(struct.pack(">I", len(id_bytes)))
-        writer.write(id_bytes)
-        await writer.drain()
-
-        writer.close()
-        await writer.wait_closed()
+        payload = encode_string(server_name) + encode_string(client_id)
+        await daemon_request(CMD_METER_START, payload, timeout=1.0)
 
     except Exception as e:
         logger.debug(f"Failed to start daemon metering: {e}")
@@ -153,22 +326,8 @@ async def meter_stop_on_daemon(server_name: str, client_id: str) -> None:
         return
 
     try:
-        reader, writer = await asyncio.wait_for(
-            open_daemon_connection(),
-            timeout=1.0,
-        )
-
-        name_bytes = server_name.encode("utf-8")
-        id_bytes = client_id.encode("utf-8")
-        writer.write(CMD_METER_STOP)
-        writer.write(struct.pack(">I", len(name_bytes)))
-        writer.write(name_bytes)
-        writer.write(struct.pack(">I", len(id_bytes)))
-        writer.write(id_bytes)
-        await writer.drain()
-
-        writer.close()
-        await writer.wait_closed()
+        payload = encode_string(server_name) + encode_string(client_id)
+        await daemon_request(CMD_METER_STOP, payload, timeout=1.0)
 
     except Exception as e:
         logger.debug(f"Failed to stop daemon metering: {e}")
@@ -179,24 +338,8 @@ async def meter_status_from_daemon() -> dict | None:
         return None
 
     try:
-        reader, writer = await asyncio.wait_for(
-            open_daemon_connection(),
-            timeout=1.0,
-        )
-
-        writer.write(CMD_METER_STATUS)
-        await writer.drain()
-
-        length_data = await asyncio.wait_for(reader.readexactly(4), timeout=2.0)
-        length = struct.unpack(">I", length_data)[0]
-
-        data = await asyncio.wait_for(reader.readexactly(length), timeout=2.0)
-        result = json.loads(data)
-
-        writer.close()
-        await writer.wait_closed()
-
-        return result
+        _, data = await daemon_request(CMD_METER_STATUS, timeout=2.0)
+        return json.loads(data)
 
     except FileNotFoundError:
         return None
@@ -217,32 +360,15 @@ async def device_request_via_daemon(
         return None
 
     try:
-        reader, writer = await asyncio.wait_for(
-            open_daemon_connection(),
-            timeout=1.0,
+        payload = (
+            encode_string(device_ip)
+            + struct.pack(">H", port)
+            + struct.pack(">I", len(packet))
+            + packet
         )
+        status, response = await daemon_request(CMD_DEVICE_REQUEST, payload, timeout=5.0)
 
-        ip_bytes = device_ip.encode("utf-8")
-        writer.write(CMD_DEVICE_REQUEST)
-        writer.write(struct.pack(">I", len(ip_bytes)))
-        writer.write(ip_bytes)
-        writer.write(struct.pack(">H", port))
-        writer.write(struct.pack(">I", len(packet)))
-        writer.write(packet)
-        await writer.drain()
-
-        status = await asyncio.wait_for(reader.readexactly(1), timeout=5.0)
-        length_data = await asyncio.wait_for(reader.readexactly(4), timeout=5.0)
-        length = struct.unpack(">I", length_data)[0]
-
-        response = None
-        if length > 0:
-            response = await asyncio.wait_for(reader.readexactly(length), timeout=5.0)
-
-        writer.close()
-        await writer.wait_closed()
-
-        if status == b'\x01':
+        if status == STATUS_OK:
             return response
         return None
 
@@ -256,3 +382,60 @@ async def device_request_via_daemon(
     except Exception as e:
         logger.debug(f"Daemon device request error: {e}")
         return None
+
+
+async def device_requests_via_daemon(requests, timeout: float = 5.0) -> list[bytes | None] | None:
+    if not daemon_is_accessible():
+        return None
+
+    entries = []
+    for packet, device_ip, port, *entry_timeout in requests:
+        entries.append((packet, str(device_ip), port, entry_timeout[0] if entry_timeout else timeout))
+
+    # Each device's entries run back to back, so the slowest device bounds the batch
+    device_timeouts: dict[str, float] = {}
+    for _, device_ip, _, entry_timeout in entries:
+        device_timeouts[device_ip] = device_timeouts.get(device_ip, 0.0) + entry_timeout
+    batch_timeout = max(device_timeouts.values(), default=0.0) + 1.0
+
+    # Nothing has been sent until the connection is up, so failing here leaves per-device sends safe
+    try:
+        connection = await get_daemon_connection()
+        streams = None
+        if connection is None:
+            streams = await asyncio.wait_for(open_daemon_connection(), timeout=CONNECT_TIMEOUT)
+    except (OSError, asyncio.TimeoutError) as e:
+        logger.debug(f"Daemon unavailable for device batch: {e!r}")
+        return None
+
+    payload = encode_batch(entries)
+    try:
+        if connection is None:
+            _, data = await _one_shot_request(CMD_DEVICE_BATCH, payload, batch_timeout, streams)
+        else:
+            _, data = await connection.request(CMD_DEVICE_BATCH, payload, timeout=batch_timeout)
+    # Past this point the daemon may already have applied the batch, so the caller must not resend it
+    except asyncio.TimeoutError as e:
+        raise DaemonRequestError("daemon device batch timed out") from e
+    except Exception as e:
+        raise DaemonRequestError(f"daemon device batch failed: {e}") from e
+
+    results = _batch_results(data, len(entries))
+    if results is None:
+        logger.debug("Daemon does not support batched requests")
+        return None
+
+    return [response if status == STATUS_OK else None for status, response in results]
+
+
+def _batch_results(data: bytes, count: int) -> list[tuple[int, bytes]] | None:
+    # Daemons without batch support answer unknown commands with their device list, as a
+    # wire document or, before the wire format, a pickle; either way no entry was run
+    if data.startswith(WIRE_MAGIC) or data[:1] == b"\x80":
+        return None
+
+    try:
+        results = decode_batch_results(data)
+    except struct.error:
+        return None
+    return results if len(results) == count else None
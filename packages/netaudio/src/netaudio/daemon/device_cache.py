@@ -0,0 +1,96 @@
+import json
+import logging
+import os
+import struct
+import tempfile
+from pathlib import Path
+
+from netaudio.common.socket_path import get_device_cache_path
+from netaudio.daemon.wire import device_views
+
+logger = logging.getLogger("netaudio")
+
+NO_EPOCH = b"\x00" * 8
+
+
+class DeviceStateCache:
+    def __init__(self, path: Path | None = None):
+        self.path = Path(path) if path is not None else get_device_cache_path()
+        self.reset()
+
+    def reset(self) -> None:
+        self.epoch = NO_EPOCH
+        self.version = 0
+        self.schema: dict | None = None
+        self.records: dict[str, list] = {}
+
+    @classmethod
+    def load(cls, path: Path | None = None) -> "DeviceStateCache":
+        cache = cls(path)
+
+        try:
+            with open(cache.path, "rb") as cache_file:
+                state = json.load(cache_file)
+
+            cache.epoch = bytes.fromhex(state["epoch"])
+            cache.version = state["version"]
+            cache.schema = state["schema"]
+            cache.records = state["records"]
+        except FileNotFoundError:
+            pass
+        except Exception as exception:
+            logger.debug(f"Discarding unreadable device cache: {exception}")
+            cache.reset()
+
+        return cache
+
+    def save(self) -> None:
+        state = {
+            "epoch": self.epoch.hex(),
+            "version": self.version,
+            "schema": self.schema,
+            "records": self.records,
+        }
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            file_descriptor, temp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".devices.")
+            with os.fdopen(file_descriptor, "w") as cache_file:
+                json.dump(state, cache_file, separators=(",", ":"), default=str)
+            os.replace(temp_path, self.path)
+        except Exception as exception:
+            logger.debug(f"Failed to write device cache: {exception}")
+
+    def request_payload(self) -> bytes:
+        return self.epoch + struct.pack(">Q", self.version)
+
+    def can_apply(self, document: dict) -> bool:
+        return document["full"] or document["schema"] == self.schema
+
+    def apply(self, document: dict) -> None:
+        schema = document["schema"]
+        server_name_index = schema["device"].index("server_name")
+        last_seen_index = schema["device"].index("last_seen")
+
+        if document["full"]:
+            self.records = {}
+
+        for server_name in document["removed"]:
+            self.records.pop(server_name, None)
+
+        for record in document["devices"]:
+            self.records[record[server_name_index]] = record
+
+        for server_name, last_seen in document["last_seen"].items():
+            record = self.records.get(server_name)
+            if record is not None:
+                record[last_seen_index] = last_seen
+
+        self.schema = schema
+        self.epoch = bytes.fromhex(document["epoch"])
+        self.version = document["version"]
+
+    def views(self) -> dict:
+        if self.schema is None:
+            return {}
+        return device_views(self.schema, self.records.values())
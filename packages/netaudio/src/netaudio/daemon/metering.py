@@ -67,10 +67,8 @@ class MeteringManager:
         }
 
     def _server_name_for_ip(self, ip: str) -> str | None:
-        for device in self._application.devices.values():
-            if device.ipv4 and str(device.ipv4) == ip:
-                return device.server_name
-        return None
+        device = self._application.devices.by_ip(ip)
+        return device.server_name if device is not None else None
 
     def _send_start(self, server_name: str):
         device = self._get_device(server_name)
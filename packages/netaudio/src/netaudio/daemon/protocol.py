@@ -1,3 +1,5 @@
+import struct
+
 CMD_GET_DEVICES = b"\x00"
 CMD_REPORT_UNRESPONSIVE = b"\x01"
 CMD_GET_DEVICES_JSON = b"\x02"
@@ -5,5 +7,83 @@ CMD_METER_SNAPSHOT = b"\x03"
 CMD_METER_START = b"\x04"
 CMD_METER_STOP = b"\x05"
 CMD_METER_STATUS = b"\x06"
+CMD_GET_DEVICES_SINCE = b"\x07"
+CMD_QUERY_DEVICES = b"\x08"
 CMD_DEVICE_REQUEST = b"\x10"
+CMD_DEVICE_BATCH = b"\x11"
+CMD_MULTIPLEX = b"\x20"
 CMD_SHUTDOWN = b"\xff"
+
+MULTIPLEX_ACK = b"NAMX\x01"
+
+STATUS_OK = 0x00
+STATUS_EMPTY = 0x01
+STATUS_ERROR = 0x02
+STATUS_TIMEOUT = 0x03
+
+# Batch entry: device ip (string), port, timeout in milliseconds, packet length
+BATCH_ENTRY = struct.Struct(">HII")
+# Batch result: status, response length
+BATCH_RESULT = struct.Struct(">BI")
+
+# Multiplexed frame: payload length, request id, command (request) or status (response)
+FRAME_HEADER = struct.Struct(">IIB")
+
+
+def encode_string(value: str) -> bytes:
+    data = value.encode("utf-8")
+    return struct.pack(">I", len(data)) + data
+
+
+async def read_string(reader) -> str:
+    length = struct.unpack(">I", await reader.readexactly(4))[0]
+    return (await reader.readexactly(length)).decode("utf-8")
+
+
+def encode_frame(request_id: int, code: int, payload: bytes = b"") -> bytes:
+    return FRAME_HEADER.pack(len(payload), request_id, code) + payload
+
+
+async def read_frame(reader) -> tuple[int, int, bytes]:
+    length, request_id, code = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+    payload = await reader.readexactly(length) if length else b""
+    return request_id, code, payload
+
+
+def encode_batch(requests) -> bytes:
+    parts = [struct.pack(">I", len(requests))]
+    for packet, device_ip, port, timeout in requests:
+        parts.append(encode_string(device_ip))
+        parts.append(BATCH_ENTRY.pack(port, int(timeout * 1000), len(packet)))
+        parts.append(packet)
+    return b"".join(parts)
+
+
+async def read_batch(reader) -> list[tuple[bytes, str, int, float]]:
+    count = struct.unpack(">I", await reader.readexactly(4))[0]
+    requests = []
+    for _ in range(count):
+        device_ip = await read_string(reader)
+        port, timeout_ms, length = BATCH_ENTRY.unpack(await reader.readexactly(BATCH_ENTRY.size))
+        requests.append((await reader.readexactly(length), device_ip, port, timeout_ms / 1000))
+    return requests
+
+
+def encode_batch_results(results) -> bytes:
+    parts = [struct.pack(">I", len(results))]
+    for status, response in results:
+        parts.append(BATCH_RESULT.pack(status, len(response)))
+        parts.append(response)
+    return b"".join(parts)
+
+
+def decode_batch_results(data: bytes) -> list[tuple[int, bytes]]:
+    count = struct.unpack_from(">I", data)[0]
+    offset = 4
+    results = []
+    for _ in range(count):
+        status, length = BATCH_RESULT.unpack_from(data, offset)
+        offset += BATCH_RESULT.size
+        results.append((status, data[offset:offset + length]))
+        offset += length
+    return results
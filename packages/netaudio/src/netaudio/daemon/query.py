@@ -0,0 +1,100 @@
+import json
+from dataclasses import asdict, dataclass, field
+from fnmatch import fnmatch
+
+from netaudio.daemon.wire import DEVICE_FIELDS, NESTED_DEVICE_FIELDS, DeviceMap, WireFormatError
+
+SUMMARY_FIELDS = tuple(name for name in DEVICE_FIELDS if name not in NESTED_DEVICE_FIELDS)
+CONTROL_FIELDS = SUMMARY_FIELDS + ("tx_channels", "rx_channels")
+
+MODEL_ATTRIBUTES = ("model_id", "model", "dante_model_id", "dante_model")
+
+
+def _strip_separators(mac: str) -> str:
+    return mac.replace(":", "").replace("-", "").replace(".", "").lower()
+
+
+def normalize_mac(mac: str) -> str:
+    raw = _strip_separators(mac)
+    if len(raw) == 16 and raw[6:10] == "fffe":
+        raw = raw[:6] + raw[10:]
+    elif len(raw) == 16 and raw.endswith("0000"):
+        raw = raw[:12]
+    return raw
+
+
+def mac_matches(device_mac: str, pattern: str) -> bool:
+    if _strip_separators(device_mac) == _strip_separators(pattern):
+        return True
+
+    return normalize_mac(device_mac) == normalize_mac(pattern)
+
+
+@dataclass
+class DeviceQuery:
+    names: list[str] = field(default_factory=list)
+    server_names: list[str] = field(default_factory=list)
+    hosts: list[str] = field(default_factory=list)
+    macs: list[str] = field(default_factory=list)
+    models: list[str] = field(default_factory=list)
+    online: bool | None = None
+    fields: list[str] | None = None
+
+    @property
+    def filters(self) -> bool:
+        return bool(self.names or self.server_names or self.hosts or self.macs or self.models) or self.online is not None
+
+    def device_fields(self) -> tuple[str, ...]:
+        if self.fields is None:
+            return DEVICE_FIELDS
+
+        unknown = set(self.fields) - set(DEVICE_FIELDS)
+        if unknown:
+            raise WireFormatError(f"Unknown device fields: {', '.join(sorted(unknown))}")
+
+        # The server name keys every record, so a projection always carries it
+        requested = set(self.fields) | {"server_name"}
+        return tuple(name for name in DEVICE_FIELDS if name in requested)
+
+    def matches(self, server_name: str, device) -> bool:
+        if self.names and not any(fnmatch(device.name or "", pattern) for pattern in self.names):
+            return False
+
+        if self.hosts and not any(str(device.ipv4) == host for host in self.hosts):
+            return False
+
+        if self.server_names and not any(fnmatch(server_name, pattern) for pattern in self.server_names):
+            return False
+
+        if self.macs and not any(mac_matches(device.mac_address or "", pattern) for pattern in self.macs):
+            return False
+
+        if self.models:
+            models = [str(value) for value in (getattr(device, name, None) for name in MODEL_ATTRIBUTES) if value]
+            if not any(fnmatch(model, pattern) for model in models for pattern in self.models):
+                return False
+
+        if self.online is not None and bool(device.online) != self.online:
+            return False
+
+        return True
+
+    def select(self, devices: dict) -> dict:
+        if not self.filters:
+            return devices
+
+        if isinstance(devices, DeviceMap):
+            views = devices.views()
+            return devices.subset(server_name for server_name, view in views.items() if self.matches(server_name, view))
+
+        return {server_name: device for server_name, device in devices.items() if self.matches(server_name, device)}
+
+    def to_payload(self) -> bytes:
+        return json.dumps(asdict(self), separators=(",", ":")).encode()
+
+    @classmethod
+    def from_payload(cls, payload: bytes) -> "DeviceQuery":
+        try:
+            return cls(**json.loads(payload))
+        except (TypeError, ValueError) as exception:
+            raise WireFormatError(f"Invalid device query: {exception}") from exception
@@ -0,0 +1,221 @@
+import asyncio
+import logging
+import time
+from collections import deque
+
+logger = logging.getLogger("netaudio")
+
+REDIS_FLUSH_INTERVAL = 0.1
+METER_PUBLISH_INTERVAL = 0.5
+REDIS_RESYNC_INTERVAL = 60.0
+
+
+class RedisPublisher:
+    def __init__(
+        self,
+        redis,
+        flush_interval: float = REDIS_FLUSH_INTERVAL,
+        meter_interval: float = METER_PUBLISH_INTERVAL,
+        resync_interval: float = REDIS_RESYNC_INTERVAL,
+    ):
+        self._redis = redis
+        self.flush_interval = flush_interval
+        self.meter_interval = meter_interval
+        self.resync_interval = resync_interval
+        # What Redis holds, as far as this publisher last wrote it
+        self._published_hashes: dict[str, dict[str, str]] = {}
+        self._published_values: dict[str, str] = {}
+        self._hashes: dict[str, dict[str, str]] = {}
+        self._values: dict[str, str] = {}
+        self._meters: dict[str, str] = {}
+        self._meter_sent_at: dict[str, float] = {}
+        self._deletes: set[str] = set()
+        # Bounded like the streams themselves, so an outage drops the oldest records
+        self._stream_entries: dict[str, deque[dict[str, str]]] = {}
+        self._dirty = asyncio.Event()
+        self._flush_task: asyncio.Task | None = None
+        self._resync_task: asyncio.Task | None = None
+        self.flushes = 0
+        self.commands = 0
+        self.skipped = 0
+        self.resyncs = 0
+        self.stream_dropped = 0
+        self._outage_dropped = 0
+
+    def hset(self, key: str, mapping: dict[str, str]) -> None:
+        self._hashes.setdefault(key, {}).update(mapping)
+        self._dirty.set()
+
+    def set(self, key: str, value: str) -> None:
+        self._values[key] = value
+        self._dirty.set()
+
+    def set_meter(self, key: str, value: str) -> None:
+        # Only the newest reading is kept; it goes out once the key's interval has passed
+        self._meters[key] = value
+        self._dirty.set()
+
+    def xadd(self, stream: str, fields: dict[str, str], maxlen: int) -> None:
+        backlog = self._stream_entries.get(stream)
+        if backlog is None or backlog.maxlen != maxlen:
+            backlog = self._stream_entries[stream] = deque(backlog or (), maxlen=maxlen)
+        if len(backlog) == maxlen:
+            self._dropped_stream_entries(stream, 1)
+        backlog.append(fields)
+        self._dirty.set()
+
+    def _dropped_stream_entries(self, stream: str, count: int) -> None:
+        if not self._outage_dropped:
+            logger.warning(f"Redis unavailable, dropping the oldest {stream} entries beyond the backlog limit")
+        self._outage_dropped += count
+        self.stream_dropped += count
+
+    def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._deletes.add(key)
+            self._hashes.pop(key, None)
+            self._values.pop(key, None)
+            self._meters.pop(key, None)
+            self._meter_sent_at.pop(key, None)
+            self._published_hashes.pop(key, None)
+            self._published_values.pop(key, None)
+        self._dirty.set()
+
+    def resync(self) -> None:
+        # Redis may have lost what was published (restart, FLUSHDB, an external DEL),
+        # so the next flush writes every hash and value in full
+        for key, mapping in self._published_hashes.items():
+            self._hashes[key] = {**mapping, **self._hashes.get(key, {})}
+        for key, value in self._published_values.items():
+            self._values.setdefault(key, value)
+        self._published_hashes.clear()
+        self._published_values.clear()
+        self.resyncs += 1
+        self._dirty.set()
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._hashes or self._values or self._meters or self._deletes or self._stream_entries)
+
+    def _due_meters(self) -> dict[str, str]:
+        now = time.monotonic()
+        due = {
+            key: value
+            for key, value in self._meters.items()
+            if now - self._meter_sent_at.get(key, float("-inf")) >= self.meter_interval
+        }
+        for key in due:
+            del self._meters[key]
+            self._meter_sent_at[key] = now
+        return due
+
+    async def flush(self) -> None:
+        deletes, self._deletes = self._deletes, set()
+        hashes, self._hashes = self._hashes, {}
+        values, self._values = self._values, {}
+        stream_entries, self._stream_entries = self._stream_entries, {}
+
+        hash_changes = {}
+        for key, mapping in hashes.items():
+            published = self._published_hashes.get(key, {})
+            changed = {field: value for field, value in mapping.items() if published.get(field) != value}
+            if changed:
+                hash_changes[key] = changed
+            else:
+                self.skipped += 1
+
+        value_changes = {}
+        for key, value in values.items():
+            if self._published_values.get(key) != value:
+                value_changes[key] = value
+            else:
+                self.skipped += 1
+        meters = self._due_meters()
+
+        if not (deletes or hash_changes or value_changes or meters or stream_entries):
+            return
+
+        pipeline = self._redis.pipeline(transaction=False)
+        if deletes:
+            pipeline.delete(*deletes)
+        for key, changed in hash_changes.items():
+            pipeline.hset(key, mapping=changed)
+        for key, value in {**value_changes, **meters}.items():
+            pipeline.set(key, value)
+        for stream, entries in stream_entries.items():
+            for fields in entries:
+                pipeline.xadd(stream, fields, maxlen=entries.maxlen, approximate=True)
+
+        try:
+            await pipeline.execute()
+        except Exception as exception:
+            logger.debug(f"Redis flush error: {exception}")
+            # Anything newer queued during the flush wins over the failed batch
+            self._deletes |= deletes - set(self._hashes) - set(self._values)
+            for key, changed in hash_changes.items():
+                self._hashes[key] = {**changed, **self._hashes.get(key, {})}
+            for key, value in {**value_changes, **meters}.items():
+                self._values.setdefault(key, value)
+            for stream, entries in stream_entries.items():
+                queued = [*entries, *self._stream_entries.get(stream, ())]
+                self._stream_entries[stream] = deque(queued, maxlen=entries.maxlen)
+                if len(queued) > entries.maxlen:
+                    self._dropped_stream_entries(stream, len(queued) - entries.maxlen)
+            self.resync()
+            return
+
+        self.flushes += 1
+        if self._outage_dropped:
+            logger.warning(f"Redis flushed again after dropping {self._outage_dropped} stream entries")
+            self._outage_dropped = 0
+        self.commands += bool(deletes) + len(hash_changes) + len(value_changes) + len(meters)
+        self.commands += sum(len(entries) for entries in stream_entries.values())
+        for key, changed in hash_changes.items():
+            self._published_hashes.setdefault(key, {}).update(changed)
+        for key, value in value_changes.items():
+            self._published_values[key] = value
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await self._dirty.wait()
+            await asyncio.sleep(self.flush_interval)
+            self._dirty.clear()
+            await self.flush()
+            if self._meters:
+                # Rate-limited meter readings still waiting for their slot
+                self._dirty.set()
+
+    async def _resync_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.resync_interval)
+            self.resync()
+
+    async def start(self) -> None:
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+        if self._resync_task is None and self.resync_interval > 0:
+            self._resync_task = asyncio.create_task(self._resync_loop())
+
+    async def stop(self) -> None:
+        for task in (self._flush_task, self._resync_task):
+            if task is None:
+                continue
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._flush_task = None
+        self._resync_task = None
+
+        self._meter_sent_at.clear()
+        await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "flushes": self.flushes,
+            "commands": self.commands,
+            "skipped": self.skipped,
+            "resyncs": self.resyncs,
+            "stream_dropped": self.stream_dropped,
+        }
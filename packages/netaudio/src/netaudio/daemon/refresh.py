@@ -0,0 +1,112 @@
+import struct
+
+from netaudio.dante.const import (
+    OPCODE_RX_CHANNEL_NAME_SET,
+    OPCODE_SUBSCRIPTION_ADD,
+    OPCODE_SUBSCRIPTION_REMOVE,
+    OPCODE_TX_CHANNEL_NAME_SET,
+    PROTOCOL_ID,
+)
+from netaudio.dante.services.notification import (
+    NOTIFICATION_CLOCKING_STATUS,
+    NOTIFICATION_ENCODING_STATUS,
+    NOTIFICATION_INTERFACE_STATUS,
+    NOTIFICATION_PROPERTY_CHANGE,
+    NOTIFICATION_ROUTING_DEVICE_CHANGE,
+    NOTIFICATION_RX_CHANNEL_CHANGE,
+    NOTIFICATION_RX_FLOW_CHANGE,
+    NOTIFICATION_SAMPLE_RATE_STATUS,
+    NOTIFICATION_TX_CHANNEL_CHANGE,
+    NOTIFICATION_TX_FLOW_CHANGE,
+    NOTIFICATION_TX_LABEL_CHANGE,
+)
+
+RX_PAGE_SIZE = 16
+TX_PAGE_SIZE = 32
+
+# Writes proxied through the daemon name the channels they touch; a following
+# notification only re-reads those pages if it arrives within this window.
+DIRTY_CHANNEL_TTL = 5.0
+
+REFRESH_TX_CHANNELS = "tx_channels"
+REFRESH_RX_CHANNELS = "rx_channels"
+REFRESH_CHANNEL_COUNT = "channel_count"
+REFRESH_TX_FLOWS = "tx_flows"
+REFRESH_DEVICE_NAME = "device_name"
+REFRESH_DEVICE_SETTINGS = "device_settings"
+REFRESH_INTERFACES = "interfaces"
+REFRESH_PREFERRED_LEADER = "preferred_leader"
+
+# Notification id -> the queries that cover what it reports
+NOTIFICATION_REFRESHES = {
+    NOTIFICATION_TX_CHANNEL_CHANGE: (REFRESH_TX_CHANNELS,),
+    NOTIFICATION_TX_LABEL_CHANGE: (REFRESH_TX_CHANNELS,),
+    NOTIFICATION_RX_CHANNEL_CHANGE: (REFRESH_RX_CHANNELS,),
+    NOTIFICATION_ROUTING_DEVICE_CHANGE: (REFRESH_RX_CHANNELS,),
+    NOTIFICATION_TX_FLOW_CHANGE: (REFRESH_CHANNEL_COUNT, REFRESH_TX_FLOWS),
+    NOTIFICATION_RX_FLOW_CHANGE: (REFRESH_CHANNEL_COUNT, REFRESH_RX_CHANNELS),
+    NOTIFICATION_SAMPLE_RATE_STATUS: (REFRESH_DEVICE_SETTINGS,),
+    NOTIFICATION_ENCODING_STATUS: (REFRESH_TX_CHANNELS,),
+    NOTIFICATION_PROPERTY_CHANGE: (REFRESH_DEVICE_NAME, REFRESH_CHANNEL_COUNT, REFRESH_DEVICE_SETTINGS),
+    NOTIFICATION_INTERFACE_STATUS: (REFRESH_INTERFACES,),
+    NOTIFICATION_CLOCKING_STATUS: (REFRESH_PREFERRED_LEADER,),
+}
+
+
+def written_channels(packet: bytes) -> tuple[str, set[int]] | None:
+    if len(packet) < 12 or struct.unpack(">H", packet[0:2])[0] != PROTOCOL_ID:
+        return None
+
+    opcode = struct.unpack(">H", packet[6:8])[0]
+
+    if opcode == OPCODE_RX_CHANNEL_NAME_SET and len(packet) > 13:
+        return "rx", {packet[13]}
+
+    if opcode == OPCODE_TX_CHANNEL_NAME_SET and len(packet) > 15:
+        return "tx", {packet[15]}
+
+    if opcode == OPCODE_SUBSCRIPTION_ADD and len(packet) > 13:
+        channels = {packet[13]}
+        for index in range(packet[11] - 1):
+            offset = 19 + index * 6
+            if offset >= len(packet):
+                break
+            channels.add(packet[offset])
+        return "rx", channels
+
+    if opcode == OPCODE_SUBSCRIPTION_REMOVE:
+        count = struct.unpack(">I", packet[8:12])[0]
+        channels = set()
+        for offset in range(12, min(12 + count * 4, len(packet) - 3), 4):
+            channels.add(struct.unpack(">I", packet[offset:offset + 4])[0])
+        return "rx", channels
+
+    return None
+
+
+def channel_pages(channels, page_size: int) -> list[int]:
+    return sorted({(number - 1) // page_size for number in channels if number > 0})
+
+
+def _merged(existing: dict, refreshed: dict, count: int | None) -> dict:
+    # Pages that failed to answer keep their previous channels; the count trims removed ones
+    channels = {**(existing or {}), **refreshed}
+    return {number: channels[number] for number in sorted(channels) if count is None or number <= count}
+
+
+def merge_tx_channels(device, tx_channels: dict) -> None:
+    device.tx_channels = _merged(device.tx_channels, tx_channels, device.tx_count)
+
+
+def merge_rx_channels(device, rx_channels: dict, subscriptions: list) -> None:
+    # Each parsed page yields one subscription per channel, in channel order
+    refreshed = dict(zip(rx_channels, subscriptions))
+    previous = {subscription.rx_channel_name: subscription for subscription in device.subscriptions or []}
+
+    device.rx_channels = _merged(device.rx_channels, rx_channels, device.rx_count)
+    merged_subscriptions = []
+    for number, channel in device.rx_channels.items():
+        subscription = refreshed.get(number) if number in rx_channels else previous.get(channel.name)
+        if subscription is not None:
+            merged_subscriptions.append(subscription)
+    device.subscriptions = merged_subscriptions
@@ -1,19 +1,117 @@
 import asyncio
+import gzip
 import json
 import logging
+import os
 import socket
+from collections import OrderedDict, deque
 
 from zeroconf import ServiceInfo
 from zeroconf.asyncio import AsyncZeroconf
 
 from netaudio.dante.device_serializer import DanteDeviceSerializer
-from netaudio.dante.events import DanteEvent, EventType
+from netaudio.dante.events import OVERFLOW_COALESCE, DanteEvent, EventType
 
 logger = logging.getLogger("netaudio")
 
 RELAY_SERVICE_TYPE = "_netaudio-relay._tcp.local."
 DEFAULT_RELAY_PORT = 9000
 
+KEEPALIVE_TIMEOUT = 30.0
+KEEPALIVE_MAX_REQUESTS = 1000
+GZIP_MIN_SIZE = 1024
+GZIP_LEVEL = 6
+
+STATUS_TEXT = {200: "OK", 304: "Not Modified"}
+
+SSE_CLIENT_QUEUE_SIZE = 256
+SSE_WRITE_TIMEOUT = 10.0
+SSE_EVENT_LOG_SIZE = 1024
+
+# Only the newest frame per key is worth sending to a client that is behind
+SSE_COALESCED_EVENTS = frozenset({"meter_values", "shure_meter_values"})
+
+
+def sse_coalesce_key(data: dict):
+    event = data.get("event")
+    if event not in SSE_COALESCED_EVENTS:
+        return None
+    return event, data.get("server_name"), data.get("mac"), data.get("channel"), data.get("key")
+
+
+class _SSEClient:
+    def __init__(self, writer, snapshot, max_queue: int = SSE_CLIENT_QUEUE_SIZE, replay: list[bytes] | None = None):
+        self.writer = writer
+        self.snapshot = snapshot
+        self.max_queue = max_queue
+        self._pending: OrderedDict = OrderedDict()
+        self._sequence = 0
+        self._ready = asyncio.Event()
+        # A new client starts with a snapshot, the same as one that fell behind, unless it is resuming
+        self.resync = replay is None
+        for payload in replay or ():
+            self._sequence += 1
+            self._pending[self._sequence] = payload
+        if self.resync or self._pending:
+            self._ready.set()
+        self.task: asyncio.Task | None = None
+        self.replayed = len(replay or ())
+        self.sent = 0
+        self.coalesced = 0
+        self.resyncs = 0
+
+    def offer(self, key, payload: bytes) -> None:
+        if self.resync:
+            return
+
+        if key is not None and key in self._pending:
+            self._pending[key] = payload
+            self.coalesced += 1
+            return
+
+        if len(self._pending) >= self.max_queue:
+            # Too far behind: drop the backlog and send current state instead
+            self._pending.clear()
+            self.resync = True
+            self.resyncs += 1
+            self._ready.set()
+            return
+
+        if key is None:
+            self._sequence += 1
+            key = self._sequence
+        self._pending[key] = payload
+        self._ready.set()
+
+    async def run(self) -> None:
+        while True:
+            await self._ready.wait()
+            self._ready.clear()
+
+            if self.resync:
+                # Built here so nothing queued before it can be sent after it
+                self.resync = False
+                self._pending.clear()
+                payloads = [self.snapshot()]
+            else:
+                payloads = list(self._pending.values())
+                self._pending.clear()
+
+            self.writer.write(b"".join(payloads))
+            await asyncio.wait_for(self.writer.drain(), timeout=SSE_WRITE_TIMEOUT)
+            self.sent += len(payloads)
+
+    def stats(self) -> dict:
+        peer = self.writer.get_extra_info("peername")
+        return {
+            "peer": f"{peer[0]}:{peer[1]}" if peer else None,
+            "depth": len(self._pending),
+            "replayed": self.replayed,
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "resyncs": self.resyncs,
+        }
+
 
 class RelayServer:
     def __init__(self, daemon, port=None):
@@ -22,7 +120,17 @@ class RelayServer:
         self.tcp_server = None
         self.zeroconf = None
         self.service_info = None
-        self.sse_clients: list[asyncio.StreamWriter] = []
+        self.sse_clients: list[_SSEClient] = []
+        # Headers and keep-alive flag of the request each connection is currently serving
+        self._requests: dict[asyncio.StreamWriter, tuple[dict[str, str], bool]] = {}
+        self._devices_body: tuple[str, bytes, bytes | None] | None = None
+        # Per device: registry version, serialized fields and the joined device JSON
+        self._device_cache: dict[str, tuple[int | None, dict[str, str], str]] = {}
+        self._shure_text: dict[str, str] = {}
+        self._snapshot_cache: tuple[tuple[int, int], bytes] | None = None
+        self._sse_epoch = os.urandom(4).hex()
+        self._sse_sequence = 0
+        self._sse_log: deque[tuple[int, bytes]] = deque(maxlen=SSE_EVENT_LOG_SIZE)
 
     async def start(self):
         self.tcp_server = await asyncio.start_server(
@@ -38,9 +146,11 @@ class RelayServer:
             await self.zeroconf.async_unregister_service(self.service_info)
             await self.zeroconf.async_close()
 
-        for writer in self.sse_clients:
+        for client in self.sse_clients:
+            if client.task:
+                client.task.cancel()
             try:
-                writer.close()
+                client.writer.close()
             except Exception:
                 pass
         self.sse_clients.clear()
@@ -52,32 +162,25 @@ class RelayServer:
     def _register_events(self):
         dispatcher = self.daemon.application.dispatcher
         dispatcher.on(EventType.DEVICE_DISCOVERED, self._on_device_event)
-        dispatcher.on(EventType.DEVICE_UPDATED, self._on_device_event)
+        dispatcher.on(EventType.DEVICE_UPDATED, self._on_device_event, overflow=OVERFLOW_COALESCE)
         dispatcher.on(EventType.DEVICE_REMOVED, self._on_device_removed)
         dispatcher.on(EventType.NOTIFICATION_RECEIVED, self._on_notification)
-        dispatcher.on(EventType.METER_VALUES, self._on_meter_values)
+        dispatcher.on(EventType.METER_VALUES, self._on_meter_values, overflow=OVERFLOW_COALESCE)
         dispatcher.on(EventType.SHURE_DEVICE_DISCOVERED, self._on_shure_event)
-        dispatcher.on(EventType.SHURE_DEVICE_UPDATED, self._on_shure_event)
+        dispatcher.on(EventType.SHURE_DEVICE_UPDATED, self._on_shure_event, overflow=OVERFLOW_COALESCE)
         dispatcher.on(EventType.SHURE_DEVICE_REMOVED, self._on_shure_removed)
-        dispatcher.on(EventType.SHURE_METER_VALUES, self._on_shure_meter)
+        dispatcher.on(EventType.SHURE_METER_VALUES, self._on_shure_meter, overflow=OVERFLOW_COALESCE)
 
     async def _on_device_event(self, event: DanteEvent):
         device = self.daemon.devices.get(event.server_name)
         if not device:
             return
 
-        device_json = DanteDeviceSerializer.to_json(device)
-        device_json["online"] = device.online
-        device_json["tx_count"] = device.tx_count
-        device_json["rx_count"] = device.rx_count
-
-        await self._broadcast_sse({
-            "event": event.type.name.lower(),
-            "server_name": event.server_name,
-            "device": device_json,
-        })
+        extra = {"fields": event.data["fields"]} if "fields" in event.data else None
+        await self._broadcast_device(device, event.type.name.lower(), extra)
 
     async def _on_device_removed(self, event: DanteEvent):
+        self._device_cache.pop(event.server_name, None)
         await self._broadcast_sse({
             "event": "device_removed",
             "server_name": event.server_name,
@@ -97,13 +200,16 @@ class RelayServer:
         device = self.daemon.shure.devices.get(event.device_name)
         if not device:
             return
+        device_json = device.to_json()
+        self._shure_text[event.device_name] = json.dumps(device_json, default=str)
         await self._broadcast_sse({
             "event": event.type.name.lower(),
             "mac": event.device_name,
-            "device": device.to_json(),
+            "device": device_json,
         })
 
     async def _on_shure_removed(self, event: DanteEvent):
+        self._shure_text.pop(event.device_name, None)
         await self._broadcast_sse({
             "event": "shure_device_removed",
             "mac": event.device_name,
@@ -123,28 +229,70 @@ class RelayServer:
         if not device:
             return
 
+        await self._broadcast_device(device, "device_updated")
+
+    @staticmethod
+    def _device_json(device) -> dict:
         device_json = DanteDeviceSerializer.to_json(device)
         device_json["online"] = device.online
         device_json["tx_count"] = device.tx_count
         device_json["rx_count"] = device.rx_count
+        return device_json
+
+    async def _broadcast_device(self, device, event_name: str, extra: dict | None = None):
+        server_name = device.server_name
+        device_json = self._device_json(device)
+        fields = {field: json.dumps(value, default=str) for field, value in device_json.items()}
+        text = "{" + ",".join(f"{json.dumps(field)}:{value}" for field, value in fields.items()) + "}"
+        cached = self._device_cache.get(server_name)
+        self._device_cache[server_name] = (self.daemon.devices.device_version(server_name), fields, text)
+
+        message = {"event": event_name, "server_name": server_name}
+        if cached is None or event_name == "device_discovered":
+            message["device"] = device_json
+        else:
+            # Clients already hold the previous state, so only changed top-level fields are sent
+            previous = cached[1]
+            changes = {field: device_json[field] for field, value in fields.items() if previous.get(field) != value}
+            removed = [field for field in previous if field not in fields]
+            if not changes and not removed:
+                return
+            message["changes"] = changes
+            if removed:
+                message["removed"] = removed
 
-        await self._broadcast_sse({
-            "event": "device_updated",
-            "server_name": event.server_name,
-            "device": device_json,
-        })
+        if extra:
+            message.update(extra)
+        await self._broadcast_sse(message)
 
     async def _broadcast_sse(self, data):
-        payload = f"data: {json.dumps(data, default=str)}\n\n".encode()
-        dead_clients = []
-        for writer in self.sse_clients:
-            try:
-                writer.write(payload)
-                await writer.drain()
-            except (BrokenPipeError, ConnectionResetError, OSError):
-                dead_clients.append(writer)
-        for writer in dead_clients:
-            self.sse_clients.remove(writer)
+        text = json.dumps(data, default=str)
+        key = sse_coalesce_key(data)
+        if key is None:
+            # State events are numbered and kept so a reconnecting client can replay what it missed
+            self._sse_sequence += 1
+            payload = f"id: {self._sse_epoch}:{self._sse_sequence}\ndata: {text}\n\n".encode()
+            self._sse_log.append((self._sse_sequence, payload))
+        else:
+            payload = f"data: {text}\n\n".encode()
+
+        for client in self.sse_clients:
+            client.offer(key, payload)
+
+    def _sse_replay(self, last_event_id: str | None) -> list[bytes] | None:
+        if not last_event_id:
+            return None
+
+        epoch, _, sequence = last_event_id.strip().partition(":")
+        if epoch != self._sse_epoch or not sequence.isdigit():
+            return None
+
+        sequence = int(sequence)
+        oldest = self._sse_log[0][0] if self._sse_log else self._sse_sequence + 1
+        if sequence > self._sse_sequence or sequence + 1 < oldest:
+            return None
+
+        return [payload for logged, payload in self._sse_log if logged > sequence]
 
     async def _register_bonjour(self):
         hostname = socket.gethostname()
@@ -172,41 +320,62 @@ class RelayServer:
 
     async def handle_connection(self, reader, writer):
         try:
-            raw = await asyncio.wait_for(reader.readline(), timeout=5.0)
-            if not raw:
-                return
-
-            request = raw.decode().strip()
-            parts = request.split(" ", 2)
-            if len(parts) < 2:
-                await self._send_json(writer, {"error": "bad request"}, 400)
-                return
-
-            method = parts[0]
-            path = parts[1]
+            for served in range(KEEPALIVE_MAX_REQUESTS):
+                timeout = 5.0 if served == 0 else KEEPALIVE_TIMEOUT
+                raw = await asyncio.wait_for(reader.readline(), timeout=timeout)
+                if not raw:
+                    return
 
-            headers = {}
-            while True:
-                header_line = await asyncio.wait_for(reader.readline(), timeout=2.0)
-                if header_line in (b"\r\n", b"\n", b""):
-                    break
-                decoded = header_line.decode().strip()
-                if ":" in decoded:
-                    key, value = decoded.split(":", 1)
-                    headers[key.strip().lower()] = value.strip()
+                request = raw.decode().strip()
+                parts = request.split(" ", 2)
+                if len(parts) < 2:
+                    await self._send_json(writer, {"error": "bad request"}, 400)
+                    return
 
-            body = None
-            if method == "POST":
+                method = parts[0]
+                path = parts[1]
+                version = parts[2] if len(parts) > 2 else "HTTP/1.0"
+
+                headers = {}
+                while True:
+                    header_line = await asyncio.wait_for(reader.readline(), timeout=2.0)
+                    if header_line in (b"\r\n", b"\n", b""):
+                        break
+                    decoded = header_line.decode().strip()
+                    if ":" in decoded:
+                        key, value = decoded.split(":", 1)
+                        headers[key.strip().lower()] = value.strip()
+
+                body = None
                 content_length = int(headers.get("content-length", "0"))
                 if content_length > 0:
                     body = await asyncio.wait_for(reader.readexactly(content_length), timeout=5.0)
+                if method != "POST":
+                    body = None
+
+                connection = headers.get("connection", "").lower()
+                if version == "HTTP/1.1":
+                    keep_alive = connection != "close"
+                else:
+                    keep_alive = connection == "keep-alive"
+                keep_alive = keep_alive and path != "/events" and served < KEEPALIVE_MAX_REQUESTS - 1
+
+                self._requests[writer] = (headers, keep_alive)
+                await self._route(method, path, body, writer, reader)
+                if not keep_alive:
+                    return
 
-            await self._route(method, path, body, writer, reader)
-
-        except (asyncio.TimeoutError, ConnectionResetError, BrokenPipeError):
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionResetError, BrokenPipeError):
             pass
         except Exception as exception:
             logger.debug(f"Relay connection error: {exception}")
+        finally:
+            self._requests.pop(writer, None)
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except (BrokenPipeError, ConnectionResetError, OSError):
+                pass
 
     async def _route(self, method, path, body, writer, reader):
         if method == "GET" and path == "/events":
@@ -238,6 +407,12 @@ class RelayServer:
             await self._handle_lock(writer, body)
         elif method == "POST" and path == "/unlock":
             await self._handle_unlock(writer, body)
+        elif method == "GET" and path == "/events/status":
+            await self._send_json(writer, self.daemon.application.dispatcher.stats())
+        elif method == "GET" and path == "/events/clients":
+            await self._send_json(writer, [client.stats() for client in self.sse_clients])
+        elif method == "GET" and path == "/refresh/status":
+            await self._send_json(writer, self.daemon.refresh_scheduler.stats())
         elif method == "POST" and path == "/refresh":
             await self._handle_refresh(writer, body)
         elif method == "POST" and path == "/set-sample-rate":
@@ -261,12 +436,6 @@ class RelayServer:
         else:
             await self._send_json(writer, {"error": "not found"}, 404)
 
-        try:
-            writer.close()
-            await writer.wait_closed()
-        except (BrokenPipeError, ConnectionResetError, OSError):
-            pass
-
     async def _handle_sse(self, writer, reader):
         response_header = (
             "HTTP/1.1 200 OK\r\n"
@@ -279,36 +448,61 @@ class RelayServer:
         writer.write(response_header)
         await writer.drain()
 
-        full_state = {}
-        for server_name, device in self.daemon.devices.items():
-            device_json = DanteDeviceSerializer.to_json(device)
-            device_json["online"] = device.online
-            device_json["tx_count"] = device.tx_count
-            device_json["rx_count"] = device.rx_count
-            full_state[server_name] = device_json
+        headers, _ = self._requests.get(writer, ({}, False))
+        replay = self._sse_replay(headers.get("last-event-id"))
+        if replay is not None and len(replay) > SSE_CLIENT_QUEUE_SIZE:
+            replay = None
 
-        shure_state = {}
-        if self.daemon.shure:
-            for mac, device in self.daemon.shure.devices.items():
-                shure_state[mac] = device.to_json()
-
-        initial = f"data: {json.dumps({'event': 'snapshot', 'devices': full_state, 'shure_devices': shure_state}, default=str)}\n\n".encode()
-        writer.write(initial)
-        await writer.drain()
-
-        self.sse_clients.append(writer)
+        client = _SSEClient(writer, self._sse_snapshot, replay=replay)
+        client.task = asyncio.create_task(client.run())
+        self.sse_clients.append(client)
 
+        read_task = asyncio.create_task(reader.read(1024))
         try:
+            # Ends when the client disconnects or its writer gives up on it
             while True:
-                data = await reader.read(1)
-                if not data:
+                done, _ = await asyncio.wait({read_task, client.task}, return_when=asyncio.FIRST_COMPLETED)
+                if client.task in done or not read_task.result():
                     break
-                await asyncio.sleep(0.1)
+                read_task = asyncio.create_task(reader.read(1024))
         except (asyncio.CancelledError, ConnectionResetError, BrokenPipeError):
             pass
         finally:
-            if writer in self.sse_clients:
-                self.sse_clients.remove(writer)
+            read_task.cancel()
+            if client.task.done() and not client.task.cancelled() and client.task.exception():
+                logger.debug(f"Dropping SSE client {client.stats()['peer']}: {client.task.exception()!r}")
+            client.task.cancel()
+            if client in self.sse_clients:
+                self.sse_clients.remove(client)
+
+    def _sse_snapshot(self) -> bytes:
+        devices = self.daemon.devices
+        key = (self._sse_sequence, devices.version)
+        if self._snapshot_cache is not None and self._snapshot_cache[0] == key:
+            return self._snapshot_cache[1]
+
+        device_texts = []
+        for server_name, device in devices.items():
+            cached = self._device_cache.get(server_name)
+            if cached is not None and cached[0] == devices.device_version(server_name):
+                text = cached[2]
+            else:
+                text = json.dumps(self._device_json(device), default=str)
+            device_texts.append(f"{json.dumps(server_name)}:{text}")
+
+        shure_texts = []
+        if self.daemon.shure:
+            for mac, device in self.daemon.shure.devices.items():
+                text = self._shure_text.get(mac) or json.dumps(device.to_json(), default=str)
+                shure_texts.append(f"{json.dumps(mac)}:{text}")
+
+        data = (
+            '{"event":"snapshot","devices":{' + ",".join(device_texts)
+            + '},"shure_devices":{' + ",".join(shure_texts) + "}}"
+        )
+        payload = f"id: {self._sse_epoch}:{self._sse_sequence}\ndata: {data}\n\n".encode()
+        self._snapshot_cache = (key, payload)
+        return payload
 
     async def _handle_get_shure_devices(self, writer):
         if not self.daemon.shure:
@@ -338,16 +532,28 @@ class RelayServer:
         await self._send_json(writer, device.to_json())
 
     async def _handle_get_devices(self, writer):
-        devices_json = {}
-        for server_name, device in self.daemon.devices.items():
-            devices_json[server_name] = DanteDeviceSerializer.to_json(device)
-            devices_json[server_name]["online"] = device.online
-            devices_json[server_name]["tx_count"] = device.tx_count
-            devices_json[server_name]["rx_count"] = device.rx_count
-        await self._send_json(writer, devices_json)
+        devices = self.daemon.devices
+        etag = f'"{devices.epoch.hex()}-{devices.version}"'
+
+        # The fleet is only reserialized when the registry version moves
+        if self._devices_body is None or self._devices_body[0] != etag:
+            devices_json = {}
+            for server_name, device in devices.items():
+                devices_json[server_name] = DanteDeviceSerializer.to_json(device)
+                devices_json[server_name]["online"] = device.online
+                devices_json[server_name]["tx_count"] = device.tx_count
+                devices_json[server_name]["rx_count"] = device.rx_count
+            self._devices_body = (etag, json.dumps(devices_json, default=str).encode(), None)
+
+        _, body, compressed = self._devices_body
+        if compressed is None and self._accepts_gzip(writer) and len(body) >= GZIP_MIN_SIZE:
+            compressed = gzip.compress(body, compresslevel=GZIP_LEVEL)
+            self._devices_body = (etag, body, compressed)
+
+        await self._send_body(writer, body, etag=etag, compressed=compressed)
 
     async def _handle_get_device(self, writer, server_name):
-        device = self.daemon.devices.get(server_name)
+        device = self.daemon.devices.get(server_name) or self.daemon.devices.by_name(server_name)
         if not device:
             for name, candidate in self.daemon.devices.items():
                 if candidate.name and candidate.name.lower() == server_name.lower():
@@ -358,11 +564,17 @@ class RelayServer:
             await self._send_json(writer, {"error": "device not found"}, 404)
             return
 
+        devices = self.daemon.devices
+        etag = f'"{devices.epoch.hex()}-{devices.device_version(device.server_name)}"'
+        if self._not_modified(writer, etag):
+            await self._send_body(writer, b"", etag=etag)
+            return
+
         device_json = DanteDeviceSerializer.to_json(device)
         device_json["online"] = device.online
         device_json["tx_count"] = device.tx_count
         device_json["rx_count"] = device.rx_count
-        await self._send_json(writer, device_json)
+        await self._send_json(writer, device_json, etag=etag)
 
     async def _handle_subscribe(self, writer, body):
         if not body:
@@ -600,15 +812,7 @@ class RelayServer:
             await self._send_json(writer, {"error": str(exception)}, 500)
 
     async def _broadcast_device_updated(self, device):
-        device_json = DanteDeviceSerializer.to_json(device)
-        device_json["online"] = device.online
-        device_json["tx_count"] = device.tx_count
-        device_json["rx_count"] = device.rx_count
-        await self._broadcast_sse({
-            "event": "device_updated",
-            "server_name": device.server_name,
-            "device": device_json,
-        })
+        await self._broadcast_device(device, "device_updated")
 
     def _get_lock_key(self):
         from netaudio.common.app_config import settings as app_settings
@@ -817,25 +1021,56 @@ class RelayServer:
     def _find_device(self, name):
         if not name:
             return None
-        device = self.daemon.devices.get(name)
+        devices = self.daemon.devices
+        device = devices.get(name) or devices.by_name(name) or devices.by_ip(name)
         if device:
             return device
-        for server_name, candidate in self.daemon.devices.items():
+        for server_name, candidate in devices.items():
             if candidate.name and candidate.name.lower() == name.lower():
                 return candidate
-            if candidate.ipv4 and str(candidate.ipv4) == name:
-                return candidate
         return None
 
-    async def _send_json(self, writer, data, status=200):
+    def _accepts_gzip(self, writer) -> bool:
+        headers, _ = self._requests.get(writer, ({}, False))
+        return "gzip" in headers.get("accept-encoding", "").lower()
+
+    def _not_modified(self, writer, etag: str) -> bool:
+        headers, _ = self._requests.get(writer, ({}, False))
+        if_none_match = headers.get("if-none-match")
+        if not if_none_match:
+            return False
+        return if_none_match.strip() == "*" or etag in (tag.strip() for tag in if_none_match.split(","))
+
+    async def _send_json(self, writer, data, status=200, etag=None):
         body = json.dumps(data, default=str).encode()
-        status_text = "OK" if status == 200 else "Error"
-        response = (
-            f"HTTP/1.1 {status} {status_text}\r\n"
-            f"Content-Type: application/json\r\n"
-            f"Content-Length: {len(body)}\r\n"
-            f"Access-Control-Allow-Origin: *\r\n"
-            f"\r\n"
-        ).encode() + body
-        writer.write(response)
+        await self._send_body(writer, body, status, etag=etag)
+
+    async def _send_body(self, writer, body: bytes, status=200, etag=None, compressed=None):
+        _, keep_alive = self._requests.get(writer, ({}, False))
+        headers = [
+            "Content-Type: application/json",
+            "Access-Control-Allow-Origin: *",
+            "Connection: keep-alive" if keep_alive else "Connection: close",
+        ]
+        if keep_alive:
+            headers.append(f"Keep-Alive: timeout={int(KEEPALIVE_TIMEOUT)}, max={KEEPALIVE_MAX_REQUESTS}")
+
+        if etag is not None:
+            headers.append(f"ETag: {etag}")
+            headers.append("Cache-Control: no-cache")
+            if status == 200 and self._not_modified(writer, etag):
+                status = 304
+                body = b""
+
+        if status != 304 and self._accepts_gzip(writer) and len(body) >= GZIP_MIN_SIZE:
+            body = compressed or gzip.compress(body, compresslevel=GZIP_LEVEL)
+            headers.append("Content-Encoding: gzip")
+            headers.append("Vary: Accept-Encoding")
+
+        if status != 304:
+            headers.append(f"Content-Length: {len(body)}")
+
+        status_text = STATUS_TEXT.get(status, "Error")
+        head = f"HTTP/1.1 {status} {status_text}\r\n" + "".join(f"{header}\r\n" for header in headers) + "\r\n"
+        writer.write(head.encode() + body)
         await writer.drain()
@@ -0,0 +1,144 @@
+import struct
+import time
+
+from netaudio.dante.const import (
+    FLOW_PROTOCOL_IDS,
+    OPCODE_CHANNEL_COUNT,
+    OPCODE_DEVICE_INFO,
+    OPCODE_DEVICE_NAME,
+    OPCODE_DEVICE_SETTINGS,
+    OPCODE_QUERY_TX_FLOWS,
+    OPCODE_QUERY_TX_FLOWS_2809,
+    OPCODE_RX_CHANNELS,
+    OPCODE_TX_CHANNEL_INFO,
+    OPCODE_TX_CHANNEL_NAMES,
+    PROTOCOL_AES67_CONFIG,
+    PROTOCOL_ID,
+)
+from netaudio.dante.services.notification import (
+    NOTIFICATION_AES67_STATUS,
+    NOTIFICATION_CLEAR_CONFIG_STATUS,
+    NOTIFICATION_CLOCKING_STATUS,
+    NOTIFICATION_DEVICE_REBOOT,
+    NOTIFICATION_ENCODING_STATUS,
+    NOTIFICATION_INTERFACE_STATUS,
+    NOTIFICATION_MANF_VERSIONS_STATUS,
+    NOTIFICATION_PROPERTY_CHANGE,
+    NOTIFICATION_ROUTING_DEVICE_CHANGE,
+    NOTIFICATION_ROUTING_READY,
+    NOTIFICATION_RX_CHANNEL_CHANGE,
+    NOTIFICATION_RX_FLOW_CHANGE,
+    NOTIFICATION_SAMPLE_RATE_STATUS,
+    NOTIFICATION_TX_CHANNEL_CHANGE,
+    NOTIFICATION_TX_FLOW_CHANGE,
+    NOTIFICATION_TX_LABEL_CHANGE,
+    NOTIFICATION_VERSIONS_STATUS,
+)
+
+RESPONSE_CACHE_TTL = 300.0
+RESPONSE_CACHE_MAX_ENTRIES = 256
+
+TX_FLOW_COMMANDS = frozenset(
+    [(protocol_id, OPCODE_QUERY_TX_FLOWS) for protocol_id in FLOW_PROTOCOL_IDS]
+    + [(PROTOCOL_AES67_CONFIG, OPCODE_QUERY_TX_FLOWS_2809)]
+)
+
+TX_CHANNEL_COMMANDS = frozenset([(PROTOCOL_ID, OPCODE_TX_CHANNEL_INFO), (PROTOCOL_ID, OPCODE_TX_CHANNEL_NAMES)])
+
+DEVICE_SETTINGS_COMMANDS = frozenset(
+    [(PROTOCOL_ID, OPCODE_DEVICE_SETTINGS), (PROTOCOL_AES67_CONFIG, OPCODE_DEVICE_SETTINGS)]
+)
+
+# Notification id -> cached commands it makes stale; None drops everything cached for the device
+NOTIFICATION_INVALIDATIONS = {
+    NOTIFICATION_TX_CHANNEL_CHANGE: TX_CHANNEL_COMMANDS,
+    NOTIFICATION_TX_LABEL_CHANGE: TX_CHANNEL_COMMANDS,
+    NOTIFICATION_RX_CHANNEL_CHANGE: frozenset([(PROTOCOL_ID, OPCODE_RX_CHANNELS)]),
+    NOTIFICATION_ROUTING_DEVICE_CHANGE: frozenset([(PROTOCOL_ID, OPCODE_RX_CHANNELS)]),
+    NOTIFICATION_TX_FLOW_CHANGE: frozenset([(PROTOCOL_ID, OPCODE_CHANNEL_COUNT)]) | TX_FLOW_COMMANDS,
+    NOTIFICATION_RX_FLOW_CHANGE: frozenset([(PROTOCOL_ID, OPCODE_CHANNEL_COUNT), (PROTOCOL_ID, OPCODE_RX_CHANNELS)]),
+    NOTIFICATION_SAMPLE_RATE_STATUS: DEVICE_SETTINGS_COMMANDS,
+    NOTIFICATION_ENCODING_STATUS: DEVICE_SETTINGS_COMMANDS,
+    NOTIFICATION_AES67_STATUS: DEVICE_SETTINGS_COMMANDS | TX_FLOW_COMMANDS,
+    NOTIFICATION_PROPERTY_CHANGE: frozenset(
+        [(PROTOCOL_ID, OPCODE_DEVICE_NAME), (PROTOCOL_ID, OPCODE_DEVICE_INFO), (PROTOCOL_ID, OPCODE_CHANNEL_COUNT)]
+    )
+    | DEVICE_SETTINGS_COMMANDS,
+    NOTIFICATION_INTERFACE_STATUS: None,
+    NOTIFICATION_DEVICE_REBOOT: None,
+    NOTIFICATION_CLEAR_CONFIG_STATUS: None,
+    NOTIFICATION_ROUTING_READY: None,
+    NOTIFICATION_CLOCKING_STATUS: None,
+    NOTIFICATION_VERSIONS_STATUS: None,
+    NOTIFICATION_MANF_VERSIONS_STATUS: None,
+}
+
+
+def packet_command(packet: bytes) -> tuple[int, int] | None:
+    if len(packet) < 8:
+        return None
+    return struct.unpack(">H", packet[0:2])[0], struct.unpack(">H", packet[6:8])[0]
+
+
+class DanteResponseCache:
+    def __init__(self, ttl: float = RESPONSE_CACHE_TTL, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: dict[str, dict[tuple[int, bytes], tuple[float, bytes]]] = {}
+        self._generations: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def generation(self, device_ip: str) -> int:
+        return self._generations.get(device_ip, 0)
+
+    def get(self, key: tuple[str, int, bytes]) -> bytes | None:
+        device_ip, port, request = key
+        entries = self._entries.get(device_ip)
+        entry = entries.get((port, request)) if entries else None
+
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry[1]
+
+    def store(self, key: tuple[str, int, bytes], response: bytes, generation: int) -> None:
+        device_ip, port, request = key
+
+        # A notification that arrived while this read was in flight makes the response stale
+        if generation != self.generation(device_ip):
+            return
+
+        entries = self._entries.setdefault(device_ip, {})
+        if len(entries) >= self.max_entries and (port, request) not in entries:
+            entries.pop(next(iter(entries)))
+        entries[(port, request)] = (time.monotonic(), response)
+
+    def invalidate(self, device_ip: str, commands: frozenset[tuple[int, int]] | None = None) -> int:
+        self._generations[device_ip] = self.generation(device_ip) + 1
+
+        entries = self._entries.get(device_ip)
+        if not entries:
+            return 0
+
+        if commands is None:
+            del self._entries[device_ip]
+            return len(entries)
+
+        stale = [entry_key for entry_key in entries if packet_command(entry_key[1]) in commands]
+        for entry_key in stale:
+            del entries[entry_key]
+        return len(stale)
+
+    def invalidate_for_notification(self, device_ip: str, notification_id: int) -> int:
+        if notification_id not in NOTIFICATION_INVALIDATIONS:
+            return 0
+        return self.invalidate(device_ip, NOTIFICATION_INVALIDATIONS[notification_id])
+
+    def stats(self) -> dict:
+        return {"entries": len(self), "devices": len(self._entries), "hits": self.hits, "misses": self.misses}
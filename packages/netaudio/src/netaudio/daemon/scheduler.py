@@ -0,0 +1,223 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+
+logger = logging.getLogger("netaudio")
+
+PRIORITY_USER = 0
+PRIORITY_NOTIFICATION = 1
+PRIORITY_BACKGROUND = 2
+
+PRIORITY_NAMES = {
+    PRIORITY_USER: "user",
+    PRIORITY_NOTIFICATION: "notification",
+    PRIORITY_BACKGROUND: "background",
+}
+
+REFRESH_CONCURRENCY = 16
+REFRESH_JITTER = 0.5
+
+
+class _RefreshJob:
+    __slots__ = ("key", "group", "full", "job", "priority", "future", "absorbed", "timer", "enqueued_at")
+
+    def __init__(self, key, group, full: bool, job, priority: int, future: asyncio.Future):
+        self.key = key
+        self.group = group
+        self.full = full
+        self.job = job
+        self.priority = priority
+        self.future = future
+        self.absorbed: list[asyncio.Future] = []
+        self.timer: asyncio.TimerHandle | None = None
+        self.enqueued_at: float | None = None
+
+
+class RefreshScheduler:
+    def __init__(self, concurrency: int = REFRESH_CONCURRENCY, jitter: float = REFRESH_JITTER):
+        self.concurrency = concurrency
+        self.jitter = jitter
+        self._heap: list[tuple[int, int, _RefreshJob]] = []
+        self._sequence = itertools.count()
+        self._pending: dict = {}
+        self._running: dict = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self.completed = 0
+        self.failed = 0
+        self._waits = {priority: [0, 0.0, 0.0] for priority in PRIORITY_NAMES}
+
+    def schedule(
+        self,
+        key,
+        job,
+        priority: int = PRIORITY_BACKGROUND,
+        delay: float = 0.0,
+        group=None,
+        full: bool = False,
+    ) -> asyncio.Future:
+        # Jobs in one group (a device) never run at the same time; a full job covers
+        # everything else queued for its group
+        group = key if group is None else group
+        entry = self._pending.get(key)
+
+        if entry is not None:
+            # The newest job replaces the queued one; a more urgent request promotes it
+            entry.job = job
+            self._promote(entry, priority)
+            return entry.future
+
+        covering = self._queued_full_job(group)
+        if covering is not None:
+            self._promote(covering, priority)
+            return covering.future
+
+        entry = _RefreshJob(key, group, full, job, priority, asyncio.get_running_loop().create_future())
+        jitter = True
+        if full:
+            for absorbed in [queued for queued in self._pending.values() if queued.group == group]:
+                del self._pending[absorbed.key]
+                if absorbed.timer is not None:
+                    absorbed.timer.cancel()
+                else:
+                    # Already waiting for a slot, so the replacement does not start over
+                    delay, jitter = 0.0, False
+                entry.priority = min(entry.priority, absorbed.priority)
+                entry.absorbed += [absorbed.future, *absorbed.absorbed]
+        self._pending[key] = entry
+        self._idle.clear()
+
+        if jitter and entry.priority != PRIORITY_USER:
+            delay += random.uniform(0, self.jitter)
+
+        if delay > 0:
+            entry.timer = asyncio.get_running_loop().call_later(delay, self._enqueue, entry)
+        else:
+            self._enqueue(entry)
+
+        return entry.future
+
+    def _queued_full_job(self, group) -> _RefreshJob | None:
+        for entry in self._pending.values():
+            if entry.full and entry.group == group:
+                return entry
+        return None
+
+    def _promote(self, entry: _RefreshJob, priority: int) -> None:
+        if priority >= entry.priority:
+            return
+        entry.priority = priority
+        if entry.timer is None:
+            self._push(entry)
+        elif priority == PRIORITY_USER:
+            entry.timer.cancel()
+            self._enqueue(entry)
+
+    def _enqueue(self, entry: _RefreshJob) -> None:
+        entry.timer = None
+        entry.enqueued_at = time.monotonic()
+        self._push(entry)
+
+    def _push(self, entry: _RefreshJob) -> None:
+        heapq.heappush(self._heap, (entry.priority, next(self._sequence), entry))
+        self._pump()
+
+    def _pump(self) -> None:
+        deferred = []
+
+        while self._heap and len(self._running) < self.concurrency:
+            item = heapq.heappop(self._heap)
+            priority, _, entry = item
+
+            # Promotion leaves the old heap item behind
+            if self._pending.get(entry.key) is not entry or priority != entry.priority:
+                continue
+
+            # A group's jobs never overlap; this one waits for the running one to finish
+            if entry.group in self._running:
+                deferred.append(item)
+                continue
+
+            del self._pending[entry.key]
+            self._start(entry)
+
+        for item in deferred:
+            heapq.heappush(self._heap, item)
+
+    def _start(self, entry: _RefreshJob) -> None:
+        wait = time.monotonic() - entry.enqueued_at
+        waits = self._waits[entry.priority]
+        waits[0] += 1
+        waits[1] += wait
+        waits[2] = max(waits[2], wait)
+
+        self._running[entry.group] = entry
+        task = asyncio.create_task(self._run(entry))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, entry: _RefreshJob) -> None:
+        try:
+            await entry.job()
+            self.completed += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as exception:
+            self.failed += 1
+            logger.debug(f"Refresh {entry.key} failed: {exception}")
+        finally:
+            del self._running[entry.group]
+            for future in (entry.future, *entry.absorbed):
+                if not future.done():
+                    future.set_result(None)
+            self._pump()
+            if not self._pending and not self._running:
+                self._idle.set()
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for entry in self._pending.values() if entry.timer is None)
+
+    @property
+    def running(self) -> int:
+        return len(self._running)
+
+    async def join(self) -> None:
+        await self._idle.wait()
+
+    async def stop(self) -> None:
+        for entry in self._pending.values():
+            if entry.timer is not None:
+                entry.timer.cancel()
+            for future in (entry.future, *entry.absorbed):
+                future.cancel()
+        self._pending.clear()
+        self._heap.clear()
+
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._idle.set()
+
+    def stats(self) -> dict:
+        wait_times = {}
+        for priority, (count, total, longest) in self._waits.items():
+            wait_times[PRIORITY_NAMES[priority]] = {
+                "count": count,
+                "avg": total / count if count else 0.0,
+                "max": longest,
+            }
+
+        return {
+            "queued": self.queued,
+            "delayed": len(self._pending) - self.queued,
+            "running": self.running,
+            "concurrency": self.concurrency,
+            "completed": self.completed,
+            "failed": self.failed,
+            "wait": wait_times,
+        }
@@ -2,9 +2,9 @@ import asyncio
 import json
 import logging
 import os
-import pickle
 import struct
 import sys
+import time
 
 from zeroconf import ServiceStateChange
 from zeroconf.asyncio import AsyncServiceBrowser, AsyncServiceInfo, AsyncZeroconf
@@ -16,17 +16,55 @@ from netaudio.common.socket_path import (
 )
 from netaudio.daemon.metering import MeteringManager
 from netaudio.daemon.relay import RelayServer
+from netaudio.daemon.change_log import CHANGE_STREAM_KEY, CHANGE_STREAM_MAXLEN, DeviceChangeLog
+from netaudio.daemon.redis_publisher import RedisPublisher
+from netaudio.daemon.refresh import (
+    DIRTY_CHANNEL_TTL,
+    NOTIFICATION_REFRESHES,
+    REFRESH_CHANNEL_COUNT,
+    REFRESH_DEVICE_NAME,
+    REFRESH_DEVICE_SETTINGS,
+    REFRESH_INTERFACES,
+    REFRESH_PREFERRED_LEADER,
+    REFRESH_RX_CHANNELS,
+    REFRESH_TX_CHANNELS,
+    REFRESH_TX_FLOWS,
+    RX_PAGE_SIZE,
+    TX_PAGE_SIZE,
+    channel_pages,
+    merge_rx_channels,
+    merge_tx_channels,
+    written_channels,
+)
+from netaudio.daemon.response_cache import NOTIFICATION_INVALIDATIONS, DanteResponseCache, packet_command
+from netaudio.daemon.scheduler import PRIORITY_BACKGROUND, PRIORITY_NOTIFICATION, PRIORITY_USER, RefreshScheduler
+from netaudio.daemon.query import DeviceQuery
+from netaudio.daemon.wire import encode_devices
 ShureManager = None
 from netaudio.dante.services.heartbeat import DanteHeartbeatService
 from netaudio.daemon.protocol import (
+    CMD_DEVICE_BATCH,
     CMD_DEVICE_REQUEST,
     CMD_GET_DEVICES_JSON,
+    CMD_GET_DEVICES_SINCE,
     CMD_METER_SNAPSHOT,
     CMD_METER_START,
     CMD_METER_STATUS,
+    CMD_MULTIPLEX,
+    CMD_QUERY_DEVICES,
     CMD_SHUTDOWN,
     CMD_METER_STOP,
     CMD_REPORT_UNRESPONSIVE,
+    MULTIPLEX_ACK,
+    STATUS_EMPTY,
+    STATUS_ERROR,
+    STATUS_OK,
+    STATUS_TIMEOUT,
+    encode_batch_results,
+    encode_frame,
+    read_batch,
+    read_frame,
+    read_string,
 )
 from netaudio.dante.application import DanteApplication
 from netaudio.dante.const import (
@@ -38,25 +76,16 @@ from netaudio.dante.const import (
 )
 from netaudio.dante.device import DanteDevice
 from netaudio.dante.device_parser import DanteDeviceParser
-from netaudio.dante.events import DanteEvent, EventType
+from netaudio.dante.events import OVERFLOW_COALESCE, DanteEvent, EventType
+from netaudio.dante.registry import normalize_mac
 from netaudio.dante.services.notification import (
     NOTIFICATION_AES67_STATUS,
     NOTIFICATION_CLEAR_CONFIG_STATUS,
-    NOTIFICATION_CLOCKING_STATUS,
     NOTIFICATION_DEVICE_REBOOT,
-    NOTIFICATION_ENCODING_STATUS,
-    NOTIFICATION_INTERFACE_STATUS,
     NOTIFICATION_MANF_VERSIONS_STATUS,
-    NOTIFICATION_PROPERTY_CHANGE,
     NOTIFICATION_ROUTING_DEVICE_CHANGE,
     NOTIFICATION_ROUTING_READY,
-    NOTIFICATION_RX_CHANNEL_CHANGE,
-    NOTIFICATION_RX_FLOW_CHANGE,
-    NOTIFICATION_SAMPLE_RATE_STATUS,
     NOTIFICATION_SETTINGS_CHANGE,
-    NOTIFICATION_TX_CHANNEL_CHANGE,
-    NOTIFICATION_TX_FLOW_CHANGE,
-    NOTIFICATION_TX_LABEL_CHANGE,
     NOTIFICATION_VERSIONS_STATUS,
 )
 
@@ -72,6 +101,10 @@ except ImportError:
 
 logger = logging.getLogger("netaudio")
 
+MULTIPLEX_MAX_IN_FLIGHT = 32
+# Commands that may already have reached a device; a client that disconnects only loses their replies
+DEVICE_WRITE_COMMANDS = (CMD_DEVICE_REQUEST, CMD_DEVICE_BATCH)
+
 
 def _sd_notify(state):
     addr = os.environ.get("NOTIFY_SOCKET")
@@ -123,6 +156,11 @@ class NetaudioDaemon:
                 logger.info("Capture: enabled but no active session")
 
         self.application = DanteApplication(packet_store=self._packet_store, dissect=dissect)
+        self.response_cache = DanteResponseCache()
+        self._dirty_channels: dict[tuple[str, str], tuple[float, set[int]]] = {}
+        self.refresh_scheduler = RefreshScheduler()
+        self._service_changes: dict[tuple[str, str], asyncio.Task] = {}
+        self.application.arc.response_cache = self.response_cache
 
         if self._packet_store and self._session_id:
             for service in [self.application.arc, self.application.settings, self.application.cmc, self.application.notifications]:
@@ -133,6 +171,8 @@ class NetaudioDaemon:
         self.browser = None
         self.running = False
         self._redis = None
+        self.redis_publisher: RedisPublisher | None = None
+        self.change_log = DeviceChangeLog()
         self._populating: set[str] = set()
         self.metering: MeteringManager | None = None
         self.relay: RelayServer | None = None
@@ -162,6 +202,8 @@ class NetaudioDaemon:
 
             await self._redis.ping()
             await self._redis.config_set("notify-keyspace-events", "Kgh$")
+            self.redis_publisher = RedisPublisher(self._redis)
+            await self.redis_publisher.start()
             logger.info("Connected to Redis")
         except Exception as exception:
             logger.info(f"Redis not available, continuing without it: {exception}")
@@ -171,32 +213,29 @@ class NetaudioDaemon:
         if not self._redis:
             return
 
-        key = f"netaudio:daemon:device:{device.server_name}"
-        try:
-            await self._redis.hset(
-                key,
-                mapping={
-                    "server_name": device.server_name or "",
-                    "name": device.name or "",
-                    "ipv4": str(device.ipv4) if device.ipv4 else "",
-                    "model_id": device.model_id or "",
-                    "bluetooth_device": device.bluetooth_device or "",
-                    "online": "1" if device.online else "0",
-                    "last_seen": str(device.last_seen) if device.last_seen else "",
-                },
-            )
-        except Exception as exception:
-            logger.debug(f"Redis publish error for {device.server_name}: {exception}")
+        self.redis_publisher.hset(
+            f"netaudio:daemon:device:{device.server_name}",
+            {
+                "server_name": device.server_name or "",
+                "name": device.name or "",
+                "ipv4": str(device.ipv4) if device.ipv4 else "",
+                "model_id": device.model_id or "",
+                "bluetooth_device": device.bluetooth_device or "",
+                "online": "1" if device.online else "0",
+                "last_seen": str(device.last_seen) if device.last_seen else "",
+            },
+        )
+
+        for record in self.change_log.changes(device):
+            self.redis_publisher.xadd(CHANGE_STREAM_KEY, record, CHANGE_STREAM_MAXLEN)
 
     async def _delete_device_from_redis(self, server_name):
         if not self._redis:
             return
 
-        key = f"netaudio:daemon:device:{server_name}"
-        try:
-            await self._redis.delete(key)
-        except Exception as exception:
-            logger.debug(f"Redis delete error for {server_name}: {exception}")
+        self.redis_publisher.delete(f"netaudio:daemon:device:{server_name}")
+        for record in self.change_log.removed(server_name):
+            self.redis_publisher.xadd(CHANGE_STREAM_KEY, record, CHANGE_STREAM_MAXLEN)
 
     def _load_shure_correlations(self):
         try:
@@ -212,7 +251,7 @@ class NetaudioDaemon:
 
     @staticmethod
     def _normalize_mac(mac):
-        return mac.lower().replace(":", "").replace("-", "")[:12]
+        return normalize_mac(mac)
 
     def _find_dante_for_shure(self, shure_device):
         try:
@@ -227,12 +266,7 @@ class NetaudioDaemon:
         if not dante_mac:
             return None
 
-        normalized_target = self._normalize_mac(dante_mac)
-        for device in self.application.devices.values():
-            if device.mac_address and self._normalize_mac(device.mac_address) == normalized_target:
-                return device
-
-        return None
+        return self.application.devices.by_mac(dante_mac)
 
     def _dante_device_to_dict(self, device):
         result = {
@@ -286,28 +320,19 @@ class NetaudioDaemon:
         if dante:
             data["dante"] = self._dante_device_to_dict(dante)
 
-        try:
-            await self._redis.set(f"netaudio:shure:{mac}", json.dumps(data))
-        except Exception as exception:
-            logger.debug(f"Redis publish error for Shure {mac}: {exception}")
+        self.redis_publisher.set(f"netaudio:shure:{mac}", json.dumps(data))
 
     async def _publish_shure_meters_to_redis(self, mac, data):
         if not self._redis:
             return
 
-        try:
-            await self._redis.set(f"netaudio:shure:meters:{mac}", json.dumps(data))
-        except Exception as exception:
-            logger.debug(f"Redis meter publish error for Shure {mac}: {exception}")
+        self.redis_publisher.set_meter(f"netaudio:shure:meters:{mac}", json.dumps(data))
 
     async def _delete_shure_from_redis(self, mac):
         if not self._redis:
             return
 
-        try:
-            await self._redis.delete(f"netaudio:shure:{mac}", f"netaudio:shure:meters:{mac}")
-        except Exception as exception:
-            logger.debug(f"Redis delete error for Shure {mac}: {exception}")
+        self.redis_publisher.delete(f"netaudio:shure:{mac}", f"netaudio:shure:meters:{mac}")
 
     async def _on_shure_discovered(self, event: DanteEvent):
         logger.info(f"Shure device discovered: {event.device_name}")
@@ -324,32 +349,29 @@ class NetaudioDaemon:
         await self._publish_shure_meters_to_redis(event.device_name, event.data)
 
     def _register_event_listeners(self):
-        self.application.dispatcher.on(EventType.DEVICE_DISCOVERED, self._on_device_discovered)
-        self.application.dispatcher.on(EventType.DEVICE_UPDATED, self._on_device_updated)
-        self.application.dispatcher.on(EventType.DEVICE_REMOVED, self._on_device_removed)
-        self.application.dispatcher.on(EventType.SHURE_DEVICE_DISCOVERED, self._on_shure_discovered)
-        self.application.dispatcher.on(EventType.SHURE_DEVICE_UPDATED, self._on_shure_updated)
-        self.application.dispatcher.on(EventType.SHURE_DEVICE_REMOVED, self._on_shure_removed)
-        self.application.dispatcher.on(EventType.SHURE_METER_VALUES, self._on_shure_meters)
-
-        self.application.on_notification(NOTIFICATION_TX_CHANNEL_CHANGE, self._on_channel_name_changed)
-        self.application.on_notification(NOTIFICATION_RX_CHANNEL_CHANGE, self._on_channel_name_changed)
-        self.application.on_notification(NOTIFICATION_TX_LABEL_CHANGE, self._on_channel_name_changed)
-        self.application.on_notification(NOTIFICATION_SAMPLE_RATE_STATUS, self._on_sample_rate_changed)
-        self.application.on_notification(NOTIFICATION_ENCODING_STATUS, self._on_encoding_status)
-        self.application.on_notification(NOTIFICATION_INTERFACE_STATUS, self._on_interface_status)
+        dispatcher = self.application.dispatcher
+        dispatcher.on(EventType.DEVICE_DISCOVERED, self._on_device_discovered)
+        dispatcher.on(EventType.DEVICE_UPDATED, self._on_device_updated, overflow=OVERFLOW_COALESCE)
+        dispatcher.on(EventType.DEVICE_REMOVED, self._on_device_removed)
+        dispatcher.on(EventType.SHURE_DEVICE_DISCOVERED, self._on_shure_discovered)
+        dispatcher.on(EventType.SHURE_DEVICE_UPDATED, self._on_shure_updated, overflow=OVERFLOW_COALESCE)
+        dispatcher.on(EventType.SHURE_DEVICE_REMOVED, self._on_shure_removed)
+        dispatcher.on(EventType.SHURE_METER_VALUES, self._on_shure_meters, overflow=OVERFLOW_COALESCE)
+
+        # Registered first so the refetches below never read a stale cached response
+        for notification_id in NOTIFICATION_INVALIDATIONS:
+            self.application.on_notification(notification_id, self._invalidate_cached_responses)
+
+        for notification_id in NOTIFICATION_REFRESHES:
+            self.application.on_notification(notification_id, self._on_refresh_notification)
+
         self.application.on_notification(NOTIFICATION_DEVICE_REBOOT, self._on_device_reboot)
         self.application.on_notification(NOTIFICATION_AES67_STATUS, self._on_aes67_status)
-        self.application.on_notification(NOTIFICATION_TX_FLOW_CHANGE, self._on_flow_changed)
-        self.application.on_notification(NOTIFICATION_RX_FLOW_CHANGE, self._on_flow_changed)
-        self.application.on_notification(NOTIFICATION_PROPERTY_CHANGE, self._on_property_changed)
         self.application.on_notification(NOTIFICATION_SETTINGS_CHANGE, self._on_settings_change)
-        self.application.on_notification(NOTIFICATION_CLOCKING_STATUS, self._on_device_state_changed)
         self.application.on_notification(NOTIFICATION_VERSIONS_STATUS, self._on_device_state_changed)
         self.application.on_notification(NOTIFICATION_MANF_VERSIONS_STATUS, self._on_device_state_changed)
         self.application.on_notification(NOTIFICATION_CLEAR_CONFIG_STATUS, self._on_device_state_changed)
         self.application.on_notification(NOTIFICATION_ROUTING_READY, self._on_device_state_changed)
-        self.application.on_notification(NOTIFICATION_ROUTING_DEVICE_CHANGE, self._on_routing_changed)
 
     async def _republish_correlated_shure(self, dante_device):
         if not self.shure:
@@ -365,6 +387,7 @@ class NetaudioDaemon:
 
     async def _on_device_discovered(self, event: DanteEvent):
         device = self.devices.get(event.server_name)
+        self._drop_cached_responses(device)
         if device:
             device.update_last_seen()
             logger.info(f"Device discovered (event): {event.server_name}")
@@ -384,12 +407,24 @@ class NetaudioDaemon:
         if self.metering:
             self.metering.cleanup_device(event.server_name)
         device = self.devices.get(event.server_name)
+        self._drop_cached_responses(device)
         if device:
             await self._publish_device_to_redis(device)
             await self._refresh_affected_subscriptions(device)
         else:
             await self._delete_device_from_redis(event.server_name)
 
+    async def _invalidate_cached_responses(self, event: DanteEvent):
+        device = self.devices.get(event.server_name)
+        device_ip = str(device.ipv4) if device and device.ipv4 else event.data.get("source_ip")
+        if not device_ip:
+            return
+
+        notification_id = event.data.get("notification_id")
+        dropped = self.response_cache.invalidate_for_notification(device_ip, notification_id)
+        if dropped:
+            logger.debug(f"Dropped {dropped} cached responses for {event.server_name} (notification {notification_id})")
+
     async def _refresh_affected_subscriptions(self, offline_device):
         offline_name = offline_device.name
         if not offline_name:
@@ -408,36 +443,31 @@ class NetaudioDaemon:
                 continue
 
             logger.info(f"Re-fetching subscriptions for {server_name} (TX device {offline_name} went offline)")
-            try:
-                rx_channels, subscriptions = await self.application.arc.get_rx_channels(device, arc_port)
-                device.rx_channels = rx_channels
-                device.subscriptions = subscriptions
-                await self._publish_device_to_redis(device)
-            except Exception as e:
-                logger.debug(f"Error re-fetching subscriptions for {server_name}: {e}")
-
-    async def _on_channel_name_changed(self, event: DanteEvent):
-        server_name = event.server_name
-        device = self.devices.get(server_name)
-        if not device or not device.online:
-            return
+            self._schedule_device_job(
+                (server_name, "subscriptions"),
+                lambda device=device, arc_port=arc_port: self._refetch_subscriptions(device, arc_port),
+                PRIORITY_NOTIFICATION,
+            )
 
-        device.update_last_seen()
-        arc_port = self.application.get_arc_port(device)
-        if not arc_port:
-            return
+    def _schedule_device_job(self, key, job, priority: int, delay: float = 0.0) -> asyncio.Future:
+        # A device runs one job at a time, and a controls fetch covers the narrower ones queued for it
+        server_name, kind = key
+        return self.refresh_scheduler.schedule(
+            key, job, priority, delay=delay, group=server_name, full=kind == "controls"
+        )
 
-        logger.info(f"Re-fetching channels for {server_name} (channel name changed)")
+    async def _refetch_subscriptions(self, device, arc_port: int) -> None:
+        routing_commands = NOTIFICATION_INVALIDATIONS[NOTIFICATION_ROUTING_DEVICE_CHANGE]
+        self.response_cache.invalidate(str(device.ipv4), routing_commands)
         try:
-            device.tx_channels = await self.application.arc.get_tx_channels(device, arc_port)
             rx_channels, subscriptions = await self.application.arc.get_rx_channels(device, arc_port)
             device.rx_channels = rx_channels
             device.subscriptions = subscriptions
             await self._publish_device_to_redis(device)
-        except Exception as exception:
-            logger.debug(f"Error re-fetching channels for {server_name}: {exception}")
+        except Exception as e:
+            logger.debug(f"Error re-fetching subscriptions for {device.server_name}: {e}")
 
-    async def _on_flow_changed(self, event: DanteEvent):
+    async def _on_refresh_notification(self, event: DanteEvent):
         server_name = event.server_name
         device = self.devices.get(server_name)
         if not device or not device.online:
@@ -445,78 +475,122 @@ class NetaudioDaemon:
 
         device.update_last_seen()
         arc_port = self.application.get_arc_port(device)
-        if not arc_port:
-            return
-
-        logger.info(f"Re-fetching flow counts for {server_name} (flow changed)")
-        try:
-            counts = await self.application.arc.get_channel_count(str(device.ipv4), arc_port)
-            if "tx_flow_count" in counts:
-                device.tx_flow_count = counts["tx_flow_count"]
-            if "rx_flow_count" in counts:
-                device.rx_flow_count = counts["rx_flow_count"]
-            rx_channels, subscriptions = await self.application.arc.get_rx_channels(device, arc_port)
-            device.rx_channels = rx_channels
-            device.subscriptions = subscriptions
-            await self._publish_device_to_redis(device)
-        except Exception as exception:
-            logger.debug(f"Error re-fetching flows for {server_name}: {exception}")
-
-    async def _on_device_state_changed(self, event: DanteEvent):
-        server_name = event.server_name
-        device = self.devices.get(server_name)
-        if not device or not device.online:
-            return
-
-        device.update_last_seen()
-        await self._fetch_device_controls(server_name)
-
-    async def _on_routing_changed(self, event: DanteEvent):
-        server_name = event.server_name
-        device = self.devices.get(server_name)
-        if not device or not device.online:
+        if not arc_port or not device.ipv4:
             return
 
-        device.update_last_seen()
-        arc_port = self.application.get_arc_port(device)
-        if not arc_port:
-            return
+        refreshes = NOTIFICATION_REFRESHES[event.data.get("notification_id")]
+        self._schedule_device_job(
+            (server_name, refreshes),
+            lambda: self._refresh_notified_state(device, arc_port, refreshes),
+            PRIORITY_NOTIFICATION,
+        )
 
-        logger.info(f"Re-fetching subscriptions for {server_name} (routing changed)")
+    async def _refresh_notified_state(self, device, arc_port: int, refreshes) -> None:
+        logger.info(f"Refreshing {', '.join(refreshes)} for {device.server_name} (notification)")
         try:
-            rx_channels, subscriptions = await self.application.arc.get_rx_channels(device, arc_port)
-            device.rx_channels = rx_channels
-            device.subscriptions = subscriptions
+            await self._refresh_device_state(device, arc_port, refreshes)
             await self._publish_device_to_redis(device)
         except Exception as exception:
-            logger.debug(f"Error re-fetching subscriptions for {server_name}: {exception}")
+            logger.debug(f"Error refreshing {device.server_name}: {exception}")
 
-    async def _on_sample_rate_changed(self, event: DanteEvent):
-        server_name = event.server_name
-        device = self.devices.get(server_name)
-        if not device or not device.online:
-            return
+    async def _refresh_device_state(self, device, arc_port: int, refreshes) -> None:
+        arc = self.application.arc
+        device_ip = str(device.ipv4)
+        refreshes = set(refreshes)
+
+        if REFRESH_DEVICE_NAME in refreshes:
+            name = await arc.get_device_name(device_ip, arc_port)
+            if name and name != device.name:
+                logger.info(f"Device name changed for {device.server_name}: {device.name!r} -> {name!r}")
+                device.name = name
+
+        tx_pages = rx_pages = None
+        if REFRESH_CHANNEL_COUNT in refreshes:
+            counts = await arc.get_channel_count(device_ip, arc_port)
+            if counts:
+                # A changed count moves the end of the table, so that table is read in full
+                if counts[0] != device.tx_count:
+                    refreshes.add(REFRESH_TX_CHANNELS)
+                if counts[1] != device.rx_count:
+                    refreshes.add(REFRESH_RX_CHANNELS)
+                device.tx_count = device.tx_count_raw = counts[0]
+                device.rx_count = device.rx_count_raw = counts[1]
+                if counts[2] is not None:
+                    device.is_locked = counts[2]
+        else:
+            tx_pages = self._take_dirty_pages(device_ip, "tx", TX_PAGE_SIZE)
+            rx_pages = self._take_dirty_pages(device_ip, "rx", RX_PAGE_SIZE)
 
-        device.update_last_seen()
-        await self._refetch_device_controls(server_name)
+        if REFRESH_TX_CHANNELS in refreshes and device.tx_count:
+            tx_channels = await arc.get_tx_channels(device, arc_port, tx_pages)
+            if tx_pages is None:
+                device.tx_channels = tx_channels
+            else:
+                merge_tx_channels(device, tx_channels)
 
-    async def _on_encoding_status(self, event: DanteEvent):
-        server_name = event.server_name
-        device = self.devices.get(server_name)
-        if not device or not device.online:
+        if REFRESH_RX_CHANNELS in refreshes and device.rx_count:
+            rx_channels, subscriptions = await arc.get_rx_channels(device, arc_port, rx_pages)
+            if rx_pages is None:
+                device.rx_channels = rx_channels
+                device.subscriptions = subscriptions
+            else:
+                merge_rx_channels(device, rx_channels, subscriptions)
+
+        if REFRESH_TX_FLOWS in refreshes:
+            if device.flow_protocol_id is None:
+                device.flow_protocol_id = await arc.detect_flow_protocol(device_ip, arc_port)
+            if device.flow_protocol_id is not None:
+                flows = await arc.query_tx_flows(device_ip, arc_port, device.flow_protocol_id)
+                if flows is not None:
+                    device.tx_flow_count = len(flows)
+
+        if REFRESH_DEVICE_SETTINGS in refreshes:
+            settings = await arc.get_device_settings(device_ip, arc_port)
+            if settings:
+                if settings.sample_rate:
+                    device.sample_rate = settings.sample_rate
+                if settings.latency_us is not None:
+                    device.latency = settings.latency_us * 1000
+                if settings.min_latency_us is not None:
+                    device.min_latency = settings.min_latency_us / 1000.0
+                if settings.max_latency_us is not None:
+                    device.max_latency = settings.max_latency_us / 1000.0
+
+        if REFRESH_INTERFACES in refreshes:
+            await self._probe_device_interfaces(device, device.server_name, force=True)
+
+        if REFRESH_PREFERRED_LEADER in refreshes:
+            await self._probe_device_preferred_leader(device, device.server_name)
+
+    def _mark_written_channels(self, packet: bytes, device_ip: str) -> None:
+        written = written_channels(packet)
+        if not written:
             return
 
-        device.update_last_seen()
-        await self._refetch_device_controls(server_name)
+        channel_type, channels = written
+        key = (device_ip, channel_type)
+        marked_at, dirty = self._dirty_channels.get(key, (0.0, set()))
+        if time.monotonic() - marked_at > DIRTY_CHANNEL_TTL:
+            dirty = set()
+        self._dirty_channels[key] = (time.monotonic(), dirty | channels)
+
+    def _take_dirty_pages(self, device_ip: str, channel_type: str, page_size: int) -> list[int] | None:
+        marked_at, dirty = self._dirty_channels.pop((device_ip, channel_type), (0.0, set()))
+        # Without a recent write of our own the notification could be about any channel
+        if not dirty or time.monotonic() - marked_at > DIRTY_CHANNEL_TTL:
+            return None
+        return channel_pages(dirty, page_size)
 
-    async def _on_interface_status(self, event: DanteEvent):
+    async def _on_device_state_changed(self, event: DanteEvent):
         server_name = event.server_name
         device = self.devices.get(server_name)
         if not device or not device.online:
             return
 
         device.update_last_seen()
-        await self._refetch_device_controls(server_name)
+        self._schedule_device_job(
+            (server_name, "controls"), lambda: self._fetch_device_controls(server_name), PRIORITY_NOTIFICATION
+        )
 
     async def _on_device_reboot(self, event: DanteEvent):
         server_name = event.server_name
@@ -528,7 +602,9 @@ class NetaudioDaemon:
         logger.info(f"Device rebooted: {server_name}")
         if device.ipv4:
             await self.application.cmc.register_device(str(device.ipv4))
-        await self._refetch_device_controls(server_name)
+        self._schedule_device_job(
+            (server_name, "controls"), lambda: self._refetch_device_controls(server_name), PRIORITY_NOTIFICATION
+        )
 
     async def _on_aes67_status(self, event: DanteEvent):
         server_name = event.server_name
@@ -556,15 +632,6 @@ class NetaudioDaemon:
         except Exception as exception:
             logger.debug(f"Error re-fetching AES67 for {server_name}: {exception}")
 
-    async def _on_property_changed(self, event: DanteEvent):
-        server_name = event.server_name
-        device = self.devices.get(server_name)
-        if not device or not device.online:
-            return
-
-        device.update_last_seen()
-        await self._refetch_device_controls(server_name)
-
     async def _on_settings_change(self, event: DanteEvent):
         raw = event.data.get("raw")
         if not raw or len(raw) < 36:
@@ -692,6 +759,10 @@ class NetaudioDaemon:
         if self.heartbeat:
             await self.heartbeat.stop()
 
+        for task in list(self._service_changes.values()):
+            task.cancel()
+        await self.refresh_scheduler.stop()
+
         if self.shure:
             await self.shure.stop()
 
@@ -703,6 +774,7 @@ class NetaudioDaemon:
 
         if self._redis:
             try:
+                await self.redis_publisher.stop()
                 await self._redis.aclose()
             except Exception:
                 pass
@@ -742,7 +814,24 @@ class NetaudioDaemon:
 
         logger.debug(f"mDNS event: {state_change.name} - {service_type} - {name}")
 
-        asyncio.create_task(self.handle_service_change(zeroconf, service_type, name, state_change))
+        # Discovery, address changes and removals run outside the refresh pool, in order per service
+        key = (service_type, name)
+        previous = self._service_changes.get(key)
+        task = asyncio.create_task(self._apply_service_change(previous, zeroconf, service_type, name, state_change))
+        self._service_changes[key] = task
+        task.add_done_callback(lambda done: self._release_service_change(key, done))
+
+    async def _apply_service_change(self, previous, zeroconf, service_type, name, state_change):
+        if previous is not None:
+            await asyncio.gather(previous, return_exceptions=True)
+        # A newer change for the service is already waiting and supersedes this one
+        if self._service_changes.get((service_type, name)) is not asyncio.current_task():
+            return
+        await self.handle_service_change(zeroconf, service_type, name, state_change)
+
+    def _release_service_change(self, key, task: asyncio.Task) -> None:
+        if self._service_changes.get(key) is task:
+            del self._service_changes[key]
 
     async def handle_service_change(self, zeroconf, service_type, name, state_change):
         try:
@@ -828,10 +917,8 @@ class NetaudioDaemon:
 
             device.ipv4 = new_ip
 
-            if not device.services:
-                device.services = {}
-
-            device.services[name] = service_data
+            # Reassigned rather than mutated so the registry versions the change
+            device.services = {**(device.services or {}), name: service_data}
 
             if "id" in service_properties and service_type == SERVICE_CMC:
                 device.mac_address = service_properties["id"]
@@ -876,22 +963,41 @@ class NetaudioDaemon:
                         await self._publish_device_to_redis(device)
 
                 if not device.tx_channels and not device.rx_channels:
-                    asyncio.create_task(self._fetch_device_controls(server_name, delay=2))
+                    self._schedule_device_job(
+                        (server_name, "controls"),
+                        lambda: self._fetch_device_controls(server_name),
+                        PRIORITY_BACKGROUND,
+                        delay=2,
+                    )
 
         except Exception as exception:
             logger.debug(f"Service change error: {exception}")
 
+    def _drop_cached_responses(self, device) -> None:
+        if device is not None and device.ipv4:
+            self.response_cache.invalidate(str(device.ipv4))
+
     async def refresh_device(self, server_name: str) -> None:
         self._populating.discard(server_name)
-        await self._fetch_device_controls(server_name)
+        self._drop_cached_responses(self.devices.get(server_name))
+        await self._schedule_device_job(
+            (server_name, "controls"), lambda: self._fetch_device_controls(server_name), PRIORITY_USER
+        )
 
     async def refresh_all_devices(self) -> None:
-        tasks = []
+        futures = []
         for server_name, device in self.devices.items():
             if device.online:
                 self._populating.discard(server_name)
-                tasks.append(self._fetch_device_controls(server_name))
-        await asyncio.gather(*tasks, return_exceptions=True)
+                self._drop_cached_responses(device)
+                futures.append(
+                    self._schedule_device_job(
+                        (server_name, "controls"),
+                        lambda server_name=server_name: self._fetch_device_controls(server_name),
+                        PRIORITY_USER,
+                    )
+                )
+        await asyncio.gather(*futures, return_exceptions=True)
 
     async def _fetch_device_controls(self, server_name: str, delay: float = 0) -> None:
         if server_name in self._populating:
@@ -926,42 +1032,11 @@ class NetaudioDaemon:
                 device_ip = str(device.ipv4)
                 self.application.settings.request_bluetooth_status(device_ip)
 
-            try:
-                device_ip = str(device.ipv4)
-                for probe_attempt in range(3):
-                    result = await self.application.probe_aes67_state(device_ip)
-                    if result:
-                        aes67_current, aes67_configured = result
-                        if aes67_current is not None:
-                            device.aes67_current = aes67_current
-                        if aes67_configured is not None:
-                            device.aes67_configured = aes67_configured
-                        break
-                    if probe_attempt < 2:
-                        await asyncio.sleep(1)
-            except Exception as exception:
-                logger.debug(f"Error probing AES67 for {server_name}: {exception}")
-
-            try:
-                device_ip = str(device.ipv4)
-                for probe_attempt in range(3):
-                    preferred_leader = await self.application.probe_preferred_leader_state(device_ip)
-                    if preferred_leader is not None:
-                        device.preferred_leader = preferred_leader
-                        break
-                    if probe_attempt < 2:
-                        await asyncio.sleep(1)
-            except Exception as exception:
-                logger.debug(f"Error probing preferred leader for {server_name}: {exception}")
-
-            if device.interfaces is None:
-                try:
-                    device_ip = str(device.ipv4)
-                    interfaces = await self.application.probe_interface_status(device_ip)
-                    if interfaces is not None:
-                        device.interfaces = interfaces
-                except Exception as exception:
-                    logger.debug(f"Error probing interface status for {server_name}: {exception}")
+            await asyncio.gather(
+                self._probe_device_aes67(device, server_name),
+                self._probe_device_preferred_leader(device, server_name),
+                self._probe_device_interfaces(device, server_name),
+            )
 
             logger.info(f"Fetched controls for {server_name}")
             await self._publish_device_to_redis(device)
@@ -973,6 +1048,48 @@ class NetaudioDaemon:
         finally:
             self._populating.discard(server_name)
 
+    async def _probe_device_aes67(self, device, server_name: str) -> None:
+        try:
+            device_ip = str(device.ipv4)
+            for probe_attempt in range(3):
+                result = await self.application.probe_aes67_state(device_ip)
+                if result:
+                    aes67_current, aes67_configured = result
+                    if aes67_current is not None:
+                        device.aes67_current = aes67_current
+                    if aes67_configured is not None:
+                        device.aes67_configured = aes67_configured
+                    break
+                if probe_attempt < 2:
+                    await asyncio.sleep(1)
+        except Exception as exception:
+            logger.debug(f"Error probing AES67 for {server_name}: {exception}")
+
+    async def _probe_device_preferred_leader(self, device, server_name: str) -> None:
+        try:
+            device_ip = str(device.ipv4)
+            for probe_attempt in range(3):
+                preferred_leader = await self.application.probe_preferred_leader_state(device_ip)
+                if preferred_leader is not None:
+                    device.preferred_leader = preferred_leader
+                    break
+                if probe_attempt < 2:
+                    await asyncio.sleep(1)
+        except Exception as exception:
+            logger.debug(f"Error probing preferred leader for {server_name}: {exception}")
+
+    async def _probe_device_interfaces(self, device, server_name: str, force: bool = False) -> None:
+        if device.interfaces is not None and not force:
+            return
+
+        try:
+            device_ip = str(device.ipv4)
+            interfaces = await self.application.probe_interface_status(device_ip)
+            if interfaces is not None:
+                device.interfaces = interfaces
+        except Exception as exception:
+            logger.debug(f"Error probing interface status for {server_name}: {exception}")
+
     FIRE_AND_FORGET_SETTINGS_OPCODES = {
         0x0013, 0x0021, 0x0077, 0x0081, 0x0083, 0x1006, 0x1008,
     }
@@ -1030,255 +1147,298 @@ class NetaudioDaemon:
         elif device:
             logger.debug(f"Conmon dante_model still missing for {server_name} after retries")
 
-    async def handle_client(self, reader, writer):
-        try:
-            cmd = await reader.read(1)
+    def _shutdown(self) -> None:
+        logger.info("Shutdown command received")
+        self.running = False
 
-            if cmd == CMD_SHUTDOWN:
-                logger.info("Shutdown command received")
-                writer.close()
-                await writer.wait_closed()
-                self.running = False
+        if self.server:
+            self.server.close()
 
-                if self.server:
-                    self.server.close()
+    def _devices_json_payload(self) -> bytes:
+        devices_json = {}
+        for server_name, device in self.devices.items():
+            devices_json[server_name] = {
+                "server_name": device.server_name,
+                "name": device.name,
+                "ipv4": str(device.ipv4) if device.ipv4 else None,
+                "model_id": device.model_id,
+                "bluetooth_device": device.bluetooth_device,
+                "online": device.online,
+                "last_seen": device.last_seen,
+            }
+        return json.dumps(devices_json).encode()
 
-                return
+    def _devices_payload(self) -> bytes:
+        return encode_devices(self.devices)
 
-            if cmd == CMD_REPORT_UNRESPONSIVE:
-                length_data = await reader.readexactly(4)
-                length = struct.unpack(">I", length_data)[0]
-                server_name = (await reader.readexactly(length)).decode("utf-8")
+    def _devices_delta_payload(self, epoch: bytes, since: int) -> bytes:
+        registry = self.devices
+        changes = registry.changes_since(since) if epoch == registry.epoch else None
 
-                device = self.devices.get(server_name)
-                if device and device.online:
-                    logger.info(f"Device unresponsive, marking offline: {server_name}")
-                    self.application.mark_device_offline(server_name)
+        if changes is None:
+            changed, removed = list(registry), []
+        else:
+            changed, removed = changes
+
+        logger.debug(f"Device delta since {since}: {len(changed)} changed, {len(removed)} removed")
+        return encode_devices(
+            {server_name: registry[server_name] for server_name in changed},
+            epoch=registry.epoch.hex(),
+            version=registry.version,
+            full=changes is None,
+            removed=removed,
+            last_seen={server_name: device.last_seen for server_name, device in registry.items()},
+        )
 
-                writer.close()
-                await writer.wait_closed()
-                return
+    def _devices_query_payload(self, query: DeviceQuery) -> bytes:
+        devices = query.select(self.devices)
+        logger.debug(f"Device query matched {len(devices)} of {len(self.devices)} devices")
+        return encode_devices(devices, query.device_fields(), query=True)
 
-            if cmd == CMD_METER_SNAPSHOT:
-                length_data = await reader.readexactly(4)
-                length = struct.unpack(">I", length_data)[0]
-                server_name = (await reader.readexactly(length)).decode("utf-8")
+    async def _meter_snapshot_payload(self, server_name: str) -> bytes:
+        device = self.devices.get(server_name)
+        if not device or not device.ipv4:
+            result = json.dumps({"error": "device not found"})
+        elif not self.metering:
+            result = json.dumps({"error": "metering not available"})
+        else:
+            levels = await self.metering.snapshot(server_name, timeout=3.0)
+            if levels is None:
+                result = json.dumps({"error": "no metering data"})
+            else:
+                tx_names = {}
+                if device.tx_channels:
+                    for ch in device.tx_channels.values():
+                        tx_names[ch.number] = ch.friendly_name or ch.name
+                rx_names = {}
+                if device.rx_channels:
+                    for ch in device.rx_channels.values():
+                        rx_names[ch.number] = ch.friendly_name or ch.name
+
+                response = {
+                    "tx": {},
+                    "rx": {},
+                    "wall_time": levels.get("wall_time"),
+                    "source_ip": levels.get("source_ip"),
+                }
+                for ch_num, level in levels.get("tx", {}).items():
+                    response["tx"][ch_num] = {
+                        "name": tx_names.get(ch_num, ""),
+                        "level": level,
+                    }
+                for ch_num, level in levels.get("rx", {}).items():
+                    response["rx"][ch_num] = {
+                        "name": rx_names.get(ch_num, ""),
+                        "level": level,
+                    }
+                result = json.dumps(response)
 
-                device = self.devices.get(server_name)
-                if not device or not device.ipv4:
-                    result = json.dumps({"error": "device not found"})
-                elif not self.metering:
-                    result = json.dumps({"error": "metering not available"})
-                else:
-                    levels = await self.metering.snapshot(server_name, timeout=3.0)
-                    if levels is None:
-                        result = json.dumps({"error": "no metering data"})
-                    else:
-                        tx_names = {}
-                        if device.tx_channels:
-                            for ch in device.tx_channels.values():
-                                tx_names[ch.number] = ch.friendly_name or ch.name
-                        rx_names = {}
-                        if device.rx_channels:
-                            for ch in device.rx_channels.values():
-                                rx_names[ch.number] = ch.friendly_name or ch.name
-
-                        response = {
-                            "tx": {},
-                            "rx": {},
-                            "wall_time": levels.get("wall_time"),
-                            "source_ip": levels.get("source_ip"),
-                        }
-                        for ch_num, level in levels.get("tx", {}).items():
-                            response["tx"][ch_num] = {
-                                "name": tx_names.get(ch_num, ""),
-                                "level": level,
-                            }
-                        for ch_num, level in levels.get("rx", {}).items():
-                            response["rx"][ch_num] = {
-                                "name": rx_names.get(ch_num, ""),
-                                "level": level,
-                            }
-                        result = json.dumps(response)
-
-                data = result.encode()
-                length = struct.pack(">I", len(data))
-                writer.write(length + data)
-                await writer.drain()
-                writer.close()
-                await writer.wait_closed()
-                return
+        return result.encode()
 
-            if cmd == CMD_METER_START:
-                length_data = await reader.readexactly(4)
-                length = struct.unpack(">I", length_data)[0]
-                server_name = (await reader.readexactly(length)).decode("utf-8")
-                length_data = await reader.readexactly(4)
-                length = struct.unpack(">I", length_data)[0]
-                client_id = (await reader.readexactly(length)).decode("utf-8")
+    async def _proxy_device_request(self, packet: bytes, device_ip: str, port: int) -> bytes | None:
+        try:
+            if port == DEVICE_SETTINGS_PORT and self._is_identify_packet(packet):
+                self.application.settings.send(packet, device_ip, port)
+                response = None
+            elif port == DEVICE_SETTINGS_PORT and self._is_fire_and_forget_settings(packet):
+                self.application.settings.send(packet, device_ip, port)
+                response = None
+            elif port == DEVICE_SETTINGS_PORT:
+                response = await self.application.settings.request(
+                    packet,
+                    device_ip,
+                    port,
+                    logical_command_name="daemon_proxy",
+                )
+            elif port == DEVICE_CONTROL_PORT:
+                response = await self.application.cmc.request(
+                    packet,
+                    device_ip,
+                    port,
+                    logical_command_name="daemon_proxy",
+                )
+            else:
+                response = await self.application.arc.request(
+                    packet,
+                    device_ip,
+                    port,
+                    logical_command_name="daemon_proxy",
+                )
+        except Exception as exc:
+            logger.debug(f"Device request proxy error: {exc}")
+            response = None
+
+        # Anything other than a cacheable read may change what the device reports
+        if packet_command(packet) not in self.application.arc.coalescible_commands:
+            self.response_cache.invalidate(device_ip)
+            self._mark_written_channels(packet, device_ip)
+
+        return response
+
+    async def _proxy_device_batch(self, requests) -> list[tuple[int, bytes]]:
+        results: list[tuple[int, bytes]] = [(STATUS_EMPTY, b"")] * len(requests)
+        by_device: dict[str, list[int]] = {}
+        for index, (_, device_ip, _, _) in enumerate(requests):
+            by_device.setdefault(device_ip, []).append(index)
+
+        async def _run_device(indexes: list[int]) -> None:
+            # Entries for one device run in order; devices run concurrently
+            for index in indexes:
+                packet, device_ip, port, timeout = requests[index]
+                try:
+                    response = await asyncio.wait_for(self._proxy_device_request(packet, device_ip, port), timeout)
+                except asyncio.TimeoutError:
+                    results[index] = (STATUS_TIMEOUT, b"")
+                    continue
+                if response is not None:
+                    results[index] = (STATUS_OK, response)
 
-                device = self.devices.get(server_name)
-                if device and self.metering:
-                    self.metering.add_persistent(server_name, client_id)
+        await asyncio.gather(*[_run_device(indexes) for indexes in by_device.values()])
+        logger.debug(f"Device batch: {len(requests)} requests to {len(by_device)} devices")
+        return results
 
-                writer.close()
-                await writer.wait_closed()
-                return
+    async def _run_command(self, cmd: bytes, reader) -> tuple[int, bytes]:
+        if cmd == CMD_REPORT_UNRESPONSIVE:
+            server_name = await read_string(reader)
 
-            if cmd == CMD_METER_STOP:
-                length_data = await reader.readexactly(4)
-                length = struct.unpack(">I", length_data)[0]
-                server_name = (await reader.readexactly(length)).decode("utf-8")
-                length_data = await reader.readexactly(4)
-                length = struct.unpack(">I", length_data)[0]
-                client_id = (await reader.readexactly(length)).decode("utf-8")
+            device = self.devices.get(server_name)
+            if device and device.online:
+                logger.info(f"Device unresponsive, marking offline: {server_name}")
+                self.application.mark_device_offline(server_name)
 
-                device = self.devices.get(server_name)
-                if device and self.metering:
-                    self.metering.remove_persistent(server_name, client_id)
+            return STATUS_OK, b""
 
-                writer.close()
-                await writer.wait_closed()
-                return
+        if cmd == CMD_METER_SNAPSHOT:
+            server_name = await read_string(reader)
+            return STATUS_OK, await self._meter_snapshot_payload(server_name)
+
+        if cmd in (CMD_METER_START, CMD_METER_STOP):
+            server_name = await read_string(reader)
+            client_id = await read_string(reader)
 
-            if cmd == CMD_METER_STATUS:
-                if self.metering:
-                    status = self.metering.get_status()
+            device = self.devices.get(server_name)
+            if device and self.metering:
+                if cmd == CMD_METER_START:
+                    self.metering.add_persistent(server_name, client_id)
                 else:
-                    status = {}
+                    self.metering.remove_persistent(server_name, client_id)
 
-                data = json.dumps(status).encode()
-                length = struct.pack(">I", len(data))
-                writer.write(length + data)
-                await writer.drain()
-                writer.close()
-                await writer.wait_closed()
-                return
+            return STATUS_OK, b""
 
-            if cmd == CMD_DEVICE_REQUEST:
-                ip_len_data = await reader.readexactly(4)
-                ip_len = struct.unpack(">I", ip_len_data)[0]
-                device_ip = (await reader.readexactly(ip_len)).decode("utf-8")
+        if cmd == CMD_METER_STATUS:
+            status = self.metering.get_status() if self.metering else {}
+            return STATUS_OK, json.dumps(status).encode()
 
-                port_data = await reader.readexactly(2)
-                port = struct.unpack(">H", port_data)[0]
+        if cmd == CMD_DEVICE_REQUEST:
+            device_ip = await read_string(reader)
+            port = struct.unpack(">H", await reader.readexactly(2))[0]
+            packet_length = struct.unpack(">I", await reader.readexactly(4))[0]
+            packet = await reader.readexactly(packet_length)
 
-                pkt_len_data = await reader.readexactly(4)
-                pkt_len = struct.unpack(">I", pkt_len_data)[0]
-                packet = await reader.readexactly(pkt_len)
+            response = await self._proxy_device_request(packet, device_ip, port)
+            if response is None:
+                return STATUS_EMPTY, b""
+            return STATUS_OK, response
 
+        if cmd == CMD_DEVICE_BATCH:
+            requests = await read_batch(reader)
+            return STATUS_OK, encode_batch_results(await self._proxy_device_batch(requests))
+
+        if cmd == CMD_GET_DEVICES_JSON:
+            return STATUS_OK, self._devices_json_payload()
+
+        if cmd == CMD_GET_DEVICES_SINCE:
+            epoch = await reader.readexactly(8)
+            since = struct.unpack(">Q", await reader.readexactly(8))[0]
+            return STATUS_OK, self._devices_delta_payload(epoch, since)
+
+        if cmd == CMD_QUERY_DEVICES:
+            length = struct.unpack(">I", await reader.readexactly(4))[0]
+            query = DeviceQuery.from_payload(await reader.readexactly(length))
+            return STATUS_OK, self._devices_query_payload(query)
+
+        return STATUS_OK, self._devices_payload()
+
+    async def _serve_multiplexed(self, reader, writer) -> None:
+        writer.write(MULTIPLEX_ACK)
+        await writer.drain()
+
+        write_lock = asyncio.Lock()
+        slots = asyncio.Semaphore(MULTIPLEX_MAX_IN_FLIGHT)
+        tasks: dict[asyncio.Task, bytes] = {}
+
+        async def _respond(request_id: int, cmd: bytes, payload: bytes) -> None:
+            try:
+                await _run(request_id, cmd, payload)
+            finally:
+                slots.release()
+
+        async def _run(request_id: int, cmd: bytes, payload: bytes) -> None:
+            if cmd == CMD_SHUTDOWN:
+                status, body = STATUS_OK, b""
+            else:
+                payload_reader = asyncio.StreamReader()
+                payload_reader.feed_data(payload)
+                payload_reader.feed_eof()
                 try:
-                    if port == DEVICE_SETTINGS_PORT and self._is_identify_packet(packet):
-                        self.application.settings.send(packet, device_ip, port)
-                        response = None
-                    elif port == DEVICE_SETTINGS_PORT and self._is_fire_and_forget_settings(packet):
-                        self.application.settings.send(packet, device_ip, port)
-                        response = None
-                    elif port == DEVICE_SETTINGS_PORT:
-                        response = await self.application.settings.request(
-                            packet,
-                            device_ip,
-                            port,
-                            logical_command_name="daemon_proxy",
-                        )
-                    elif port == DEVICE_CONTROL_PORT:
-                        response = await self.application.cmc.request(
-                            packet,
-                            device_ip,
-                            port,
-                            logical_command_name="daemon_proxy",
-                        )
-                    else:
-                        response = await self.application.arc.request(
-                            packet,
-                            device_ip,
-                            port,
-                            logical_command_name="daemon_proxy",
-                        )
-                except Exception as exc:
-                    logger.debug(f"Device request proxy error: {exc}")
-                    response = None
+                    status, body = await self._run_command(cmd, payload_reader)
+                except Exception as exception:
+                    logger.debug(f"Multiplexed request {request_id} failed: {exception}")
+                    status, body = STATUS_ERROR, str(exception).encode()
 
-                if response is not None:
-                    writer.write(b"\x01")
-                    writer.write(struct.pack(">I", len(response)))
-                    writer.write(response)
-                else:
-                    writer.write(b"\x00")
-                    writer.write(struct.pack(">I", 0))
+            if writer.is_closing():
+                return
+            try:
+                async with write_lock:
+                    writer.write(encode_frame(request_id, status, body))
+                    await writer.drain()
+            except (BrokenPipeError, ConnectionResetError, ConnectionError):
+                return
+
+            if cmd == CMD_SHUTDOWN:
+                self._shutdown()
+
+        try:
+            while self.running:
+                # A full window stops reading, so the client's socket applies backpressure
+                await slots.acquire()
+                try:
+                    request_id, code, payload = await read_frame(reader)
+                except BaseException:
+                    slots.release()
+                    raise
+                cmd = bytes([code])
+                task = asyncio.create_task(_respond(request_id, cmd, payload))
+                tasks[task] = cmd
+                task.add_done_callback(lambda done: tasks.pop(done, None))
+        except asyncio.IncompleteReadError:
+            pass
+        finally:
+            for task, cmd in list(tasks.items()):
+                if cmd not in DEVICE_WRITE_COMMANDS:
+                    task.cancel()
+
+    async def handle_client(self, reader, writer):
+        try:
+            cmd = await reader.read(1)
 
-                await writer.drain()
+            if cmd == CMD_SHUTDOWN:
                 writer.close()
                 await writer.wait_closed()
+                self._shutdown()
                 return
 
-            if cmd == CMD_GET_DEVICES_JSON:
-                devices_json = {}
-                for server_name, device in self.devices.items():
-                    devices_json[server_name] = {
-                        "server_name": device.server_name,
-                        "name": device.name,
-                        "ipv4": str(device.ipv4) if device.ipv4 else None,
-                        "model_id": device.model_id,
-                        "bluetooth_device": device.bluetooth_device,
-                        "online": device.online,
-                        "last_seen": device.last_seen,
-                    }
-                data = json.dumps(devices_json).encode()
-            else:
-                devices_for_client = {}
-                for server_name, device in self.devices.items():
-                    client_device = DanteDevice(
-                        server_name=device.server_name,
-                        dump_payloads=False,
-                        debug=False,
-                    )
-                    client_device._ipv4 = device._ipv4
-                    client_device.name = device.name
-                    client_device.mac_address = device.mac_address
-                    client_device.model_id = device.model_id
-                    client_device.sample_rate = device.sample_rate
-                    client_device.latency = device.latency
-                    client_device.services = device.services
-                    client_device.manufacturer = device.manufacturer
-                    client_device.software = device.software
-                    client_device.bluetooth_device = device.bluetooth_device
-                    client_device.tx_channels = device.tx_channels
-                    client_device.rx_channels = device.rx_channels
-                    client_device.subscriptions = device.subscriptions
-                    client_device.tx_count = device.tx_count
-                    client_device.rx_count = device.rx_count
-                    client_device.tx_count_raw = device.tx_count_raw
-                    client_device.rx_count_raw = device.rx_count_raw
-                    client_device.aes67_configured = device.aes67_configured
-                    client_device.aes67_current = device.aes67_current
-                    client_device.preferred_leader = device.preferred_leader
-                    client_device.ptp_v1_role = device.ptp_v1_role
-                    client_device.error = str(device.error) if device.error else None
-                    client_device.dante_model = device.dante_model
-                    client_device.dante_model_id = device.dante_model_id
-                    client_device.online = device.online
-                    client_device.last_seen = device.last_seen
-                    client_device.tx_flow_count = device.tx_flow_count
-                    client_device.rx_flow_count = device.rx_flow_count
-                    client_device.num_networks = device.num_networks
-                    client_device.encoding = device.encoding
-                    client_device.bit_depth = device.bit_depth
-                    client_device.software_version = device.software_version
-                    client_device.firmware_version = device.firmware_version
-                    client_device.clock_role = device.clock_role
-                    client_device.clock_mac = device.clock_mac
-                    client_device.min_latency = device.min_latency
-                    client_device.max_latency = device.max_latency
-                    client_device.product_version = device.product_version
-                    client_device.board_name = device.board_name
-                    client_device.model = device.model
-                    client_device.is_locked = device.is_locked
-                    client_device.interfaces = device.interfaces
-                    client_device.interface_reboot_required = device.interface_reboot_required
-                    client_device.interface_pending_config = device.interface_pending_config
-                    devices_for_client[server_name] = client_device
-                data = pickle.dumps(devices_for_client)
+            if cmd == CMD_MULTIPLEX:
+                await self._serve_multiplexed(reader, writer)
+                return
+
+            status, data = await self._run_command(cmd, reader)
+
+            if cmd in (CMD_REPORT_UNRESPONSIVE, CMD_METER_START, CMD_METER_STOP):
+                return
+
+            if cmd == CMD_DEVICE_REQUEST:
+                writer.write(b"\x01" if status == STATUS_OK else b"\x00")
 
             length = struct.pack(">I", len(data))
             writer.write(length + data)
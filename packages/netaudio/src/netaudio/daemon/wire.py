@@ -0,0 +1,330 @@
+import ipaddress
+import json
+from collections.abc import Mapping
+
+from netaudio.dante.channel import DanteChannel
+from netaudio.dante.device import DanteDevice
+from netaudio.dante.subscription import DanteSubscription
+
+WIRE_MAGIC = b"NAW1"
+
+DEVICE_FIELDS = (
+    "server_name",
+    "name",
+    "ipv4",
+    "mac_address",
+    "model_id",
+    "model",
+    "manufacturer",
+    "software",
+    "bluetooth_device",
+    "dante_model",
+    "dante_model_id",
+    "sample_rate",
+    "latency",
+    "min_latency",
+    "max_latency",
+    "encoding",
+    "bit_depth",
+    "tx_count",
+    "rx_count",
+    "tx_count_raw",
+    "rx_count_raw",
+    "tx_flow_count",
+    "rx_flow_count",
+    "num_networks",
+    "aes67_configured",
+    "aes67_current",
+    "preferred_leader",
+    "ptp_v1_role",
+    "clock_role",
+    "clock_mac",
+    "software_version",
+    "firmware_version",
+    "product_version",
+    "board_name",
+    "is_locked",
+    "online",
+    "last_seen",
+    "error",
+    "services",
+    "interfaces",
+    "interface_reboot_required",
+    "interface_pending_config",
+    "tx_channels",
+    "rx_channels",
+    "subscriptions",
+)
+
+CHANNEL_FIELDS = (
+    "number",
+    "name",
+    "friendly_name",
+    "channel_type",
+    "status_code",
+    "status_text",
+    "volume",
+    "muted",
+    "bit_depth",
+    "samples_per_frame",
+    "flags",
+)
+
+SUBSCRIPTION_FIELDS = (
+    "rx_channel_name",
+    "rx_device_name",
+    "tx_channel_name",
+    "tx_device_name",
+    "status_code",
+    "rx_channel_status_code",
+    "status_message",
+    "error",
+)
+
+SCHEMA = {
+    "device": DEVICE_FIELDS,
+    "channel": CHANNEL_FIELDS,
+    "subscription": SUBSCRIPTION_FIELDS,
+}
+
+NESTED_DEVICE_FIELDS = frozenset({"tx_channels", "rx_channels", "subscriptions"})
+
+
+class WireFormatError(Exception):
+    pass
+
+
+def channel_record(channel) -> list:
+    return [getattr(channel, field, None) for field in CHANNEL_FIELDS]
+
+
+def subscription_record(subscription) -> list:
+    record = [getattr(subscription, field, None) for field in SUBSCRIPTION_FIELDS]
+    if record[-1] is not None:
+        record[-1] = str(record[-1])
+    return record
+
+
+def device_record(device, device_fields=DEVICE_FIELDS) -> list:
+    record = []
+    for field in device_fields:
+        if field == "tx_channels" or field == "rx_channels":
+            channels = getattr(device, field) or {}
+            record.append([channel_record(channel) for channel in channels.values()])
+        elif field == "subscriptions":
+            record.append([subscription_record(subscription) for subscription in device.subscriptions or []])
+        elif field == "ipv4" or field == "error":
+            value = getattr(device, field)
+            record.append(str(value) if value else None)
+        else:
+            record.append(getattr(device, field, None))
+    return record
+
+
+def encode_records(records: list[list], device_fields=DEVICE_FIELDS, **fields) -> bytes:
+    schema = SCHEMA if device_fields is DEVICE_FIELDS else {**SCHEMA, "device": device_fields}
+    document = {"schema": schema, "devices": records, **fields}
+    return WIRE_MAGIC + json.dumps(document, separators=(",", ":"), default=str).encode()
+
+
+def encode_devices(devices, device_fields=DEVICE_FIELDS, **fields) -> bytes:
+    records = [device_record(device, device_fields) for device in devices.values()]
+    return encode_records(records, device_fields, **fields)
+
+
+def decode_document(payload: bytes) -> dict:
+    if payload[: len(WIRE_MAGIC)] != WIRE_MAGIC:
+        raise WireFormatError("Not a netaudio wire payload")
+
+    document = json.loads(payload[len(WIRE_MAGIC):])
+    if "schema" not in document or "devices" not in document:
+        raise WireFormatError("Wire payload is missing its schema")
+    return document
+
+
+def decode_devices(payload: bytes) -> dict[str, "DeviceView"]:
+    document = decode_document(payload)
+    return device_views(document["schema"], document["devices"])
+
+
+def device_views(schema: dict, records) -> dict[str, "DeviceView"]:
+    layout = _Layout.for_schema(schema)
+    server_name_index = layout.device["server_name"]
+    return {record[server_name_index]: DeviceView(record, layout) for record in records}
+
+
+class DeviceMap(Mapping):
+    # Devices are only materialised from their views when a command looks them up
+    def __init__(self, views: dict[str, "DeviceView"]):
+        self._views = views
+        self._devices: dict[str, DanteDevice] = {}
+
+    def __getitem__(self, server_name: str) -> DanteDevice:
+        device = self._devices.get(server_name)
+        if device is None:
+            device = self._devices[server_name] = self._views[server_name].to_device()
+        return device
+
+    def __iter__(self):
+        return iter(self._views)
+
+    def __len__(self) -> int:
+        return len(self._views)
+
+    def views(self) -> dict[str, "DeviceView"]:
+        return self._views
+
+    def subset(self, server_names) -> "DeviceMap":
+        subset = DeviceMap({server_name: self._views[server_name] for server_name in server_names})
+        subset._devices = {name: device for name, device in self._devices.items() if name in subset._views}
+        return subset
+
+
+def _private_attributes(cls, index: dict) -> tuple[tuple[str, int], ...]:
+    # Channels and subscriptions keep each property in a "_<name>" slot, which
+    # lets materialisation fill __dict__ directly instead of going through setters.
+    return tuple(
+        (f"_{field}", position) for field, position in index.items() if isinstance(getattr(cls, field, None), property)
+    )
+
+
+_CHANNEL_DEFAULTS = DanteChannel().__dict__
+_SUBSCRIPTION_DEFAULTS = DanteSubscription().__dict__
+
+
+def _build(cls, defaults: dict, attributes, record):
+    instance = cls.__new__(cls)
+    state = instance.__dict__
+    state.update(defaults)
+    for attribute, position in attributes:
+        state[attribute] = record[position]
+    return instance
+
+
+class _Layout:
+    __slots__ = ("device", "channel", "subscription", "channel_attributes", "subscription_attributes")
+
+    _cache: dict = {}
+
+    def __init__(self, schema: dict):
+        self.device = {field: index for index, field in enumerate(schema["device"])}
+        self.channel = {field: index for index, field in enumerate(schema["channel"])}
+        self.subscription = {field: index for index, field in enumerate(schema["subscription"])}
+        self.channel_attributes = _private_attributes(DanteChannel, self.channel)
+        self.subscription_attributes = _private_attributes(DanteSubscription, self.subscription)
+
+    @classmethod
+    def for_schema(cls, schema: dict) -> "_Layout":
+        key = (tuple(schema["device"]), tuple(schema["channel"]), tuple(schema["subscription"]))
+        layout = cls._cache.get(key)
+        if layout is None:
+            layout = cls._cache[key] = cls(schema)
+        return layout
+
+
+class _RecordView:
+    __slots__ = ("_record", "_index")
+
+    def __init__(self, record, index):
+        object.__setattr__(self, "_record", record)
+        object.__setattr__(self, "_index", index)
+
+    def __getattr__(self, attribute):
+        index = self._index.get(attribute)
+        if index is None:
+            if attribute.startswith("_"):
+                raise AttributeError(attribute)
+            return None
+        return self._record[index]
+
+    def __setattr__(self, attribute, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, attribute):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+
+class ChannelView(_RecordView):
+    __slots__ = ()
+
+    def __str__(self):
+        name = self.friendly_name or self.name
+        if self.volume and self.volume != 254:
+            return f"{self.number}:{name} [{self.volume}]"
+        return f"{self.number}:{name}"
+
+    def to_channel(self) -> DanteChannel:
+        return _build(DanteChannel, _CHANNEL_DEFAULTS, _private_attributes(DanteChannel, self._index), self._record)
+
+
+class SubscriptionView(_RecordView):
+    __slots__ = ()
+
+    def to_subscription(self) -> DanteSubscription:
+        attributes = _private_attributes(DanteSubscription, self._index)
+        return _build(DanteSubscription, _SUBSCRIPTION_DEFAULTS, attributes, self._record)
+
+
+class DeviceView(_RecordView):
+    __slots__ = ("_layout",)
+
+    def __init__(self, record, layout: _Layout):
+        super().__init__(record, layout.device)
+        object.__setattr__(self, "_layout", layout)
+
+    @property
+    def record(self) -> list:
+        return self._record
+
+    @property
+    def ipv4(self):
+        value = self.__getattr__("ipv4")
+        return ipaddress.ip_address(value) if value else None
+
+    @property
+    def tx_channels(self) -> dict:
+        return self._channels("tx_channels")
+
+    @property
+    def rx_channels(self) -> dict:
+        return self._channels("rx_channels")
+
+    @property
+    def subscriptions(self) -> list:
+        records = self.__getattr__("subscriptions") or []
+        return [SubscriptionView(record, self._layout.subscription) for record in records]
+
+    def _channels(self, field: str) -> dict:
+        records = self.__getattr__(field) or []
+        index = self._layout.channel
+        number_index = index["number"]
+        return {record[number_index]: ChannelView(record, index) for record in records}
+
+    def __str__(self):
+        return f"{self.name}"
+
+    def to_device(self) -> DanteDevice:
+        device = DanteDevice(server_name=self.server_name)
+
+        for field in self._index:
+            if field in NESTED_DEVICE_FIELDS or not hasattr(device, field):
+                continue
+            setattr(device, field, getattr(self, field))
+
+        layout = self._layout
+        number_index = layout.channel["number"]
+
+        for field in ("tx_channels", "rx_channels"):
+            channels = {}
+            for record in self.__getattr__(field) or []:
+                channel = _build(DanteChannel, _CHANNEL_DEFAULTS, layout.channel_attributes, record)
+                channel._device = device
+                channels[record[number_index]] = channel
+            setattr(device, field, channels)
+
+        device.subscriptions = [
+            _build(DanteSubscription, _SUBSCRIPTION_DEFAULTS, layout.subscription_attributes, record)
+            for record in self.__getattr__("subscriptions") or []
+        ]
+
+        return device
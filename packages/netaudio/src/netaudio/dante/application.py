@@ -12,6 +12,7 @@ from netaudio.dante.const import (
     SERVICES,
 )
 from netaudio.dante.events import DanteEvent, DanteEventDispatcher, EventType
+from netaudio.dante.registry import DanteDeviceRegistry
 from netaudio.dante.services.arc import DanteARCService
 from netaudio.dante.services.cmc import DanteCMCService
 from netaudio.dante.services.notification import (
@@ -22,10 +23,17 @@ from netaudio.dante.services.settings import DanteSettingsService
 
 logger = logging.getLogger("netaudio")
 
+DISCOVERY_QUIET_INTERVAL = 0.5
+DISCOVERY_POLL_INTERVAL = 0.05
+
+CONMON_ROUND_TIMEOUTS = (1.0, 2.0, 2.0)
+CONMON_SEND_BATCH_SIZE = 32
+CONMON_SEND_BATCH_INTERVAL = 0.01
+
 
 class DanteApplication:
     def __init__(self, packet_store=None, dissect=False):
-        self.devices: dict = {}
+        self.devices = DanteDeviceRegistry()
         self.dispatcher = DanteEventDispatcher()
         self.arc = DanteARCService(packet_store=packet_store, dissect=dissect)
         self.settings = DanteSettingsService(packet_store=packet_store, dissect=dissect)
@@ -42,6 +50,9 @@ class DanteApplication:
         self._browser = None
         self._started = False
         self._notification_handlers: dict[int, list] = {}
+        self.dispatcher.coalesce(
+            EventType.DEVICE_UPDATED, app_settings.device_update_window, self.devices.take_changed_fields
+        )
 
     def on_notification(self, notification_id: int, callback) -> None:
         if notification_id not in self._notification_handlers:
@@ -110,11 +121,73 @@ class DanteApplication:
 
         return self.devices
 
-    async def discover_and_populate(self, timeout: float = 5.0) -> dict:
+    def _merge_discovered_services(self, hostname: str, device_services: dict):
+        if hostname in self.devices:
+            device = self.devices[hostname]
+        else:
+            from netaudio.dante.device import DanteDevice
+
+            device = DanteDevice(server_name=hostname, app=self)
+            self.register_device(hostname, device)
+
+        device.services = device_services
+        for service_name, service in device_services.items():
+            if not device.ipv4:
+                device.ipv4 = service["ipv4"]
+            service_properties = service.get("properties", {})
+            if "id" in service_properties and service["type"] == SERVICE_CMC:
+                device.mac_address = service_properties["id"]
+            if "model" in service_properties:
+                device.model_id = service_properties["model"]
+            if "mf" in service_properties:
+                device.manufacturer_mdns = service_properties["mf"]
+                if not device.manufacturer:
+                    device.manufacturer = service_properties["mf"]
+            if "server_vers" in service_properties and service["type"] == SERVICE_CMC:
+                device.software_version = service_properties["server_vers"]
+            if "router_vers" in service_properties:
+                device.firmware_version = service_properties["router_vers"]
+            if "rate" in service_properties:
+                device.sample_rate = int(service_properties["rate"])
+            if "latency_ns" in service_properties:
+                device.latency = int(service_properties["latency_ns"])
+
+        return device
+
+    async def _register_and_populate(self, device, arc_port: int) -> None:
+        await self.cmc.register_device(str(device.ipv4))
+        await self._populate_device_controls(device, arc_port)
+
+    async def discover_and_populate(
+        self,
+        timeout: float = 5.0,
+        expect: int | None = None,
+        quiet_interval: float = DISCOVERY_QUIET_INTERVAL,
+    ) -> dict:
+        async for _ in self.discover_stream(timeout=timeout, expect=expect, quiet_interval=quiet_interval):
+            pass
+
+        await self._query_settings_fields()
+
+        await self._query_conmon_all()
+
+        await self._probe_interface_status()
+        await self._probe_preferred_leader_all()
+        await self._probe_aes67_all()
+
+        return self.devices
+
+    async def discover_stream(
+        self,
+        timeout: float = 5.0,
+        expect: int | None = None,
+        quiet_interval: float = DISCOVERY_QUIET_INTERVAL,
+    ):
         from netaudio.dante.browser import DanteBrowser
 
-        discovery_time = min(timeout * 0.4, 2.0)
-        populate_time = timeout - discovery_time
+        started = time.monotonic()
+        deadline = started + timeout
+        empty_wait = min(timeout * 0.4, 2.0)
 
         browser = DanteBrowser(mdns_timeout=0, app=self)
         self._browser = browser
@@ -126,83 +199,88 @@ class DanteApplication:
             handlers=[browser.async_on_service_state_change],
         )
 
-        await asyncio.sleep(discovery_time)
-
-        if browser.services:
-            await asyncio.gather(*browser.services, return_exceptions=True)
-
         device_hosts = {}
-        for service_future in browser.services:
-            service = service_future.result() if not service_future.cancelled() else None
-            if not service or "server_name" not in service:
-                continue
-            server_name = service["server_name"]
-            if server_name not in device_hosts:
-                device_hosts[server_name] = {}
-            device_hosts[server_name][service["name"]] = service
-
-        for hostname, device_services in device_hosts.items():
-            if hostname in self.devices:
-                device = self.devices[hostname]
-            else:
-                from netaudio.dante.device import DanteDevice
-
-                device = DanteDevice(server_name=hostname, app=self)
-                self.register_device(hostname, device)
-
-            device.services = device_services
-            for service_name, service in device_services.items():
-                if not device.ipv4:
-                    device.ipv4 = service["ipv4"]
-                service_properties = service.get("properties", {})
-                if "id" in service_properties and service["type"] == SERVICE_CMC:
-                    device.mac_address = service_properties["id"]
-                if "model" in service_properties:
-                    device.model_id = service_properties["model"]
-                if "mf" in service_properties:
-                    device.manufacturer_mdns = service_properties["mf"]
-                    if not device.manufacturer:
-                        device.manufacturer = service_properties["mf"]
-                if "server_vers" in service_properties and service["type"] == SERVICE_CMC:
-                    device.software_version = service_properties["server_vers"]
-                if "router_vers" in service_properties:
-                    device.firmware_version = service_properties["router_vers"]
-                if "rate" in service_properties:
-                    device.sample_rate = int(service_properties["rate"])
-                if "latency_ns" in service_properties:
-                    device.latency = int(service_properties["latency_ns"])
-
-        await browser.aio_browser.async_cancel()
-        await browser.aio_zc.async_close()
-        self._browser = None
-
-        device_ips = [str(device.ipv4) for device in self.devices.values() if device.ipv4]
-        if device_ips:
-            await self.cmc.register_all(device_ips)
+        processed = set()
+        populate_tasks: dict[str, asyncio.Task] = {}
+        yielded = set()
+        seen_services = 0
+        last_change = started
 
-        populate_tasks = []
-        for device in self.devices.values():
-            arc_port = self.get_arc_port(device)
-            if arc_port:
-                populate_tasks.append(self._populate_device_controls(device, arc_port))
+        try:
+            while True:
+                now = time.monotonic()
+
+                if len(browser.services) != seen_services:
+                    seen_services = len(browser.services)
+                    last_change = now
+
+                for index, service_future in enumerate(browser.services):
+                    if index in processed or not service_future.done():
+                        continue
+                    processed.add(index)
+
+                    if service_future.cancelled() or service_future.exception() is not None:
+                        continue
+                    service = service_future.result()
+                    if not service or "server_name" not in service:
+                        continue
+
+                    server_name = service["server_name"]
+                    device_hosts.setdefault(server_name, {})[service["name"]] = service
+                    device = self._merge_discovered_services(server_name, device_hosts[server_name])
+
+                    arc_port = self.get_arc_port(device)
+                    if arc_port and device.ipv4 and server_name not in populate_tasks:
+                        populate_tasks[server_name] = asyncio.create_task(
+                            self._register_and_populate(device, arc_port)
+                        )
+
+                for server_name, task in list(populate_tasks.items()):
+                    if server_name not in yielded and task.done():
+                        yielded.add(server_name)
+                        if not task.cancelled():
+                            yield self.devices.get(server_name)
+
+                ready = len(yielded)
+
+                if expect is not None and ready >= expect:
+                    logger.debug(f"Discovery: {ready} devices ready, expected {expect}")
+                    break
 
-        if populate_tasks:
-            done, pending = await asyncio.wait(
-                [asyncio.create_task(task) for task in populate_tasks],
-                timeout=populate_time,
-            )
-            for task in pending:
-                task.cancel()
+                if now >= deadline:
+                    logger.debug(f"Discovery: timeout reached with {ready}/{len(populate_tasks)} devices ready")
+                    break
 
-        await self._query_settings_fields()
+                if seen_services == 0:
+                    if now - started >= empty_wait:
+                        break
+                elif (
+                    now - last_change >= quiet_interval
+                    and len(processed) == seen_services
+                    and ready == len(populate_tasks)
+                ):
+                    logger.debug(
+                        f"Discovery: quiescent after {now - started:.2f}s with {len(self.devices)} devices"
+                    )
+                    break
 
-        await self._query_conmon_all()
+                await asyncio.sleep(DISCOVERY_POLL_INTERVAL)
+        finally:
+            for task in [*browser.services, *populate_tasks.values()]:
+                if not task.done():
+                    task.cancel()
 
-        await self._probe_interface_status()
-        await self._probe_preferred_leader_all()
-        await self._probe_aes67_all()
+            await browser.aio_browser.async_cancel()
+            await browser.aio_zc.async_close()
+            self._browser = None
 
-        return self.devices
+        unregistered_ips = [
+            str(device.ipv4)
+            for server_name, device in self.devices.items()
+            if device.ipv4 and server_name not in populate_tasks
+        ]
+        if unregistered_ips:
+            await self.cmc.register_all(unregistered_ips)
 
     def register_device(self, server_name: str, device) -> None:
         existing = self.devices.get(server_name)
@@ -447,89 +525,69 @@ class DanteApplication:
 
     async def _query_conmon_all(self, timeout: float = 10.0) -> None:
         deadline = time.monotonic() + timeout
+        pending = [device for device in self.devices.values() if device.ipv4 and device.mac_address]
 
-        incomplete_devices = []
-
-        for device in self.devices.values():
-            remaining = deadline - time.monotonic()
-
-            if remaining <= 0:
-                logger.debug("Conmon query timeout reached, skipping remaining devices")
-                break
-
-            device_ip = str(device.ipv4) if device.ipv4 else None
-
-            if not device_ip or not device.mac_address:
-                continue
-
-            waiter = self.notifications.register_conmon_waiter(device_ip)
-
-            try:
-                self._send_conmon_query_for_device(device, "make_model")
-                self._send_conmon_query_for_device(device, "dante_model")
-
-                per_device_timeout = min(remaining, 1.0)
-
-                try:
-                    await asyncio.wait_for(waiter.wait(), timeout=per_device_timeout)
-                    logger.debug(f"Conmon responses received for {device.server_name}")
-                except asyncio.TimeoutError:
-                    logger.debug(f"Conmon query partial/timeout for {device.server_name}")
-                    received = self.notifications._conmon_received.get(device_ip, set())
-
-                    if len(received) < 2:
-                        incomplete_devices.append(device)
-            finally:
-                self.notifications.unregister_conmon_waiter(device_ip)
-
-        for retry in range(2):
-            if not incomplete_devices:
+        for attempt, round_timeout in enumerate(CONMON_ROUND_TIMEOUTS):
+            if not pending:
                 break
 
-            remaining = deadline - time.monotonic()
-
-            if remaining <= 0:
+            if deadline - time.monotonic() <= 0:
+                logger.debug(f"Conmon query timeout reached, {len(pending)} devices incomplete")
                 break
 
-            still_incomplete = []
+            waiters = {}
+            stragglers = []
 
-            for device in incomplete_devices:
-                remaining = deadline - time.monotonic()
-
-                if remaining <= 0:
-                    break
+            try:
+                for device in pending:
+                    device_ip = str(device.ipv4)
 
-                device_ip = str(device.ipv4)
-                needs_make_model = not device.dante_model
-                needs_dante_model = not device.dante_model_id
-                expected_count = int(needs_make_model) + int(needs_dante_model)
+                    if attempt == 0:
+                        needs_make_model = needs_dante_model = True
+                    else:
+                        needs_make_model = not device.dante_model
+                        needs_dante_model = not device.dante_model_id
 
-                if expected_count == 0:
-                    continue
+                    expected_count = int(needs_make_model) + int(needs_dante_model)
+                    if expected_count == 0:
+                        continue
 
-                waiter = self.notifications.register_conmon_waiter(device_ip, expected_count=expected_count)
+                    waiters[device_ip] = (
+                        device,
+                        self.notifications.register_conmon_waiter(device_ip, expected_count=expected_count),
+                    )
 
-                try:
                     if needs_make_model:
                         self._send_conmon_query_for_device(device, "make_model")
 
                     if needs_dante_model:
                         self._send_conmon_query_for_device(device, "dante_model")
 
-                    per_device_timeout = min(remaining, 2.0)
+                    if len(waiters) % CONMON_SEND_BATCH_SIZE == 0:
+                        await asyncio.sleep(CONMON_SEND_BATCH_INTERVAL)
 
-                    try:
-                        await asyncio.wait_for(waiter.wait(), timeout=per_device_timeout)
-                        logger.debug(f"Conmon retry {retry + 1} succeeded for {device.server_name}")
-                    except asyncio.TimeoutError:
-                        logger.debug(f"Conmon retry {retry + 1} timeout for {device.server_name}")
+                if not waiters:
+                    break
+
+                logger.debug(f"Conmon round {attempt + 1}: queried {len(waiters)} devices")
 
-                        if not device.dante_model_id:
-                            still_incomplete.append(device)
-                finally:
+                remaining = deadline - time.monotonic()
+                await asyncio.wait_for(
+                    asyncio.gather(*(waiter.wait() for _, waiter in waiters.values()), return_exceptions=True),
+                    timeout=max(0, min(remaining, round_timeout)),
+                )
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                for device_ip, (device, waiter) in waiters.items():
+                    if not waiter.is_set() and not (device.dante_model and device.dante_model_id):
+                        stragglers.append(device)
                     self.notifications.unregister_conmon_waiter(device_ip)
 
-            incomplete_devices = still_incomplete
+            logger.debug(
+                f"Conmon round {attempt + 1}: {len(waiters) - len(stragglers)}/{len(waiters)} devices complete"
+            )
+            pending = stragglers
 
     def _send_conmon_query_for_device(self, device, opcode: str = "make_model") -> None:
         from netaudio.dante.device_commands import DanteDeviceCommands
@@ -583,7 +641,4 @@ class DanteApplication:
             self.notifications.unregister_aes67_waiter(device_ip)
 
     def _device_by_ip(self, ip_str: str):
-        for device in self.devices.values():
-            if device.ipv4 and str(device.ipv4) == ip_str:
-                return device
-        return None
+        return self.devices.by_ip(ip_str)
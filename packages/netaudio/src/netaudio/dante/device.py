@@ -28,6 +28,45 @@ from netaudio.dante.subscription import DanteSubscription
 logger = logging.getLogger("netaudio")
 sockets = {}
 
+# Attributes that do not describe device state, or that change too often to be
+# worth versioning (last_seen is shipped separately in state deltas).
+UNVERSIONED_ATTRIBUTES = frozenset({
+    "_app",
+    "_registry",
+    "commands",
+    "ipv4",
+    "last_seen",
+    "mac_address",
+    "name",
+    "network",
+    "operations",
+    "parser",
+    "protocol",
+    "sockets",
+})
+
+# Channels and subscriptions have identity equality and are rebuilt on every fetch, so
+# these collections are compared by value. Code that edits a channel or subscription in
+# place must touch the registry itself; reassigning the same objects is not a change.
+VALUE_COMPARED_ATTRIBUTES = frozenset({"rx_channels", "subscriptions", "tx_channels"})
+
+_MISSING = object()
+
+
+def _value_state(value):
+    if isinstance(value, dict):
+        return {key: _value_state(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_value_state(item) for item in value]
+    if isinstance(value, (DanteChannel, DanteSubscription)):
+        # References to devices and channels are covered by the names stored alongside them
+        return {
+            field: item
+            for field, item in vars(value).items()
+            if not isinstance(item, (DanteChannel, DanteDevice, DanteSubscription))
+        }
+    return value
+
 
 class DanteDevice:
     def __init__(self, server_name="", dump_payloads=False, debug=False, app=None):
@@ -36,14 +75,15 @@ class DanteDevice:
         self.dante_model = ""
         self.dante_model_id = ""
         self.error = None
+        self._registry = None
         self._ipv4 = None
         self.latency = None
-        self.mac_address = None
+        self._mac_address = None
         self.manufacturer = ""
         self.manufacturer_mdns = ""
         self.model = ""
         self.model_id = ""
-        self.name = ""
+        self._name = ""
         self.rx_channels = {}
         self.rx_count = None
         self.rx_count_raw = None
@@ -90,13 +130,50 @@ class DanteDevice:
             self.network = DanteDeviceNetwork(self)
         self.operations = DanteDeviceOperations(self)
 
+    def __setattr__(self, attribute, value):
+        registry = self.__dict__.get("_registry")
+        if registry is not None and attribute not in UNVERSIONED_ATTRIBUTES:
+            old_value = self.__dict__.get(attribute, _MISSING)
+            if attribute in VALUE_COMPARED_ATTRIBUTES:
+                changed = old_value is _MISSING or _value_state(old_value) != _value_state(value)
+            else:
+                changed = old_value is not value and old_value != value
+            if changed:
+                registry._touch(self, attribute)
+        object.__setattr__(self, attribute, value)
+
     @property
     def ipv4(self):
         return self._ipv4
 
     @ipv4.setter
     def ipv4(self, value):
+        old_value = self._ipv4
         self._ipv4 = ipaddress.ip_address(value) if value is not None else None
+        if self._registry is not None and old_value != self._ipv4:
+            self._registry._reindex(self, "ipv4", old_value, self._ipv4)
+
+    @property
+    def mac_address(self):
+        return self._mac_address
+
+    @mac_address.setter
+    def mac_address(self, value):
+        old_value = self._mac_address
+        self._mac_address = value
+        if self._registry is not None and old_value != value:
+            self._registry._reindex(self, "mac_address", old_value, value)
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        old_value = self._name
+        self._name = value
+        if self._registry is not None and old_value != value:
+            self._registry._reindex(self, "name", old_value, value)
 
     def update_last_seen(self):
         self.last_seen = time.time()
@@ -187,6 +264,7 @@ class DanteDevice:
         await self.network.get_controls()
 
     def parse_volume(self, bytes_volume):
+        before = {attribute: _value_state(getattr(self, attribute)) for attribute in ("tx_channels", "rx_channels")}
         self.parser.parse_volume(
             bytes_volume,
             self.rx_count_raw,
@@ -194,6 +272,11 @@ class DanteDevice:
             self.tx_channels,
             self.rx_channels,
         )
+        # Volumes are written into the existing channels, which __setattr__ never sees
+        if self._registry is not None:
+            for attribute, state in before.items():
+                if _value_state(getattr(self, attribute)) != state:
+                    self._registry._touch(self, attribute)
 
     async def get_volume(self, ipv4, mac, port):
         await self.network.get_volume(ipv4, mac, port)
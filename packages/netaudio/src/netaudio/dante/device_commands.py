@@ -41,8 +41,8 @@ class DanteDeviceCommands:
     def command_channel_count(self, transaction_id=0):
         return (self._build_control_packet(OPCODE_CHANNEL_COUNT, transaction_id=transaction_id), SERVICE_ARC)
 
-    def command_device_settings(self):
-        return (self._build_control_packet(OPCODE_DEVICE_SETTINGS), SERVICE_ARC)
+    def command_device_settings(self, transaction_id=0):
+        return (self._build_control_packet(OPCODE_DEVICE_SETTINGS, transaction_id=transaction_id), SERVICE_ARC)
 
     def command_set_name(self, name):
         name_bytes = name.encode('utf-8')
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import struct
 import traceback
@@ -12,6 +13,30 @@ BODY_HEADER_SIZE = 2
 RX_RECORD_SIZE = 20
 TX_RECORD_SIZE = 8
 TX_FRIENDLY_RECORD_SIZE = 6
+PAGE_FETCH_CONCURRENCY = 4
+
+RX_RECORD_STRUCT = struct.Struct(">8H")
+TX_RECORD_STRUCT = struct.Struct(">4H")
+TX_FRIENDLY_RECORD_STRUCT = struct.Struct(">3H")
+SAMPLE_RATE_STRUCT = struct.Struct(">I")
+
+
+class _PageStrings(dict):
+    def __init__(self, data: bytes, table_start: int):
+        super().__init__()
+        self._data = data
+        offset = table_start
+        for chunk in data[table_start:].split(b"\x00"):
+            if chunk:
+                try:
+                    self[offset] = chunk.decode("utf-8")
+                except UnicodeDecodeError:
+                    pass
+            offset += len(chunk) + 1
+
+    def __missing__(self, offset: int) -> str:
+        value = self[offset] = DanteDeviceParser._get_string_at_offset(self._data, offset)
+        return value
 
 
 class DanteDeviceParser:
@@ -108,85 +133,183 @@ class DanteDeviceParser:
             print(e)
             traceback.print_exc()
 
-    async def get_rx_channels(self, device, dante_command_func):
+    @staticmethod
+    async def _fetch_pages(page_args, dante_command_func, logical_command_name, concurrency=PAGE_FETCH_CONCURRENCY):
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(args):
+            async with semaphore:
+                return await dante_command_func(*args, logical_command_name=logical_command_name)
+
+        return await asyncio.gather(*[fetch(args) for args in page_args])
+
+    @staticmethod
+    def _get_sample_rate_at_offset(view: memoryview, offset: int) -> int | None:
+        if offset + 4 > len(view):
+            return None
+        return SAMPLE_RATE_STRUCT.unpack_from(view, offset)[0]
+
+    def _parse_rx_page(self, device, page, response, rx_channels, subscriptions):
+        view = memoryview(response)
+        channels_this_page = 0
+        records_start = RESPONSE_HEADER_SIZE + BODY_HEADER_SIZE
+        record_count = min(device.rx_count or 0, 16)
+        strings = _PageStrings(response, records_start + record_count * RX_RECORD_SIZE)
+        first_number = page * 16 + 1
+
+        for index in range(0, record_count):
+            record_offset = records_start + (index * RX_RECORD_SIZE)
+            if record_offset + RX_RECORD_SIZE > len(view):
+                break
+
+            (
+                channel_number,
+                _,
+                sample_rate_offset,
+                tx_channel_offset,
+                tx_device_offset,
+                rx_channel_offset,
+                rx_channel_status_code,
+                subscription_status_code,
+            ) = RX_RECORD_STRUCT.unpack_from(view, record_offset)
+
+            if channel_number == 0 or channel_number != first_number + index:
+                break
+
+            rx_channel_name = strings[rx_channel_offset]
+            tx_device_name = strings[tx_device_offset]
+
+            if tx_channel_offset != 0:
+                tx_channel_name = strings[tx_channel_offset]
+            else:
+                tx_channel_name = rx_channel_name
+
+            if index == 0 and tx_device_offset != 0:
+                sample_rate = self._get_sample_rate_at_offset(view, sample_rate_offset)
+                if sample_rate:
+                    device.sample_rate = sample_rate
+
+            subscription = DanteSubscription()
+            rx_channel = DanteChannel()
+
+            rx_channel.channel_type = "rx"
+            rx_channel.device = device
+            rx_channel.name = rx_channel_name
+            rx_channel.number = channel_number
+            rx_channel.status_code = rx_channel_status_code
+
+            rx_channels[channel_number] = rx_channel
+
+            subscription.rx_channel_name = rx_channel_name
+            subscription.rx_device_name = device.name
+            subscription.tx_channel_name = tx_channel_name
+            subscription.status_code = subscription_status_code
+            subscription.rx_channel_status_code = rx_channel_status_code
+
+            if tx_device_name == ".":
+                subscription.tx_device_name = device.name
+            else:
+                subscription.tx_device_name = tx_device_name
+
+            subscriptions.append(subscription)
+            channels_this_page += 1
+
+        return channels_this_page
+
+    def _parse_tx_friendly_page(self, device, response, tx_friendly_channel_names):
+        view = memoryview(response)
+        channels_this_page = 0
+        records_start = RESPONSE_HEADER_SIZE + BODY_HEADER_SIZE
+        record_count = min(device.tx_count or 0, 32)
+        strings = _PageStrings(response, records_start + record_count * TX_FRIENDLY_RECORD_SIZE)
+
+        for index in range(0, record_count):
+            record_offset = records_start + (index * TX_FRIENDLY_RECORD_SIZE)
+            if record_offset + TX_FRIENDLY_RECORD_SIZE > len(view):
+                break
+
+            _, channel_number, name_offset = TX_FRIENDLY_RECORD_STRUCT.unpack_from(view, record_offset)
+            if channel_number == 0:
+                break
+
+            friendly_name = strings[name_offset]
+
+            if friendly_name:
+                tx_friendly_channel_names[channel_number] = friendly_name
+
+            channels_this_page += 1
+
+        return channels_this_page
+
+    def _parse_tx_raw_page(self, device, page, response, tx_friendly_channel_names, tx_channels):
+        view = memoryview(response)
+        records_start = RESPONSE_HEADER_SIZE + BODY_HEADER_SIZE
+        record_count = min(device.tx_count or 0, 32)
+        strings = _PageStrings(response, records_start + record_count * TX_RECORD_SIZE)
+        first_number = page * 32 + 1
+
+        first_channel_group = None
+        channels_this_page = 0
+
+        for index in range(0, record_count):
+            record_offset = records_start + (index * TX_RECORD_SIZE)
+            if record_offset + TX_RECORD_SIZE > len(view):
+                break
+
+            channel_number, _, channel_group, name_offset = TX_RECORD_STRUCT.unpack_from(view, record_offset)
+            if channel_number == 0 or channel_number != first_number + index:
+                break
+
+            if index == 0:
+                first_channel_group = channel_group
+                sample_rate = self._get_sample_rate_at_offset(view, channel_group)
+                if sample_rate:
+                    device.sample_rate = sample_rate
+
+            if channel_group != first_channel_group:
+                break
+
+            tx_channel_name = strings[name_offset]
+
+            tx_channel = DanteChannel()
+            tx_channel.channel_type = "tx"
+            tx_channel.number = channel_number
+            tx_channel.device = device
+            tx_channel.name = tx_channel_name
+
+            if channel_number in tx_friendly_channel_names:
+                tx_channel.friendly_name = tx_friendly_channel_names[
+                    channel_number
+                ]
+
+            tx_channels[channel_number] = tx_channel
+            channels_this_page += 1
+
+        return channels_this_page
+
+    async def get_rx_channels(self, device, dante_command_func, pages=None):
         rx_channels = {}
         subscriptions = []
 
         try:
-            for page in range(0, max(int((device.rx_count or 0) / 16), 1)):
-                receivers_args = device.commands.command_receivers(page)
-                response = await dante_command_func(
-                    *receivers_args, logical_command_name="get_receivers"
-                )
+            # A partial refresh reads only the given pages, so a short page does not end the table
+            partial = pages is not None
+            if pages is None:
+                pages = range(0, max(int((device.rx_count or 0) / 16), 1))
+            responses = await self._fetch_pages(
+                [device.commands.command_receivers(page) for page in pages],
+                dante_command_func,
+                "get_receivers",
+            )
+
+            for page, response in zip(pages, responses):
                 if response is None:
                     logger.debug(
                         f"No response received for get_receivers command on page {page}"
                     )
                     continue
 
-                body = response[RESPONSE_HEADER_SIZE:]
-                channels_this_page = 0
-
-                for index in range(0, min(device.rx_count or 0, 16)):
-                    record_offset = BODY_HEADER_SIZE + (index * RX_RECORD_SIZE)
-                    if record_offset + RX_RECORD_SIZE > len(body):
-                        break
-
-                    record = body[record_offset : record_offset + RX_RECORD_SIZE]
-
-                    channel_number = struct.unpack(">H", record[0:2])[0]
-                    expected = (page * 16) + index + 1
-                    if channel_number == 0 or channel_number != expected:
-                        break
-
-                    tx_channel_offset = struct.unpack(">H", record[6:8])[0]
-                    tx_device_offset = struct.unpack(">H", record[8:10])[0]
-                    rx_channel_offset = struct.unpack(">H", record[10:12])[0]
-                    rx_channel_status_code = struct.unpack(">H", record[12:14])[0]
-                    subscription_status_code = struct.unpack(">H", record[14:16])[0]
-
-                    rx_channel_name = self._get_string_at_offset(response, rx_channel_offset)
-                    tx_device_name = self._get_string_at_offset(response, tx_device_offset)
-
-                    if tx_channel_offset != 0:
-                        tx_channel_name = self._get_string_at_offset(response, tx_channel_offset)
-                    else:
-                        tx_channel_name = rx_channel_name
-
-                    if index == 0 and tx_device_offset != 0:
-                        sample_rate_offset = struct.unpack(">H", record[4:6])[0]
-                        if sample_rate_offset + 4 <= len(response):
-                            sample_rate_bytes = response[sample_rate_offset:sample_rate_offset + 4]
-                            sample_rate = struct.unpack(">I", sample_rate_bytes)[0]
-                            if sample_rate:
-                                device.sample_rate = sample_rate
-
-                    subscription = DanteSubscription()
-                    rx_channel = DanteChannel()
-
-                    rx_channel.channel_type = "rx"
-                    rx_channel.device = device
-                    rx_channel.name = rx_channel_name
-                    rx_channel.number = channel_number
-                    rx_channel.status_code = rx_channel_status_code
-
-                    rx_channels[channel_number] = rx_channel
-
-                    subscription.rx_channel_name = rx_channel_name
-                    subscription.rx_device_name = device.name
-                    subscription.tx_channel_name = tx_channel_name
-                    subscription.status_code = subscription_status_code
-                    subscription.rx_channel_status_code = rx_channel_status_code
-
-                    if tx_device_name == ".":
-                        subscription.tx_device_name = device.name
-                    else:
-                        subscription.tx_device_name = tx_device_name
-
-                    subscriptions.append(subscription)
-                    channels_this_page += 1
-
-                if channels_this_page < 16:
+                if self._parse_rx_page(device, page, response, rx_channels, subscriptions) < 16 and not partial:
                     break
         except Exception as e:
             device.error = e
@@ -195,113 +318,47 @@ class DanteDeviceParser:
 
         return rx_channels, subscriptions
 
-    async def get_tx_channels(self, device, dante_command_func):
+    async def get_tx_channels(self, device, dante_command_func, pages=None):
         tx_channels = {}
         tx_friendly_channel_names = {}
 
         try:
-            num_pages = max(1, ((device.tx_count or 0) + 31) // 32)
-            for page in range(0, num_pages):
-                transmitters_friendly_args = device.commands.command_transmitters(
-                    page, friendly_names=True
-                )
-                response_friendly = await dante_command_func(
-                    *transmitters_friendly_args,
-                    logical_command_name="get_transmitters_friendly",
-                )
+            partial = pages is not None
+            if pages is None:
+                pages = range(0, max(1, ((device.tx_count or 0) + 31) // 32))
+            friendly_responses, raw_responses = await asyncio.gather(
+                self._fetch_pages(
+                    [device.commands.command_transmitters(page, friendly_names=True) for page in pages],
+                    dante_command_func,
+                    "get_transmitters_friendly",
+                ),
+                self._fetch_pages(
+                    [device.commands.command_transmitters(page, friendly_names=False) for page in pages],
+                    dante_command_func,
+                    "get_transmitters_raw",
+                ),
+            )
+
+            for page, response_friendly in zip(pages, friendly_responses):
                 if response_friendly is None:
                     logger.debug(
                         f"No response received for get_transmitters_friendly command on page {page}"
                     )
                     continue
 
-                body = response_friendly[RESPONSE_HEADER_SIZE:]
-                channels_this_page = 0
-
-                for index in range(0, min(device.tx_count or 0, 32)):
-                    record_offset = BODY_HEADER_SIZE + (index * TX_FRIENDLY_RECORD_SIZE)
-                    if record_offset + TX_FRIENDLY_RECORD_SIZE > len(body):
+                if self._parse_tx_friendly_page(device, response_friendly, tx_friendly_channel_names) < 32:
+                    if not partial:
                         break
 
-                    record = body[record_offset : record_offset + TX_FRIENDLY_RECORD_SIZE]
-
-                    channel_number = struct.unpack(">H", record[2:4])[0]
-                    if channel_number == 0:
-                        break
-
-                    name_offset = struct.unpack(">H", record[4:6])[0]
-                    friendly_name = self._get_string_at_offset(response_friendly, name_offset)
-
-                    if friendly_name:
-                        tx_friendly_channel_names[channel_number] = friendly_name
-
-                    channels_this_page += 1
-
-                if channels_this_page < 32:
-                    break
-
-            for page in range(0, num_pages):
-                transmitters_raw_args = device.commands.command_transmitters(
-                    page, friendly_names=False
-                )
-                response_raw = await dante_command_func(
-                    *transmitters_raw_args, logical_command_name="get_transmitters_raw"
-                )
+            for page, response_raw in zip(pages, raw_responses):
                 if response_raw is None:
                     logger.debug(
                         f"No response received for get_transmitters_raw command on page {page}"
                     )
                     continue
 
-                body = response_raw[RESPONSE_HEADER_SIZE:]
-
-                first_channel_group = None
-                channels_this_page = 0
-
-                for index in range(0, min(device.tx_count or 0, 32)):
-                    record_offset = BODY_HEADER_SIZE + (index * TX_RECORD_SIZE)
-                    if record_offset + TX_RECORD_SIZE > len(body):
-                        break
-
-                    record = body[record_offset : record_offset + TX_RECORD_SIZE]
-
-                    channel_number = struct.unpack(">H", record[0:2])[0]
-                    expected = (page * 32) + index + 1
-                    if channel_number == 0 or channel_number != expected:
-                        break
-
-                    channel_group = struct.unpack(">H", record[4:6])[0]
-                    name_offset = struct.unpack(">H", record[6:8])[0]
-
-                    if index == 0:
-                        first_channel_group = channel_group
-                        sample_rate_offset = channel_group
-                        if sample_rate_offset + 4 <= len(response_raw):
-                            sample_rate_bytes = response_raw[sample_rate_offset:sample_rate_offset + 4]
-                            sample_rate = struct.unpack(">I", sample_rate_bytes)[0]
-                            if sample_rate:
-                                device.sample_rate = sample_rate
-
-                    if channel_group != first_channel_group:
-                        break
-
-                    tx_channel_name = self._get_string_at_offset(response_raw, name_offset)
-
-                    tx_channel = DanteChannel()
-                    tx_channel.channel_type = "tx"
-                    tx_channel.number = channel_number
-                    tx_channel.device = device
-                    tx_channel.name = tx_channel_name
-
-                    if channel_number in tx_friendly_channel_names:
-                        tx_channel.friendly_name = tx_friendly_channel_names[
-                            channel_number
-                        ]
-
-                    tx_channels[channel_number] = tx_channel
-                    channels_this_page += 1
-
-                if channels_this_page < 32:
+                parsed = self._parse_tx_raw_page(device, page, response_raw, tx_friendly_channel_names, tx_channels)
+                if parsed < 32 and not partial:
                     break
 
         except Exception as e:
@@ -1,5 +1,8 @@
 import asyncio
+import itertools
 import logging
+import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from enum import Enum, auto
 from typing import Any, Callable, Coroutine
@@ -29,19 +32,186 @@ class DanteEvent:
 
 EventCallback = Callable[[DanteEvent], Coroutine[Any, Any, None]]
 
+OVERFLOW_BLOCK = "block"
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_COALESCE = "coalesce"
+
+OVERFLOW_POLICIES = (OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, OVERFLOW_COALESCE)
+
+LISTENER_QUEUE_SIZE = 256
+
+_emission_order = itertools.count()
+
+
+def event_key(event: DanteEvent) -> tuple:
+    return event.type, event.server_name, event.device_name, event.data.get("mac")
+
+
+class _Listener:
+    def __init__(self, event_type: EventType, callback: EventCallback, max_queue: int, overflow: str):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+
+        self.event_type = event_type
+        self.callback = callback
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.name = getattr(callback, "__qualname__", repr(callback))
+        # Keyed entries keep their queue position when a newer event replaces them
+        self._pending: OrderedDict = OrderedDict()
+        self._sequence = 0
+        self._ready: asyncio.Event | None = None
+        self._space = asyncio.Event()
+        self._space.set()
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.max_depth = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+
+    @property
+    def head_order(self) -> int:
+        return next(iter(self._pending.values()))[1]
+
+    def _key(self, event: DanteEvent):
+        if self.overflow == OVERFLOW_COALESCE:
+            return event_key(event)
+        self._sequence += 1
+        return self._sequence
+
+    def offer(self, event: DanteEvent) -> bool:
+        key = self._key(event)
+
+        if key in self._pending:
+            queued_at = self._pending[key][0]
+            # A replacement is ordered as of its own emission against the owner's other listeners
+            self._pending[key] = (queued_at, next(_emission_order), event)
+            self.coalesced += 1
+            self._ready.set()
+            return True
+
+        if len(self._pending) >= self.max_queue:
+            if self.overflow == OVERFLOW_BLOCK:
+                self._space.clear()
+                return False
+            self._pending.popitem(last=False)
+            self.dropped += 1
+
+        self._pending[key] = (time.monotonic(), next(_emission_order), event)
+        self.max_depth = max(self.max_depth, len(self._pending))
+        self._ready.set()
+        return True
+
+    async def put(self, event: DanteEvent) -> None:
+        while not self.offer(event):
+            await self._space.wait()
+
+    async def deliver_next(self) -> None:
+        _, (queued_at, _, event) = self._pending.popitem(last=False)
+        self._space.set()
+
+        self.last_lag = time.monotonic() - queued_at
+        self.max_lag = max(self.max_lag, self.last_lag)
+
+        try:
+            await self.callback(event)
+            self.delivered += 1
+        except Exception:
+            self.errors += 1
+            logger.exception(
+                f"Error in event callback for {event.type.name}"
+            )
+
+    def stats(self) -> dict:
+        return {
+            "event": self.event_type.name,
+            "listener": self.name,
+            "overflow": self.overflow,
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "last_lag": self.last_lag,
+            "max_lag": self.max_lag,
+        }
+
+
+class _Consumer:
+    def __init__(self):
+        self.listeners: list[_Listener] = []
+        self.ready = asyncio.Event()
+        self.task: asyncio.Task | None = None
+
+    def add(self, listener: _Listener) -> None:
+        listener._ready = self.ready
+        self.listeners.append(listener)
+
+    async def run(self) -> None:
+        while True:
+            pending = [listener for listener in self.listeners if listener.depth]
+            if not pending:
+                self.ready.clear()
+                await self.ready.wait()
+                continue
+
+            await min(pending, key=lambda listener: listener.head_order).deliver_next()
+
+
+def _owner(callback: EventCallback):
+    # Bound methods of one object share a consumer so it sees its events in order across types
+    return getattr(callback, "__self__", callback)
+
+
+class _Released:
+    __slots__ = ("event",)
+
+    def __init__(self, event: DanteEvent):
+        self.event = event
+
 
 class DanteEventDispatcher:
     def __init__(self):
         self._listeners: dict[EventType, list[EventCallback]] = {}
+        self._listener_queues: dict[tuple[EventType, EventCallback], _Listener] = {}
+        self._consumers: dict[Any, _Consumer] = {}
+        self._coalesce_windows: dict[EventType, tuple[float, Callable[[str], set[str]] | None]] = {}
+        self._held: dict[tuple[EventType, str], DanteEvent] = {}
+        self._held_timers: dict[tuple[EventType, str], asyncio.TimerHandle] = {}
         self._queue: asyncio.Queue[DanteEvent] = asyncio.Queue()
         self._dispatch_task: asyncio.Task | None = None
         self._running = False
 
-    def on(self, event_type: EventType, callback: EventCallback) -> None:
+    def on(
+        self,
+        event_type: EventType,
+        callback: EventCallback,
+        max_queue: int = LISTENER_QUEUE_SIZE,
+        overflow: str = OVERFLOW_BLOCK,
+    ) -> None:
+        listener = _Listener(event_type, callback, max_queue, overflow)
+
         if event_type not in self._listeners:
             self._listeners[event_type] = []
         self._listeners[event_type].append(callback)
 
+        self._listener_queues[(event_type, callback)] = listener
+
+        consumer = self._consumers.get(_owner(callback))
+        if consumer is None:
+            consumer = _Consumer()
+            self._consumers[_owner(callback)] = consumer
+        consumer.add(listener)
+        if self._running and consumer.task is None:
+            consumer.task = asyncio.create_task(consumer.run())
+
     def off(self, event_type: EventType, callback: EventCallback) -> None:
         if event_type in self._listeners:
             try:
@@ -49,6 +219,28 @@ class DanteEventDispatcher:
             except ValueError:
                 pass
 
+        listener = self._listener_queues.pop((event_type, callback), None)
+        consumer = self._consumers.get(_owner(callback))
+        if listener is None or consumer is None:
+            return
+
+        consumer.listeners.remove(listener)
+        if not consumer.listeners:
+            del self._consumers[_owner(callback)]
+            if consumer.task is not None:
+                consumer.task.cancel()
+
+    def coalesce(
+        self,
+        event_type: EventType,
+        window: float,
+        changed_fields: Callable[[str], set[str]] | None = None,
+    ) -> None:
+        if window > 0:
+            self._coalesce_windows[event_type] = (window, changed_fields)
+        else:
+            self._coalesce_windows.pop(event_type, None)
+
     def emit_nowait(self, event: DanteEvent) -> None:
         self._queue.put_nowait(event)
 
@@ -59,32 +251,91 @@ class DanteEventDispatcher:
         if self._running:
             return
         self._running = True
+        for consumer in self._consumers.values():
+            consumer.task = asyncio.create_task(consumer.run())
         self._dispatch_task = asyncio.create_task(self._dispatch_loop())
 
     async def stop(self) -> None:
         self._running = False
+        tasks = [consumer.task for consumer in self._consumers.values() if consumer.task is not None]
         if self._dispatch_task is not None:
-            self._dispatch_task.cancel()
-            try:
-                await self._dispatch_task
-            except asyncio.CancelledError:
-                pass
-            self._dispatch_task = None
+            tasks.append(self._dispatch_task)
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        for timer in self._held_timers.values():
+            timer.cancel()
+        self._held_timers.clear()
+        self._held.clear()
+
+        for consumer in self._consumers.values():
+            consumer.task = None
+        self._dispatch_task = None
+
+    def stats(self) -> list[dict]:
+        return [listener.stats() for listener in self._listener_queues.values()]
+
+    def _hold(self, event: DanteEvent, window: float) -> None:
+        key = (event.type, event.server_name)
+        held = self._held.get(key)
+
+        if held is None:
+            held = DanteEvent(type=event.type, device_name=event.device_name, server_name=event.server_name)
+            held.data = {"fields": set(), "coalesced": 0}
+            self._held[key] = held
+            self._held_timers[key] = asyncio.get_running_loop().call_later(window, self._release, key)
+
+        data = dict(event.data)
+        held.data["fields"].update(data.pop("fields", ()))
+        held.data.update({name: value for name, value in data.items() if name != "coalesced"})
+        held.data["coalesced"] += 1
+        if event.device_name:
+            held.device_name = event.device_name
+
+    def _release(self, key) -> None:
+        self._held_timers.pop(key, None)
+        held = self._held.pop(key, None)
+        if held is not None:
+            self._queue.put_nowait(_Released(held))
+
+    async def _release_held(self, server_name: str) -> None:
+        # Events held for a device go out before anything newer about that device
+        for key in [(event_type, server_name) for event_type in self._coalesce_windows]:
+            if key not in self._held:
+                continue
+            self._held_timers.pop(key).cancel()
+            await self._fan_out(self._finish(self._held.pop(key)))
+
+    def _finish(self, event: DanteEvent) -> DanteEvent:
+        fields = event.data["fields"]
+        _, changed_fields = self._coalesce_windows.get(event.type, (None, None))
+        if changed_fields is not None:
+            fields |= changed_fields(event.server_name)
+        event.data["fields"] = sorted(fields)
+        return event
+
+    async def _fan_out(self, event: DanteEvent) -> None:
+        for callback in list(self._listeners.get(event.type, [])):
+            listener = self._listener_queues.get((event.type, callback))
+            if listener is not None and not listener.offer(event):
+                # Only a full listener with the block policy holds up the fan-out
+                await listener.put(event)
 
     async def _dispatch_loop(self) -> None:
         while self._running:
-            try:
-                event = await asyncio.wait_for(self._queue.get(), timeout=0.5)
-            except asyncio.TimeoutError:
+            event = await self._queue.get()
+
+            if isinstance(event, _Released):
+                await self._fan_out(self._finish(event.event))
                 continue
-            except asyncio.CancelledError:
-                break
-
-            callbacks = self._listeners.get(event.type, [])
-            for callback in callbacks:
-                try:
-                    await callback(event)
-                except Exception:
-                    logger.exception(
-                        f"Error in event callback for {event.type.name}"
-                    )
+
+            coalesce = self._coalesce_windows.get(event.type)
+            if coalesce is not None and event.server_name:
+                self._hold(event, coalesce[0])
+                continue
+
+            if self._held and event.server_name:
+                await self._release_held(event.server_name)
+            await self._fan_out(event)
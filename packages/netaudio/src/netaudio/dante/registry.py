@@ -0,0 +1,179 @@
+import os
+
+REMOVED_HISTORY_LIMIT = 1024
+
+
+def normalize_mac(mac: str) -> str:
+    return mac.lower().replace(":", "").replace("-", "")[:12]
+
+
+class DanteDeviceRegistry(dict):
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        # Keys are not unique on a real network, so each one keeps every device using it
+        self._by_ip: dict[str, list] = {}
+        self._by_mac: dict[str, list] = {}
+        self._by_name: dict[str, list] = {}
+        self.epoch = os.urandom(8)
+        self.version = 0
+        self._versions: dict[str, int] = {}
+        self._changed_fields: dict[str, set[str]] = {}
+        self._removed: dict[str, int] = {}
+        self._removed_floor = 0
+        self.update(*args, **kwargs)
+
+    def by_ip(self, ip: str):
+        return self._lookup(self._by_ip, ip)
+
+    def by_mac(self, mac: str):
+        if not mac:
+            return None
+        return self._lookup(self._by_mac, normalize_mac(mac))
+
+    def by_name(self, name: str):
+        return self._lookup(self._by_name, name)
+
+    def by_server_name(self, server_name: str):
+        return self.get(server_name)
+
+    def device_version(self, server_name: str) -> int | None:
+        return self._versions.get(server_name)
+
+    def take_changed_fields(self, server_name: str) -> set[str]:
+        return self._changed_fields.pop(server_name, set())
+
+    def changes_since(self, version: int) -> tuple[list[str], list[str]] | None:
+        if version < self._removed_floor or version > self.version:
+            return None
+
+        changed = [server_name for server_name, changed_at in self._versions.items() if changed_at > version]
+        removed = [server_name for server_name, removed_at in self._removed.items() if removed_at > version]
+        return changed, removed
+
+    def __setitem__(self, server_name, device) -> None:
+        previous = self.get(server_name)
+        if previous is not None and previous is not device:
+            self._detach(previous)
+        super().__setitem__(server_name, device)
+        self._attach(device)
+        self._record_change(server_name)
+
+    def __delitem__(self, server_name) -> None:
+        device = self[server_name]
+        super().__delitem__(server_name)
+        self._detach(device)
+        self._record_removal(server_name)
+
+    def pop(self, server_name, *default):
+        if server_name not in self:
+            if default:
+                return default[0]
+            raise KeyError(server_name)
+        device = super().pop(server_name)
+        self._detach(device)
+        self._record_removal(server_name)
+        return device
+
+    def popitem(self):
+        server_name, device = super().popitem()
+        self._detach(device)
+        self._record_removal(server_name)
+        return server_name, device
+
+    def setdefault(self, server_name, device=None):
+        if server_name not in self:
+            self[server_name] = device
+        return self[server_name]
+
+    def update(self, *args, **kwargs) -> None:
+        for server_name, device in dict(*args, **kwargs).items():
+            self[server_name] = device
+
+    def clear(self) -> None:
+        for server_name, device in list(self.items()):
+            self._detach(device)
+            self._record_removal(server_name)
+        super().clear()
+
+    def _touch(self, device, attribute: str | None = None) -> None:
+        server_name = device.server_name
+        if self.get(server_name) is device:
+            self._record_change(server_name)
+            if attribute is not None:
+                # Properties keep their value in a "_<name>" slot
+                self._changed_fields.setdefault(server_name, set()).add(attribute.lstrip("_"))
+
+    def _record_change(self, server_name) -> None:
+        self.version += 1
+        self._versions[server_name] = self.version
+        self._removed.pop(server_name, None)
+
+    def _record_removal(self, server_name) -> None:
+        self.version += 1
+        self._versions.pop(server_name, None)
+        self._changed_fields.pop(server_name, None)
+        self._removed.pop(server_name, None)
+        self._removed[server_name] = self.version
+
+        if len(self._removed) > REMOVED_HISTORY_LIMIT:
+            oldest = next(iter(self._removed))
+            self._removed_floor = self._removed.pop(oldest)
+
+    def _attach(self, device) -> None:
+        if device is None:
+            return
+        device._registry = self
+        self._index_value(self._by_ip, self._ip_key(device.ipv4), device)
+        self._index_value(self._by_mac, self._mac_key(device.mac_address), device)
+        self._index_value(self._by_name, device.name or None, device)
+
+    def _detach(self, device) -> None:
+        if device is None:
+            return
+        self._unindex_value(self._by_ip, self._ip_key(device.ipv4), device)
+        self._unindex_value(self._by_mac, self._mac_key(device.mac_address), device)
+        self._unindex_value(self._by_name, device.name or None, device)
+        if getattr(device, "_registry", None) is self:
+            device._registry = None
+
+    def _reindex(self, device, field: str, old_value, new_value) -> None:
+        if field == "ipv4":
+            index, old_key, new_key = self._by_ip, self._ip_key(old_value), self._ip_key(new_value)
+        elif field == "mac_address":
+            index, old_key, new_key = self._by_mac, self._mac_key(old_value), self._mac_key(new_value)
+        elif field == "name":
+            index, old_key, new_key = self._by_name, old_value or None, new_value or None
+        else:
+            return
+
+        self._unindex_value(index, old_key, device)
+        self._index_value(index, new_key, device)
+
+    @staticmethod
+    def _ip_key(ipv4) -> str | None:
+        return str(ipv4) if ipv4 else None
+
+    @staticmethod
+    def _mac_key(mac: str | None) -> str | None:
+        return normalize_mac(mac) if mac else None
+
+    @staticmethod
+    def _lookup(index: dict, key):
+        # The most recently indexed device wins while several share a key
+        matches = index.get(key)
+        return matches[-1] if matches else None
+
+    @classmethod
+    def _index_value(cls, index: dict, key, device) -> None:
+        if key is not None:
+            cls._unindex_value(index, key, device)
+            index.setdefault(key, []).append(device)
+
+    @staticmethod
+    def _unindex_value(index: dict, key, device) -> None:
+        matches = index.get(key) if key is not None else None
+        if not matches:
+            return
+        index[key] = [match for match in matches if match is not device]
+        if not index[key]:
+            del index[key]
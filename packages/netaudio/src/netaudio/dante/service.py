@@ -2,18 +2,35 @@ import asyncio
 import logging
 import socket
 import struct
-from netaudio.dante.transport import DanteMulticastProtocol, DanteUnicastProtocol
+from netaudio.dante.transport import RETRANSMIT_LIMIT, DanteMulticastProtocol, DanteUnicastProtocol
 
 logger = logging.getLogger("netaudio")
 
 
+DEFAULT_MAX_IN_FLIGHT = 4
+
+
 class DanteUnicastService:
-    def __init__(self, packet_store=None, dissect=False):
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT
+    transaction_id_protocols: tuple[int, ...] = ()
+    coalescible_commands: frozenset[tuple[int, int]] = frozenset()
+    # Idempotent requests; everything else is sent once so a lost reply never repeats a write
+    retransmittable_commands: frozenset[tuple[int, int]] = frozenset()
+
+    def __init__(self, packet_store=None, dissect=False, max_in_flight: int | None = None):
         self._protocol: DanteUnicastProtocol | None = None
         self._packet_store = packet_store
         self._dissect = dissect
         self._transaction_counter = 0
+        self._device_transaction_counters: dict[str, int] = {}
+        self._windows: dict[str, asyncio.Semaphore] = {}
+        self._in_flight: dict[str, int] = {}
+        self._coalesced: dict[tuple[str, int, bytes], asyncio.Future] = {}
         self._session_id: int | None = None
+        self.response_cache = None
+
+        if max_in_flight is not None:
+            self.max_in_flight = max(1, max_in_flight)
 
     @property
     def session_id(self) -> int | None:
@@ -23,9 +40,47 @@ class DanteUnicastService:
     def session_id(self, value: int | None) -> None:
         self._session_id = value
 
-    def _next_transaction_id(self) -> int:
-        self._transaction_counter = (self._transaction_counter + 1) & 0xFFFF
-        return self._transaction_counter
+    def _next_transaction_id(self, device_ip: str | None = None) -> int:
+        if device_ip is None:
+            self._transaction_counter = (self._transaction_counter + 1) & 0xFFFF
+            return self._transaction_counter
+
+        transaction_id = (self._device_transaction_counters.get(device_ip, 0) + 1) & 0xFFFF
+        self._device_transaction_counters[device_ip] = transaction_id
+        return transaction_id
+
+    def _stamp_transaction_id(self, packet: bytes, device_ip: str) -> bytes:
+        if len(packet) < 6:
+            return packet
+
+        protocol_id = struct.unpack(">H", packet[0:2])[0]
+        if protocol_id not in self.transaction_id_protocols:
+            return packet
+
+        transaction_id = self._next_transaction_id(device_ip)
+        return packet[:4] + struct.pack(">H", transaction_id) + packet[6:]
+
+    def _window(self, device_ip: str) -> asyncio.Semaphore:
+        window = self._windows.get(device_ip)
+        if window is None:
+            window = asyncio.Semaphore(self.max_in_flight)
+            self._windows[device_ip] = window
+        return window
+
+    def in_flight(self, device_ip: str) -> int:
+        return self._in_flight.get(device_ip, 0)
+
+    @staticmethod
+    def _command(packet: bytes) -> tuple[int, int] | None:
+        if len(packet) < 8:
+            return None
+        return struct.unpack(">H", packet[0:2])[0], struct.unpack(">H", packet[6:8])[0]
+
+    def _coalesce_key(self, packet: bytes, device_ip: str, port: int) -> tuple[str, int, bytes] | None:
+        if self._command(packet) not in self.coalescible_commands:
+            return None
+
+        return (device_ip, port, packet[:4] + b"\x00\x00" + packet[6:])
 
     async def start(self) -> None:
         loop = asyncio.get_running_loop()
@@ -46,7 +101,7 @@ class DanteUnicastService:
         packet: bytes,
         device_ip: str,
         port: int,
-        timeout: float = 0.5,
+        timeout: float | None = None,
         device_name: str = "",
         logical_command_name: str = "unknown",
     ) -> bytes | None:
@@ -54,6 +109,66 @@ class DanteUnicastService:
             logger.debug("Service not started, cannot send request")
             return None
 
+        key = self._coalesce_key(packet, device_ip, port)
+        if key is None:
+            return await self._windowed_request(packet, device_ip, port, timeout, device_name, logical_command_name)
+
+        cache = self.response_cache
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                logger.debug(f"Answering {logical_command_name} to {device_ip}:{port} from cache")
+                return cached[:4] + packet[4:6] + cached[6:]
+            generation = cache.generation(device_ip)
+
+        task = self._coalesced.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._windowed_request(packet, device_ip, port, timeout, device_name, logical_command_name)
+            )
+            self._coalesced[key] = task
+            task.add_done_callback(lambda done: self._release_coalesced(key, done))
+        else:
+            logger.debug(f"Coalescing {logical_command_name} to {device_ip}:{port} with pending request")
+
+        response = await asyncio.shield(task)
+        if cache is not None and response is not None:
+            cache.store(key, response, generation)
+        return response
+
+    def _release_coalesced(self, key: tuple[str, int, bytes], task: asyncio.Future) -> None:
+        if self._coalesced.get(key) is task:
+            del self._coalesced[key]
+
+    async def _windowed_request(
+        self,
+        packet: bytes,
+        device_ip: str,
+        port: int,
+        timeout: float | None,
+        device_name: str,
+        logical_command_name: str,
+    ) -> bytes | None:
+        async with self._window(device_ip):
+            self._in_flight[device_ip] = self._in_flight.get(device_ip, 0) + 1
+            try:
+                return await self._request(packet, device_ip, port, timeout, device_name, logical_command_name)
+            finally:
+                self._in_flight[device_ip] -= 1
+
+    async def _request(
+        self,
+        packet: bytes,
+        device_ip: str,
+        port: int,
+        timeout: float | None,
+        device_name: str,
+        logical_command_name: str,
+    ) -> bytes | None:
+        if self._protocol is None:
+            return None
+
+        packet = self._stamp_transaction_id(packet, device_ip)
         transaction_id = self._extract_transaction_id(packet)
 
         local_addr = self._protocol.transport.get_extra_info("sockname") if self._protocol.transport else None
@@ -80,9 +195,11 @@ class DanteUnicastService:
         if self._dissect:
             self._log_dissected(packet, device_ip, port, direction="request", command_name=logical_command_name)
 
+        retransmits = RETRANSMIT_LIMIT if self._command(packet) in self.retransmittable_commands else 0
         response = await self._protocol.send_and_expect(
             packet, (device_ip, port), transaction_id,
             timeout=timeout, logical_command_name=logical_command_name,
+            retransmits=retransmits,
         )
 
         if self._dissect and response is not None:
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import struct
 
@@ -5,25 +6,63 @@ from netaudio.dante.const import (
     FLOW_PROTOCOL_IDS,
     FLOW_TYPE_MULTICAST,
     HEARTBEAT_LOCK_UNRELIABLE_MODEL_IDS,
+    OPCODE_CHANNEL_COUNT,
     OPCODE_CREATE_TX_FLOW,
     OPCODE_CREATE_TX_FLOW_2809,
     OPCODE_DELETE_TX_FLOW,
     OPCODE_DELETE_TX_FLOW_2809,
+    OPCODE_DEVICE_INFO,
+    OPCODE_DEVICE_NAME,
+    OPCODE_DEVICE_SETTINGS,
     OPCODE_QUERY_TX_FLOWS,
     OPCODE_QUERY_TX_FLOWS_2809,
+    OPCODE_RX_CHANNELS,
+    OPCODE_TX_CHANNEL_INFO,
+    OPCODE_TX_CHANNEL_NAMES,
+    PROTOCOL_AES67_CONFIG,
+    PROTOCOL_ID,
     RESULT_CODE_LOCK_REJECTION,
     RESULT_CODE_SUCCESS,
 )
 from netaudio.dante.device_commands import DanteDeviceCommands
 from netaudio.dante.device_parser import DanteDeviceParser
+from netaudio.dante.protocol import DantePacket, DanteParser, DeviceSettings
 from netaudio.dante.service import DanteUnicastService
 
 logger = logging.getLogger("netaudio")
 
 
+async def _skipped():
+    return None
+
+
+def _raise_first_exception(*results):
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+
 class DanteARCService(DanteUnicastService):
-    def __init__(self, packet_store=None, dissect=False):
-        super().__init__(packet_store=packet_store, dissect=dissect)
+    max_in_flight = 4
+    transaction_id_protocols = (PROTOCOL_ID, *FLOW_PROTOCOL_IDS)
+    coalescible_commands = frozenset(
+        [
+            (PROTOCOL_ID, OPCODE_CHANNEL_COUNT),
+            (PROTOCOL_ID, OPCODE_DEVICE_NAME),
+            (PROTOCOL_ID, OPCODE_DEVICE_INFO),
+            (PROTOCOL_ID, OPCODE_DEVICE_SETTINGS),
+            (PROTOCOL_ID, OPCODE_TX_CHANNEL_INFO),
+            (PROTOCOL_ID, OPCODE_TX_CHANNEL_NAMES),
+            (PROTOCOL_ID, OPCODE_RX_CHANNELS),
+            (PROTOCOL_AES67_CONFIG, OPCODE_DEVICE_SETTINGS),
+            (PROTOCOL_AES67_CONFIG, OPCODE_QUERY_TX_FLOWS_2809),
+        ]
+        + [(protocol_id, OPCODE_QUERY_TX_FLOWS) for protocol_id in FLOW_PROTOCOL_IDS]
+    )
+    retransmittable_commands = coalescible_commands
+
+    def __init__(self, packet_store=None, dissect=False, max_in_flight: int | None = None):
+        super().__init__(packet_store=packet_store, dissect=dissect, max_in_flight=max_in_flight)
         self._commands = DanteDeviceCommands()
         self._parser = DanteDeviceParser()
 
@@ -59,6 +98,21 @@ class DanteARCService(DanteUnicastService):
             return tx_count, rx_count, lock_status
         return None
 
+    async def get_device_settings(self, device_ip: str, arc_port: int) -> DeviceSettings | None:
+        command_args = self._commands.command_device_settings(
+            transaction_id=self._next_transaction_id()
+        )
+        response = await self.request(
+            command_args[0], device_ip, arc_port,
+            logical_command_name="get_device_settings",
+        )
+        if response and len(response) > 12:
+            try:
+                return DanteParser.parse_device_settings(DantePacket.parse_response(response))
+            except ValueError as exception:
+                logger.debug(f"Error parsing device settings from {device_ip}: {exception}")
+        return None
+
     async def get_aes67_configured(self, device_ip: str, arc_port: int) -> bool | None:
         command_args = self._commands.command_query_latency_config(
             transaction_id=self._next_transaction_id()
@@ -76,7 +130,7 @@ class DanteARCService(DanteUnicastService):
                 return False
         return None
 
-    async def get_rx_channels(self, device, arc_port: int):
+    async def get_rx_channels(self, device, arc_port: int, pages=None):
         device_ip = str(device.ipv4)
 
         async def command_func(command, service_type=None, port=None, logical_command_name="unknown"):
@@ -86,9 +140,9 @@ class DanteARCService(DanteUnicastService):
                 logical_command_name=logical_command_name,
             )
 
-        return await self._parser.get_rx_channels(device, command_func)
+        return await self._parser.get_rx_channels(device, command_func, pages)
 
-    async def get_tx_channels(self, device, arc_port: int):
+    async def get_tx_channels(self, device, arc_port: int, pages=None):
         device_ip = str(device.ipv4)
 
         async def command_func(command, service_type=None, port=None, logical_command_name="unknown"):
@@ -98,41 +152,56 @@ class DanteARCService(DanteUnicastService):
                 logical_command_name=logical_command_name,
             )
 
-        return await self._parser.get_tx_channels(device, command_func)
+        return await self._parser.get_tx_channels(device, command_func, pages)
+
+    async def _get_aes67_configured_logged(self, device_ip: str, arc_port: int) -> bool | None:
+        try:
+            return await self.get_aes67_configured(device_ip, arc_port)
+        except Exception as exception:
+            logger.debug(f"Error getting AES67 config: {exception}")
+            return None
 
     async def get_controls(self, device, arc_port: int) -> None:
         device_ip = str(device.ipv4)
 
         try:
+            name, counts, aes67_configured = await asyncio.gather(
+                self.get_device_name(device_ip, arc_port) if not device.name else _skipped(),
+                self.get_channel_count(device_ip, arc_port),
+                self._get_aes67_configured_logged(device_ip, arc_port)
+                if device.aes67_configured is None
+                else _skipped(),
+                return_exceptions=True,
+            )
+            _raise_first_exception(name, counts)
+
             if not device.name:
-                name = await self.get_device_name(device_ip, arc_port)
                 if name:
                     device.name = name
                 else:
                     logger.debug(f"Failed to get device name for {device.server_name}")
 
-            counts = await self.get_channel_count(device_ip, arc_port)
             if counts:
                 device.tx_count = device.tx_count_raw = counts[0]
                 device.rx_count = device.rx_count_raw = counts[1]
                 if counts[2] is not None:
                     device.is_locked = counts[2]
 
-            if device.aes67_configured is None:
-                try:
-                    aes67_configured = await self.get_aes67_configured(device_ip, arc_port)
-                    if aes67_configured is not None:
-                        device.aes67_configured = aes67_configured
-                except Exception as exception:
-                    logger.debug(f"Error getting AES67 config: {exception}")
-
-            if device.tx_count:
-                tx_channels = await self.get_tx_channels(device, arc_port)
-                if tx_channels:
-                    device.tx_channels = tx_channels
-
-            if device.rx_count:
-                rx_channels, subscriptions = await self.get_rx_channels(device, arc_port)
+            if aes67_configured is not None:
+                device.aes67_configured = aes67_configured
+
+            tx_channels, rx_result = await asyncio.gather(
+                self.get_tx_channels(device, arc_port) if device.tx_count else _skipped(),
+                self.get_rx_channels(device, arc_port) if device.rx_count else _skipped(),
+                return_exceptions=True,
+            )
+            _raise_first_exception(tx_channels, rx_result)
+
+            if tx_channels:
+                device.tx_channels = tx_channels
+
+            if rx_result:
+                rx_channels, subscriptions = rx_result
                 if rx_channels:
                     device.rx_channels = rx_channels
                     device.subscriptions = subscriptions
@@ -238,7 +307,6 @@ class DanteARCService(DanteUnicastService):
             packet = self._build_flow_packet(protocol_id, query_opcode, b"\x00\x00")
             response = await self.request(
                 packet, device_ip, arc_port,
-                timeout=0.5,
                 logical_command_name="detect_flow_protocol",
             )
             if response and len(response) >= 10:
@@ -92,8 +92,19 @@ def _get_host_mac(interface_name: str | None = None) -> bytes:
 
 
 class DanteCMCService(DanteUnicastService):
-    def __init__(self, packet_store=None, interface_name: str | None = None, dissect=False):
-        super().__init__(packet_store=packet_store, dissect=dissect)
+    max_in_flight = 2
+    transaction_id_protocols = (PROTOCOL_CMC,)
+    # Registering again only refreshes the device's controller entry
+    retransmittable_commands = frozenset([(PROTOCOL_CMC, CMC_COMMAND_REGISTER)])
+
+    def __init__(
+        self,
+        packet_store=None,
+        interface_name: str | None = None,
+        dissect=False,
+        max_in_flight: int | None = None,
+    ):
+        super().__init__(packet_store=packet_store, dissect=dissect, max_in_flight=max_in_flight)
         self._commands = DanteDeviceCommands()
         self._sequence_counter = 0
         self._registered_devices: set[str] = set()
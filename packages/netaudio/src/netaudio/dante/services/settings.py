@@ -14,8 +14,14 @@ SETTINGS_PORT = DEVICE_SETTINGS_PORT
 
 
 class DanteSettingsService(DanteUnicastService):
-    def __init__(self, packet_store=None, dissect=False):
-        super().__init__(packet_store=packet_store, dissect=dissect)
+    # Settings replies are matched on the command id rather than a transaction
+    # id, so only one request per device can be outstanding at a time.
+    # Requests here are all writes (reads go out as fire-and-forget probes),
+    # so none are declared retransmittable.
+    max_in_flight = 1
+
+    def __init__(self, packet_store=None, dissect=False, max_in_flight: int | None = None):
+        super().__init__(packet_store=packet_store, dissect=dissect, max_in_flight=max_in_flight)
         self._commands = DanteDeviceCommands()
 
     def identify(self, device_ip: str) -> None:
@@ -1,15 +1,56 @@
 import asyncio
 import logging
 import struct
+import time
 from typing import Callable
 
 logger = logging.getLogger("netaudio")
 
+RTO_INITIAL = 0.5
+RTO_MIN = 0.1
+RTO_MAX = 2.0
+RTO_BACKOFF = 2.0
+RTT_ALPHA = 0.125
+RTT_BETA = 0.25
+RTT_VARIANCE_MULTIPLIER = 4
+RETRANSMIT_LIMIT = 2
+
+
+class RoundTripEstimator:
+    def __init__(self):
+        self.srtt: float | None = None
+        self.rttvar: float | None = None
+        self.samples = 0
+
+    @property
+    def rto(self) -> float:
+        if self.srtt is None:
+            return RTO_INITIAL
+        rto = self.srtt + RTT_VARIANCE_MULTIPLIER * self.rttvar
+        return min(max(rto, RTO_MIN), RTO_MAX)
+
+    def observe(self, sample: float) -> None:
+        if self.srtt is None:
+            self.srtt = sample
+            self.rttvar = sample / 2
+        else:
+            self.rttvar = (1 - RTT_BETA) * self.rttvar + RTT_BETA * abs(self.srtt - sample)
+            self.srtt = (1 - RTT_ALPHA) * self.srtt + RTT_ALPHA * sample
+        self.samples += 1
+
 
 class DanteUnicastProtocol(asyncio.DatagramProtocol):
     def __init__(self):
         self.transport: asyncio.DatagramTransport | None = None
         self._pending: dict[tuple[str, int], asyncio.Future] = {}
+        self._estimators: dict[tuple[str, int], RoundTripEstimator] = {}
+
+    def estimator(self, remote_addr: tuple[str, int]) -> RoundTripEstimator:
+        estimator = self._estimators.get(remote_addr)
+        if estimator is None:
+            estimator = RoundTripEstimator()
+            self._estimators[remote_addr] = estimator
+        return estimator
 
     def connection_made(self, transport: asyncio.DatagramTransport) -> None:
         self.transport = transport
@@ -44,8 +85,9 @@ class DanteUnicastProtocol(asyncio.DatagramProtocol):
         data: bytes,
         remote_addr: tuple[str, int],
         transaction_id: int,
-        timeout: float = 0.5,
+        timeout: float | None = None,
         logical_command_name: str = "",
+        retransmits: int = RETRANSMIT_LIMIT,
     ) -> bytes | None:
         if self.transport is None:
             return None
@@ -55,11 +97,47 @@ class DanteUnicastProtocol(asyncio.DatagramProtocol):
         key = (remote_addr[0], transaction_id)
         self._pending[key] = future
 
+        estimator = self.estimator(remote_addr)
+        attempt_timeout = estimator.rto
+        if timeout is None and not retransmits:
+            timeout = max(attempt_timeout, RTO_INITIAL)
+        # An explicit timeout bounds the whole exchange and is split across the attempts
+        deadline = None if timeout is None else loop.time() + timeout
+        command_label = f" ({logical_command_name})" if logical_command_name else ""
+
         try:
-            self.transport.sendto(data, remote_addr)
-            return await asyncio.wait_for(future, timeout=timeout)
-        except asyncio.TimeoutError:
-            command_label = f" ({logical_command_name})" if logical_command_name else ""
+            for attempt in range(retransmits + 1):
+                if self.transport is None:
+                    return None
+
+                wait = attempt_timeout
+                if deadline is not None:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    wait = remaining if attempt == retransmits else min(wait, remaining)
+
+                sent_at = time.monotonic()
+                self.transport.sendto(data, remote_addr)
+
+                try:
+                    response = await asyncio.wait_for(asyncio.shield(future), timeout=wait)
+                except asyncio.TimeoutError:
+                    if attempt < retransmits:
+                        logger.debug(
+                            f"Retransmitting to {remote_addr[0]}:{remote_addr[1]}{command_label} "
+                            f"after {wait:.3f}s, transaction_id=0x{transaction_id:04X}"
+                        )
+                        attempt_timeout = max(attempt_timeout, min(attempt_timeout * RTO_BACKOFF, RTO_MAX))
+                    continue
+
+                # Karn's algorithm: a reply to a retransmitted request is ambiguous,
+                # so only first-attempt round trips feed the estimator.
+                if attempt == 0:
+                    estimator.observe(time.monotonic() - sent_at)
+
+                return response
+
             logger.debug(
                 f"Timeout waiting for response from {remote_addr[0]}:{remote_addr[1]}{command_label}, "
                 f"transaction_id=0x{transaction_id:04X}"
@@ -0,0 +1,93 @@
+import pickle
+import sys
+import timeit
+
+from netaudio._common import find_device
+from netaudio.daemon import wire
+from netaudio.dante.channel import DanteChannel
+from netaudio.dante.device import DanteDevice
+from netaudio.dante.subscription import DanteSubscription
+
+DEVICE_COUNT = 300
+CHANNELS_PER_DEVICE = 16
+
+
+def _channel(number, prefix):
+    channel = DanteChannel()
+    channel.number = number
+    channel.name = f"{prefix}{number:02d}"
+    channel.friendly_name = f"{prefix} {number}"
+    channel.status_code = 1
+    channel.volume = 254
+    return channel
+
+
+def _device(index):
+    device = DanteDevice(server_name=f"dev{index}.local.")
+    device.name = f"dev{index}"
+    device.ipv4 = f"10.0.{index // 250}.{index % 250 + 1}"
+    device.mac_address = f"00:1d:c1:00:{index // 256:02x}:{index % 256:02x}"
+    device.model_id = "DAI2"
+    device.manufacturer = "Audinate"
+    device.sample_rate = 48000
+    device.latency = 1000000
+    device.online = True
+    device.last_seen = 1700000000.0 + index
+    device.services = {
+        f"dev{index}._netaudio-arc._udp.local.": {
+            "ipv4": str(device.ipv4),
+            "port": 4440,
+            "properties": {"model": "DAI2", "rate": "48000"},
+            "type": "_netaudio-arc._udp.local.",
+        }
+    }
+    device.tx_channels = {number: _channel(number, "tx") for number in range(1, CHANNELS_PER_DEVICE + 1)}
+    device.rx_channels = {number: _channel(number, "rx") for number in range(1, CHANNELS_PER_DEVICE + 1)}
+
+    for number, rx_channel in device.rx_channels.items():
+        subscription = DanteSubscription()
+        subscription.rx_channel = rx_channel
+        subscription.rx_channel_name = rx_channel.name
+        subscription.rx_device_name = device.name
+        subscription.tx_channel_name = f"tx{number:02d}"
+        subscription.tx_device_name = f"dev{(index + 1) % DEVICE_COUNT}"
+        subscription.status_code = 9
+        subscription.rx_channel_status_code = 9
+        device.subscriptions.append(subscription)
+
+    return device
+
+
+def bench(label, func, number):
+    best = min(timeit.repeat(func, number=number, repeat=5))
+    print(f"{label:<32} {best / number * 1e3:8.2f} ms")
+
+
+def main(number=10):
+    devices = {f"dev{index}.local.": _device(index) for index in range(DEVICE_COUNT)}
+
+    pickled = pickle.dumps(devices)
+    encoded = wire.encode_devices(devices)
+
+    print(f"{DEVICE_COUNT} devices, {CHANNELS_PER_DEVICE} tx/rx channels each")
+    print(f"{'pickle payload':<32} {len(pickled) / 1024:8.1f} KiB")
+    print(f"{'wire payload':<32} {len(encoded) / 1024:8.1f} KiB")
+
+    bench("pickle encode", lambda: pickle.dumps(devices), number)
+    bench("wire encode", lambda: wire.encode_devices(devices), number)
+    bench("pickle decode", lambda: pickle.loads(pickled), number)
+    bench("wire decode to views", lambda: wire.decode_devices(encoded), number)
+    bench(
+        "wire decode to DanteDevice",
+        lambda: [view.to_device() for view in wire.decode_devices(encoded).values()],
+        number,
+    )
+    bench(
+        "wire decode, find one device",
+        lambda: find_device(wire.DeviceMap(wire.decode_devices(encoded)), f"dev{DEVICE_COUNT // 2}"),
+        number,
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,56 @@
+import pathlib
+import sys
+import timeit
+from types import SimpleNamespace
+
+from netaudio.dante.device_parser import DanteDeviceParser
+
+FIXTURES_DIR = pathlib.Path(__file__).parent.parent / "fixtures"
+
+TX_RAW_4CH_48K = bytes.fromhex(
+    "27ff0048aaaa20000001000000010000002c0030"
+    "00020000002c003600030000002c003c00040000"
+    "002c00420000bb8063682d30310063682d303200"
+    "63682d30330063682d303400"
+)
+
+TX_FRIENDLY_4CH = bytes.fromhex(
+    "27ff005ebbbb20100001000000000001002400000002003100000003004100000004"
+    "00526d69632d6d69782d68696768006c696e75782d6d61696e3a6c656674006c69"
+    "6e75782d6d61696e3a7269676874006d69632d6d69782d6c6f7700"
+)
+
+RECEIVER_FIXTURES = {
+    "lx-dante": ("20250517_200646_289003_lx-dante_get_receivers_response.bin", 16),
+    "avio-usb-1": ("20250517_200646_463580_avio-usb-1_get_receivers_response.bin", 2),
+    "avio-bt-1": ("20250517_200646_385043_avio-bt-1_get_receivers_response.bin", 1),
+}
+
+
+def _device(rx_count=0, tx_count=0):
+    return SimpleNamespace(name="bench-device", rx_count=rx_count, tx_count=tx_count, sample_rate=None)
+
+
+def bench(label, func, number):
+    best = min(timeit.repeat(func, number=number, repeat=5))
+    print(f"{label:<28} {best / number * 1e6:8.2f} us/page")
+
+
+def main(number=20000):
+    parser = DanteDeviceParser()
+
+    for name, (fixture, rx_count) in RECEIVER_FIXTURES.items():
+        response = (FIXTURES_DIR / fixture).read_bytes()
+        device = _device(rx_count=rx_count)
+        bench(f"rx {name} ({rx_count}ch)", lambda: parser._parse_rx_page(device, 0, response, {}, []), number)
+
+    device = _device(tx_count=4)
+    bench("tx friendly (4ch)", lambda: parser._parse_tx_friendly_page(device, TX_FRIENDLY_4CH, {}), number)
+
+    friendly_names = {}
+    parser._parse_tx_friendly_page(device, TX_FRIENDLY_4CH, friendly_names)
+    bench("tx raw (4ch)", lambda: parser._parse_tx_raw_page(device, 0, TX_RAW_4CH_48K, friendly_names, {}), number)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,95 @@
+import asyncio
+import sys
+import time
+from types import SimpleNamespace
+
+from bench_daemon_wire import DEVICE_COUNT, _device
+
+from netaudio.daemon.relay import RelayServer
+from netaudio.dante.registry import DanteDeviceRegistry
+
+
+async def _read_response(reader):
+    status_line = await reader.readline()
+    headers = {}
+    size = len(status_line)
+    while True:
+        line = await reader.readline()
+        size += len(line)
+        if line in (b"\r\n", b""):
+            break
+        key, value = line.decode().split(":", 1)
+        headers[key.strip().lower()] = value.strip()
+
+    body = await reader.readexactly(int(headers.get("content-length", "0")))
+    return headers, size + len(body)
+
+
+def _request(*headers):
+    lines = ["GET /devices HTTP/1.1", "Host: relay", *headers]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode()
+
+
+async def _polls(port, count, keep_alive, conditional, headers):
+    received = 0
+    reader = writer = None
+    etag = None
+
+    for _ in range(count):
+        if writer is None:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+        extra = list(headers)
+        if etag:
+            extra.append(f"If-None-Match: {etag}")
+        if not keep_alive:
+            extra.append("Connection: close")
+
+        writer.write(_request(*extra))
+        response_headers, size = await _read_response(reader)
+        received += size
+
+        if conditional:
+            etag = response_headers.get("etag")
+        if not keep_alive:
+            writer.close()
+            await writer.wait_closed()
+            writer = None
+
+    if writer is not None:
+        writer.close()
+        await writer.wait_closed()
+    return received
+
+
+async def main(count=200):
+    devices = DanteDeviceRegistry()
+    for index in range(DEVICE_COUNT):
+        device = _device(index)
+        devices[device.server_name] = device
+
+    relay = RelayServer(SimpleNamespace(devices=devices, shure=None))
+    server = await asyncio.start_server(relay.handle_connection, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    print(f"{DEVICE_COUNT} devices, {count} polls of /devices")
+    cases = [
+        ("new connection per poll", False, False, ()),
+        ("keep-alive", True, False, ()),
+        ("keep-alive + gzip", True, False, ("Accept-Encoding: gzip",)),
+        ("keep-alive + gzip + If-None-Match", True, True, ("Accept-Encoding: gzip",)),
+    ]
+    for label, keep_alive, conditional, headers in cases:
+        started = time.perf_counter()
+        received = await _polls(port, count, keep_alive, conditional, headers)
+        elapsed = time.perf_counter() - started
+        print(f"{label:<36} {count / elapsed:8.0f} req/s {received / count / 1024:10.1f} KiB/poll")
+
+    # Let the relay see the last disconnect before the loop shuts down
+    await asyncio.sleep(0.1)
+    server.close()
+    await server.wait_closed()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200))
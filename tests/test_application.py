@@ -207,3 +207,203 @@ class TestDanteApplication:
             data={"notification_id": 9999, "notification_name": "Unknown"},
         )
         await application._dispatch_notification(event)
+
+
+def _conmon_device(index):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        device = DanteDevice(server_name=f"dev{index}.local.")
+    device.ipv4 = f"192.168.1.{index}"
+    device.mac_address = f"00:1d:c1:00:00:{index:02x}"
+    return device
+
+
+class TestQueryConmonAll:
+    @pytest.mark.asyncio
+    async def test_queries_all_devices_and_retries_stragglers(self, monkeypatch):
+        monkeypatch.setattr("netaudio.dante.application.CONMON_ROUND_TIMEOUTS", (0.05, 0.05, 0.05))
+        application = DanteApplication()
+        for index in range(1, 41):
+            application.register_device(f"dev{index}.local.", _conmon_device(index))
+
+        sent = []
+        slow_ip = "192.168.1.7"
+
+        def fake_send(device, opcode):
+            device_ip = str(device.ipv4)
+            sent.append((device_ip, opcode))
+            attempts = sum(1 for ip, _ in sent if ip == device_ip)
+            if device_ip == slow_ip and attempts <= 2:
+                return
+
+            def respond():
+                if opcode == "make_model":
+                    device.dante_model = "model"
+                else:
+                    device.dante_model_id = "model-id"
+                application.notifications._notify_conmon_waiter(device_ip, 1 if opcode == "make_model" else 2)
+
+            asyncio.get_running_loop().call_soon(respond)
+
+        application._send_conmon_query_for_device = fake_send
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await application._query_conmon_all(timeout=5.0)
+        elapsed = loop.time() - started
+
+        assert all(device.dante_model_id for device in application.devices.values())
+        assert len([entry for entry in sent if entry[0] != slow_ip]) == 78
+        assert len([entry for entry in sent if entry[0] == slow_ip]) == 4
+        assert elapsed < 1.0
+        assert application.notifications._conmon_waiters == {}
+
+    @pytest.mark.asyncio
+    async def test_skips_devices_without_mac(self):
+        application = DanteApplication()
+        device = _conmon_device(1)
+        device.mac_address = None
+        application.register_device(device.server_name, device)
+
+        sent = []
+        application._send_conmon_query_for_device = lambda device, opcode: sent.append(opcode)
+
+        await application._query_conmon_all(timeout=1.0)
+
+        assert sent == []
+
+
+class _FakeAsyncZeroconf:
+    def __init__(self, **kwargs):
+        self.zeroconf = object()
+
+    async def async_close(self):
+        pass
+
+
+def _fake_service_browser(announcements):
+    class _FakeAsyncServiceBrowser:
+        def __init__(self, zeroconf, services, handlers):
+            browser = handlers[0].__self__
+            loop = asyncio.get_running_loop()
+            for delay, service in announcements:
+                future = loop.create_future()
+                if service is not None:
+                    loop.call_later(delay, future.set_result, service)
+                browser.services.append(future)
+
+        async def async_cancel(self):
+            pass
+
+    return _FakeAsyncServiceBrowser
+
+
+def _arc_service(index):
+    return {
+        "ipv4": f"192.168.1.{index}",
+        "name": f"dev{index}._netaudio-arc._udp.local.",
+        "port": 4440,
+        "properties": {},
+        "server_name": f"dev{index}.local.",
+        "type": "_netaudio-arc._udp.local.",
+    }
+
+
+class TestDiscoverAndPopulate:
+    @pytest.fixture
+    def application(self, monkeypatch):
+        monkeypatch.setattr("netaudio.dante.application.AsyncZeroconf", _FakeAsyncZeroconf)
+        application = DanteApplication()
+        application.populated = []
+
+        async def populate(device, arc_port):
+            await asyncio.sleep(0.01)
+            application.populated.append(device.server_name)
+
+        async def noop(*args, **kwargs):
+            pass
+
+        application._register_and_populate = populate
+        for name in (
+            "_query_settings_fields",
+            "_query_conmon_all",
+            "_probe_interface_status",
+            "_probe_preferred_leader_all",
+            "_probe_aes67_all",
+        ):
+            setattr(application, name, noop)
+        application.cmc.register_all = noop
+        return application
+
+    @pytest.mark.asyncio
+    async def test_finishes_when_quiescent(self, application, monkeypatch):
+        announcements = [(0.01, _arc_service(1)), (0.02, _arc_service(2)), (0.05, _arc_service(3))]
+        monkeypatch.setattr("netaudio.dante.application.AsyncServiceBrowser", _fake_service_browser(announcements))
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        devices = await application.discover_and_populate(timeout=5.0, quiet_interval=0.1)
+
+        assert loop.time() - started < 1.0
+        assert sorted(devices) == ["dev1.local.", "dev2.local.", "dev3.local."]
+        assert sorted(application.populated) == sorted(devices)
+        assert str(devices["dev2.local."].ipv4) == "192.168.1.2"
+
+    @pytest.mark.asyncio
+    async def test_expect_returns_early(self, application, monkeypatch):
+        announcements = [(0.01, _arc_service(1)), (0.01, _arc_service(2)), (0, None)]
+        monkeypatch.setattr("netaudio.dante.application.AsyncServiceBrowser", _fake_service_browser(announcements))
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        devices = await application.discover_and_populate(timeout=5.0, expect=2)
+
+        assert loop.time() - started < 1.0
+        assert len(devices) == 2
+
+    @pytest.mark.asyncio
+    async def test_timeout_is_upper_bound(self, application, monkeypatch):
+        announcements = [(0.01, _arc_service(1)), (0, None)]
+        monkeypatch.setattr("netaudio.dante.application.AsyncServiceBrowser", _fake_service_browser(announcements))
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        devices = await application.discover_and_populate(timeout=0.3, quiet_interval=0.05)
+
+        assert 0.25 <= loop.time() - started < 1.0
+        assert list(devices) == ["dev1.local."]
+
+    @pytest.mark.asyncio
+    async def test_empty_network(self, application, monkeypatch):
+        monkeypatch.setattr("netaudio.dante.application.AsyncServiceBrowser", _fake_service_browser([]))
+
+        devices = await application.discover_and_populate(timeout=0.5)
+
+        assert devices == {}
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_devices_as_they_are_populated(self, application, monkeypatch):
+        announcements = [(0.01, _arc_service(1)), (0.2, _arc_service(2))]
+        monkeypatch.setattr("netaudio.dante.application.AsyncServiceBrowser", _fake_service_browser(announcements))
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        arrivals = []
+        async for device in application.discover_stream(timeout=5.0, quiet_interval=0.1):
+            arrivals.append((device.server_name, loop.time() - started))
+
+        assert [server_name for server_name, _ in arrivals] == ["dev1.local.", "dev2.local."]
+        assert arrivals[0][1] < 0.2
+        assert arrivals[0][0] in application.populated
+
+    @pytest.mark.asyncio
+    async def test_stream_closed_early_cleans_up(self, application, monkeypatch):
+        announcements = [(0.01, _arc_service(1)), (0, None)]
+        monkeypatch.setattr("netaudio.dante.application.AsyncServiceBrowser", _fake_service_browser(announcements))
+
+        stream = application.discover_stream(timeout=5.0)
+        device = await anext(stream)
+        await stream.aclose()
+
+        assert device.server_name == "dev1.local."
+        assert application._browser is None
@@ -0,0 +1,69 @@
+import json
+
+from netaudio.daemon.change_log import DeviceChangeLog
+from netaudio.dante.channel import DanteChannel
+from netaudio.dante.device import DanteDevice
+from netaudio.dante.subscription import DanteSubscription
+
+
+def _device():
+    device = DanteDevice(server_name="dev1.local.")
+    device.name = "dev1"
+    device.ipv4 = "192.168.1.10"
+    device.online = True
+
+    for number in (1, 2):
+        channel = DanteChannel()
+        channel.channel_type = "rx"
+        channel.number = number
+        channel.name = f"rx{number}"
+        device.rx_channels[number] = channel
+
+    subscription = DanteSubscription()
+    subscription.rx_channel_name = "rx1"
+    subscription.tx_channel_name = "out1"
+    subscription.tx_device_name = "dev2"
+    device.subscriptions = [subscription]
+    return device
+
+
+def _summary(records):
+    return [(record["kind"], record["id"], record["op"]) for record in records]
+
+
+class TestDeviceChangeLog:
+    def test_first_sight_adds_everything(self):
+        records = DeviceChangeLog().changes(_device())
+
+        assert _summary(records) == [
+            ("device", "", "add"),
+            ("rx_channel", "1", "add"),
+            ("rx_channel", "2", "add"),
+            ("subscription", "rx1", "add"),
+        ]
+        assert all(record["server_name"] == "dev1.local." for record in records)
+        assert json.loads(records[3]["fields"])["tx_device"] == "dev2"
+
+    def test_only_changed_fields_are_recorded(self):
+        change_log = DeviceChangeLog()
+        device = _device()
+        change_log.changes(device)
+
+        device.online = False
+        device.rx_channels[2].name = "Vox"
+        records = change_log.changes(device)
+
+        assert _summary(records) == [("device", "", "update"), ("rx_channel", "2", "update")]
+        assert json.loads(records[0]["fields"]) == {"online": "0"}
+        assert json.loads(records[1]["fields"]) == {"name": "Vox"}
+        assert change_log.changes(device) == []
+
+    def test_removals(self):
+        change_log = DeviceChangeLog()
+        device = _device()
+        change_log.changes(device)
+
+        device.subscriptions = []
+        assert _summary(change_log.changes(device)) == [("subscription", "rx1", "remove")]
+        assert _summary(change_log.removed("dev1.local.")) == [("device", "", "remove")]
+        assert change_log.removed("dev1.local.") == []
@@ -0,0 +1,483 @@
+import asyncio
+import pickle
+import struct
+from contextlib import asynccontextmanager
+
+import pytest
+
+from netaudio.daemon import client, device_cache, server, wire
+from netaudio.daemon.protocol import (
+    CMD_DEVICE_BATCH,
+    CMD_DEVICE_REQUEST,
+    CMD_GET_DEVICES,
+    CMD_QUERY_DEVICES,
+    STATUS_OK,
+    STATUS_TIMEOUT,
+    decode_batch_results,
+    encode_batch,
+    encode_string,
+)
+from netaudio.daemon.query import SUMMARY_FIELDS, DeviceQuery
+from netaudio.daemon.server import NetaudioDaemon
+from netaudio.dante.application import DanteApplication
+from netaudio.dante.channel import DanteChannel
+from netaudio.dante.device import DanteDevice
+
+
+def _make_daemon():
+    daemon = object.__new__(NetaudioDaemon)
+    daemon.application = DanteApplication()
+    daemon.running = True
+    daemon.server = None
+    daemon.metering = None
+
+    device = DanteDevice(server_name="dev1.local.")
+    device.name = "dev1"
+    device.ipv4 = "192.168.1.10"
+    daemon.application.devices[device.server_name] = device
+
+    daemon.proxied = []
+
+    async def proxy(packet, device_ip, port):
+        daemon.proxied.append(packet)
+        # Later requests finish first so responses arrive out of order
+        await asyncio.sleep(0.05 / packet[0])
+        return packet if packet[0] % 2 else None
+
+    daemon._proxy_device_request = proxy
+    return daemon
+
+
+@asynccontextmanager
+async def _serving_daemon(path, daemon=None):
+    daemon = daemon or _make_daemon()
+    connections = []
+
+    async def handle_client(reader, writer):
+        connections.append(writer)
+        await daemon.handle_client(reader, writer)
+
+    server = await asyncio.start_unix_server(handle_client, path=path)
+    try:
+        yield connections
+    finally:
+        await client.close_daemon_connection()
+        server.close()
+        await server.wait_closed()
+
+
+@pytest.fixture
+def socket_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "d.sock")
+    monkeypatch.setattr(client, "daemon_is_accessible", lambda: True)
+    monkeypatch.setattr(client, "open_daemon_connection", lambda: asyncio.open_unix_connection(path))
+    monkeypatch.setattr(client, "_connection", None)
+    monkeypatch.setattr(client, "_multiplex_unsupported", False)
+    monkeypatch.setattr(device_cache, "get_device_cache_path", lambda: tmp_path / "devices.cache")
+    return path
+
+
+def _device_request_payload(packet):
+    return encode_string("192.168.1.10") + struct.pack(">H", 4440) + struct.pack(">I", len(packet)) + packet
+
+
+class TestMultiplexedConnection:
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_connection(self, socket_path):
+        packets = [bytes([index]) + b"\x27\xff" for index in range(1, 9)]
+        async with _serving_daemon(socket_path) as connections:
+            responses = await asyncio.gather(
+                *[client.device_request_via_daemon(packet, "192.168.1.10", 4440) for packet in packets]
+            )
+
+        assert len(connections) == 1
+        assert responses == [packet if packet[0] % 2 else None for packet in packets]
+
+    @pytest.mark.asyncio
+    async def test_connection_is_reused_across_commands(self, socket_path):
+        async with _serving_daemon(socket_path) as connections:
+            devices = await client.get_devices_from_daemon()
+            status = await client.meter_status_from_daemon()
+            await client.report_unresponsive_device("missing.local.")
+
+        assert list(devices) == ["dev1.local."]
+        assert devices["dev1.local."].name == "dev1"
+        assert status == {}
+        assert len(connections) == 1
+
+    @pytest.mark.asyncio
+    async def test_pending_requests_fail_when_connection_drops(self, socket_path):
+        async with _serving_daemon(socket_path):
+            connection = await client.get_daemon_connection()
+            request = asyncio.create_task(connection.request(CMD_DEVICE_REQUEST, _device_request_payload(b"\x01")))
+            await asyncio.sleep(0)
+
+            connection._writer.transport.abort()
+
+            with pytest.raises(ConnectionError):
+                await request
+            assert connection.closed
+
+    @pytest.mark.asyncio
+    async def test_in_flight_requests_are_bounded_per_connection(self, socket_path, monkeypatch):
+        monkeypatch.setattr(server, "MULTIPLEX_MAX_IN_FLIGHT", 2)
+        daemon = _make_daemon()
+        active = []
+        peak = []
+
+        async def proxy(packet, device_ip, port):
+            active.append(packet)
+            peak.append(len(active))
+            await asyncio.sleep(0.02)
+            active.remove(packet)
+            return packet
+
+        daemon._proxy_device_request = proxy
+        packets = [bytes([index]) for index in range(1, 7)]
+
+        async with _serving_daemon(socket_path, daemon):
+            responses = await asyncio.gather(
+                *[client.device_request_via_daemon(packet, "192.168.1.10", 4440) for packet in packets]
+            )
+
+        assert responses == packets
+        assert max(peak) == 2
+
+    @pytest.mark.asyncio
+    async def test_device_requests_finish_after_disconnect(self, socket_path):
+        daemon = _make_daemon()
+        finished = asyncio.Event()
+
+        async def proxy(packet, device_ip, port):
+            await asyncio.sleep(0.05)
+            finished.set()
+            return packet
+
+        daemon._proxy_device_request = proxy
+
+        async with _serving_daemon(socket_path, daemon):
+            connection = await client.get_daemon_connection()
+            request = asyncio.create_task(connection.request(CMD_DEVICE_REQUEST, _device_request_payload(b"\x01")))
+            await asyncio.sleep(0.01)
+
+            connection._writer.transport.abort()
+            with pytest.raises(ConnectionError):
+                await request
+
+            await asyncio.wait_for(finished.wait(), 1.0)
+
+
+class TestOneShotCommands:
+    @pytest.mark.asyncio
+    async def test_get_devices(self, socket_path):
+        async with _serving_daemon(socket_path):
+            reader, writer = await asyncio.open_unix_connection(socket_path)
+            writer.write(CMD_GET_DEVICES)
+            await writer.drain()
+
+            length = struct.unpack(">I", await reader.readexactly(4))[0]
+            devices = wire.decode_devices(await reader.readexactly(length))
+            writer.close()
+
+        assert list(devices) == ["dev1.local."]
+        assert devices["dev1.local."].name == "dev1"
+
+    @pytest.mark.asyncio
+    async def test_device_request(self, socket_path):
+        async with _serving_daemon(socket_path):
+            reader, writer = await asyncio.open_unix_connection(socket_path)
+            writer.write(CMD_DEVICE_REQUEST + _device_request_payload(b"\x01abc"))
+            await writer.drain()
+
+            status = await reader.readexactly(1)
+            length = struct.unpack(">I", await reader.readexactly(4))[0]
+            response = await reader.readexactly(length)
+            writer.close()
+
+        assert status == b"\x01"
+        assert response == b"\x01abc"
+
+    @pytest.mark.asyncio
+    async def test_client_falls_back_for_daemons_without_multiplexing(self, socket_path, monkeypatch):
+        legacy_path = socket_path + ".legacy"
+
+        async def legacy_handler(reader, writer):
+            await reader.read(1)
+            data = wire.encode_devices({}, epoch="00" * 8, version=0, full=True, removed=[], last_seen={})
+            writer.write(struct.pack(">I", len(data)) + data)
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_unix_server(legacy_handler, path=legacy_path)
+        monkeypatch.setattr(client, "open_daemon_connection", lambda: asyncio.open_unix_connection(legacy_path))
+
+        assert await client.get_devices_from_daemon() == {}
+        assert client._multiplex_unsupported is True
+        assert await client.get_devices_from_daemon() == {}
+
+        server.close()
+        await server.wait_closed()
+
+
+class TestDeltaSync:
+    @pytest.mark.asyncio
+    async def test_only_changed_devices_are_sent(self, socket_path, monkeypatch):
+        daemon = _make_daemon()
+        second = DanteDevice(server_name="dev2.local.")
+        second.name = "dev2"
+        daemon.application.devices[second.server_name] = second
+
+        deltas = []
+        build_delta = daemon._devices_delta_payload
+
+        def recording_delta(epoch, since):
+            payload = build_delta(epoch, since)
+            deltas.append(wire.decode_document(payload))
+            return payload
+
+        monkeypatch.setattr(daemon, "_devices_delta_payload", recording_delta)
+
+        async with _serving_daemon(socket_path, daemon):
+            first = await client.get_devices_from_daemon()
+
+            daemon.devices["dev2.local."].sample_rate = 96000
+            daemon.devices["dev1.local."].last_seen = 1234.0
+            second_result = await client.get_devices_from_daemon()
+
+            daemon.devices.pop("dev2.local.")
+            third = await client.get_devices_from_daemon()
+
+        assert sorted(first) == ["dev1.local.", "dev2.local."]
+        assert deltas[0]["full"] is True
+
+        assert deltas[1]["full"] is False
+        assert [record[0] for record in deltas[1]["devices"]] == ["dev2.local."]
+        assert second_result["dev2.local."].sample_rate == 96000
+        assert second_result["dev1.local."].last_seen == 1234.0
+
+        assert deltas[2]["devices"] == []
+        assert deltas[2]["removed"] == ["dev2.local."]
+        assert list(third) == ["dev1.local."]
+
+    @pytest.mark.asyncio
+    async def test_cache_from_another_daemon_is_replaced(self, socket_path):
+        stale = device_cache.DeviceStateCache()
+        stale.epoch = b"\x01" * 8
+        stale.version = 10_000
+        stale.schema = wire.SCHEMA
+        stale.records = {"gone.local.": wire.device_record(DanteDevice(server_name="gone.local."))}
+        stale.save()
+
+        async with _serving_daemon(socket_path):
+            devices = await client.get_devices_from_daemon()
+
+        assert list(devices) == ["dev1.local."]
+        assert list(device_cache.DeviceStateCache.load().records) == ["dev1.local."]
+
+
+class TestDeviceQuery:
+    def _daemon(self):
+        daemon = _make_daemon()
+        daemon.devices["dev1.local."].model_id = "DIAES3"
+        daemon.devices["dev1.local."].online = True
+        channel = DanteChannel()
+        channel.number = 1
+        channel.name = "01"
+        daemon.devices["dev1.local."].tx_channels = {1: channel}
+
+        second = DanteDevice(server_name="stage-box.local.")
+        second.name = "stage-box"
+        second.ipv4 = "192.168.1.11"
+        second.model_id = "DAO2"
+        second.online = False
+        daemon.application.devices[second.server_name] = second
+        return daemon
+
+    @pytest.mark.asyncio
+    async def test_filters_are_applied_by_the_daemon(self, socket_path):
+        async with _serving_daemon(socket_path, self._daemon()):
+            by_name = await client.get_device_views_from_daemon(DeviceQuery(names=["stage*"]))
+            by_host = await client.get_device_views_from_daemon(DeviceQuery(hosts=["192.168.1.10"]))
+            by_model = await client.get_device_views_from_daemon(DeviceQuery(models=["DAO*"]))
+            offline = await client.get_device_views_from_daemon(DeviceQuery(online=False))
+            by_server_name = await client.get_device_views_from_daemon(DeviceQuery(server_names=["dev?.local."]))
+
+        assert list(by_name) == ["stage-box.local."]
+        assert list(by_host) == ["dev1.local."]
+        assert list(by_model) == ["stage-box.local."]
+        assert list(offline) == ["stage-box.local."]
+        assert list(by_server_name) == ["dev1.local."]
+
+    @pytest.mark.asyncio
+    async def test_projection_drops_unrequested_fields(self, socket_path, monkeypatch):
+        daemon = self._daemon()
+        payloads = []
+        build_query = daemon._devices_query_payload
+
+        def recording_query(query):
+            payload = build_query(query)
+            payloads.append(payload)
+            return payload
+
+        monkeypatch.setattr(daemon, "_devices_query_payload", recording_query)
+
+        async with _serving_daemon(socket_path, daemon):
+            devices = await client.get_devices_from_daemon(DeviceQuery(names=["dev1"], fields=["name", "ipv4"]))
+
+        document = wire.decode_document(payloads[0])
+        assert document["schema"]["device"] == ["server_name", "name", "ipv4"]
+        assert document["devices"] == [["dev1.local.", "dev1", "192.168.1.10"]]
+        assert devices["dev1.local."].name == "dev1"
+        assert devices["dev1.local."].tx_channels == {}
+
+    @pytest.mark.asyncio
+    async def test_summary_query_leaves_the_delta_cache_alone(self, socket_path):
+        async with _serving_daemon(socket_path, self._daemon()):
+            devices = await client.get_device_views_from_daemon(DeviceQuery(fields=list(SUMMARY_FIELDS)))
+
+        assert sorted(devices) == ["dev1.local.", "stage-box.local."]
+        assert devices["dev1.local."].tx_channels == {}
+        assert device_cache.DeviceStateCache.load().records == {}
+
+    @pytest.mark.asyncio
+    async def test_unknown_fields_are_rejected(self, socket_path):
+        async with _serving_daemon(socket_path):
+            connection = await client.get_daemon_connection()
+            payload = DeviceQuery(fields=["nope"]).to_payload()
+
+            with pytest.raises(client.DaemonRequestError, match="nope"):
+                await connection.request(CMD_QUERY_DEVICES, struct.pack(">I", len(payload)) + payload)
+
+    @pytest.mark.asyncio
+    async def test_daemons_without_queries_are_filtered_locally(self, socket_path, monkeypatch):
+        daemon = self._daemon()
+        monkeypatch.setattr(daemon, "_run_command", _legacy_run_command(daemon))
+
+        async with _serving_daemon(socket_path, daemon):
+            devices = await client.get_device_views_from_daemon(DeviceQuery(names=["dev1"]))
+
+        assert list(devices) == ["dev1.local."]
+
+
+def _legacy_run_command(daemon):
+    run_command = daemon._run_command
+
+    async def legacy(cmd, reader):
+        if cmd == CMD_QUERY_DEVICES:
+            return STATUS_OK, daemon._devices_payload()
+        return await run_command(cmd, reader)
+
+    return legacy
+
+
+class TestDeviceBatch:
+    def _daemon(self, events):
+        daemon = _make_daemon()
+
+        async def proxy(packet, device_ip, port):
+            events.append(("start", device_ip, packet))
+            await asyncio.sleep(packet[0] / 100)
+            events.append(("end", device_ip, packet))
+            return packet
+
+        daemon._proxy_device_request = proxy
+        return daemon
+
+    @pytest.mark.asyncio
+    async def test_devices_run_concurrently_in_order(self, socket_path):
+        events = []
+        requests = [
+            (b"\x05a", "192.168.1.10", 4440),
+            (b"\x01b", "192.168.1.10", 4440),
+            (b"\x05c", "192.168.1.11", 4440),
+            (b"\x01d", "192.168.1.12", 8700),
+        ]
+
+        async with _serving_daemon(socket_path, self._daemon(events)) as connections:
+            started = asyncio.get_running_loop().time()
+            responses = await client.device_requests_via_daemon(requests)
+            elapsed = asyncio.get_running_loop().time() - started
+
+        assert responses == [packet for packet, _, _ in requests]
+        assert len(connections) == 1
+        assert elapsed < 0.1
+
+        first_device = [event for event in events if event[1] == "192.168.1.10"]
+        assert first_device == [
+            ("start", "192.168.1.10", b"\x05a"),
+            ("end", "192.168.1.10", b"\x05a"),
+            ("start", "192.168.1.10", b"\x01b"),
+            ("end", "192.168.1.10", b"\x01b"),
+        ]
+        assert events.index(("start", "192.168.1.11", b"\x05c")) < events.index(("end", "192.168.1.10", b"\x05a"))
+
+    @pytest.mark.asyncio
+    async def test_entries_time_out_individually(self, socket_path):
+        events = []
+        requests = [
+            (b"\x0aslow", "192.168.1.10", 4440, 0.02),
+            (b"\x01fast", "192.168.1.10", 4440, 1.0),
+        ]
+
+        async with _serving_daemon(socket_path, self._daemon(events)):
+            connection = await client.get_daemon_connection()
+            _, body = await connection.request(CMD_DEVICE_BATCH, encode_batch(requests))
+            responses = await client.device_requests_via_daemon(requests)
+
+        assert decode_batch_results(body) == [(STATUS_TIMEOUT, b""), (STATUS_OK, b"\x01fast")]
+        assert responses == [None, b"\x01fast"]
+
+    @pytest.mark.asyncio
+    async def test_daemons_without_batches_return_none(self, socket_path, monkeypatch):
+        daemon = _make_daemon()
+        run_command = daemon._run_command
+
+        async def legacy(cmd, reader):
+            if cmd == CMD_DEVICE_BATCH:
+                return STATUS_OK, daemon._devices_payload()
+            return await run_command(cmd, reader)
+
+        monkeypatch.setattr(daemon, "_run_command", legacy)
+
+        async with _serving_daemon(socket_path, daemon):
+            assert await client.device_requests_via_daemon([(b"\x01", "192.168.1.10", 4440)]) is None
+
+    @pytest.mark.asyncio
+    async def test_pickle_replies_from_older_daemons_return_none(self, socket_path, monkeypatch):
+        daemon = _make_daemon()
+        run_command = daemon._run_command
+
+        async def legacy(cmd, reader):
+            if cmd == CMD_DEVICE_BATCH:
+                return STATUS_OK, pickle.dumps(dict(daemon.application.devices))
+            return await run_command(cmd, reader)
+
+        monkeypatch.setattr(daemon, "_run_command", legacy)
+
+        async with _serving_daemon(socket_path, daemon):
+            assert await client.device_requests_via_daemon([(b"\x01", "192.168.1.10", 4440)]) is None
+
+    @pytest.mark.asyncio
+    async def test_a_connect_timeout_returns_none(self, monkeypatch):
+        async def unreachable():
+            raise asyncio.TimeoutError
+
+        monkeypatch.setattr(client, "daemon_is_accessible", lambda: True)
+        monkeypatch.setattr(client, "get_daemon_connection", unreachable)
+
+        assert await client.device_requests_via_daemon([(b"\x01", "192.168.1.10", 4440)]) is None
+
+    @pytest.mark.asyncio
+    async def test_a_timed_out_batch_is_an_error_not_a_fallback(self, monkeypatch):
+        class StalledConnection:
+            async def request(self, command, payload=b"", timeout=5.0):
+                raise asyncio.TimeoutError
+
+        async def connected():
+            return StalledConnection()
+
+        monkeypatch.setattr(client, "daemon_is_accessible", lambda: True)
+        monkeypatch.setattr(client, "get_daemon_connection", connected)
+
+        with pytest.raises(client.DaemonRequestError):
+            await client.device_requests_via_daemon([(b"\x01", "192.168.1.10", 4440)])
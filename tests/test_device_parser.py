@@ -1,10 +1,12 @@
+import asyncio
+import struct
 from dataclasses import dataclass
 from typing import Any, Dict, List
 from unittest.mock import Mock
 
 import pytest
 from netaudio.dante.device import DanteDevice
-from netaudio.dante.device_parser import DanteDeviceParser
+from netaudio.dante.device_parser import DanteDeviceParser, _PageStrings
 
 
 TX_RAW_4CH_48K = bytes.fromhex(
@@ -48,6 +50,20 @@ class TestDanteDeviceParser:
         data = b"Hello"
         assert parser._get_string_at_offset(data, 0) is None
 
+    @pytest.mark.parametrize(
+        "fixture",
+        [
+            "20250517_200646_289003_lx-dante_get_receivers_response.bin",
+            "20250517_200646_385043_avio-bt-1_get_receivers_response.bin",
+        ],
+    )
+    def test_page_strings_match_get_string_at_offset(self, parser, load_fixture, fixture):
+        response = load_fixture(fixture)
+        strings = _PageStrings(response, 12)
+
+        for offset in range(0, len(response) + 2):
+            assert strings[offset] == parser._get_string_at_offset(response, offset)
+
     def test_get_string_at_offset_with_no_null_terminator(self, parser):
         data = b"_HelloWorld"
         assert parser._get_string_at_offset(data, 1) == "HelloWorld"
@@ -387,6 +403,123 @@ async def test_get_tx_channels_without_friendly_response():
     assert tx_channels[1].friendly_name is None
 
 
+def _build_rx_page(page, channels=16):
+    header = b"\x27\xff\x00\x00\x00\x00\x30\x00\x00\x01"
+    strings_offset = len(header) + 2 + channels * 20
+    records = b""
+    strings = b""
+    for index in range(channels):
+        number = page * 16 + index + 1
+        name_offset = strings_offset + len(strings)
+        strings += f"rx-{number:03d}".encode() + b"\x00"
+        records += struct.pack(">HHHHHHHHI", number, 0, 0, 0, 0, name_offset, 1, 0, 0)
+    return header + struct.pack(">BB", channels, 0) + records + strings
+
+
+@pytest.mark.asyncio
+async def test_get_rx_channels_fetches_pages_concurrently_in_order():
+    parser = DanteDeviceParser()
+
+    device = Mock()
+    device.name = "test-device"
+    device.rx_count = 48
+    device.sample_rate = None
+    device.error = None
+    device.commands.command_receivers = Mock(side_effect=lambda page: (page, "svc"))
+
+    active = 0
+    peak = 0
+
+    async def mock_dante_command(page, service, **kwargs):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        # Later pages answer first
+        await asyncio.sleep(0.01 * (3 - page))
+        active -= 1
+        return _build_rx_page(page)
+
+    rx_channels, subscriptions = await parser.get_rx_channels(device, mock_dante_command)
+
+    assert peak == 3
+    assert list(rx_channels) == list(range(1, 49))
+    assert rx_channels[17].name == "rx-017"
+    assert [sub.rx_channel_name for sub in subscriptions][:2] == ["rx-001", "rx-002"]
+    assert subscriptions[-1].rx_channel_name == "rx-048"
+
+
+@pytest.mark.asyncio
+async def test_get_rx_channels_stops_after_short_page():
+    parser = DanteDeviceParser()
+
+    device = Mock()
+    device.name = "test-device"
+    device.rx_count = 48
+    device.sample_rate = None
+    device.error = None
+    device.commands.command_receivers = Mock(side_effect=lambda page: (page, "svc"))
+
+    async def mock_dante_command(page, service, **kwargs):
+        return _build_rx_page(page, channels=4 if page == 1 else 16)
+
+    rx_channels, _ = await parser.get_rx_channels(device, mock_dante_command)
+
+    assert list(rx_channels) == list(range(1, 21))
+
+
+@pytest.mark.asyncio
+async def test_get_rx_channels_reads_only_requested_pages():
+    parser = DanteDeviceParser()
+
+    device = Mock()
+    device.name = "test-device"
+    device.rx_count = 48
+    device.sample_rate = None
+    device.error = None
+    device.commands.command_receivers = Mock(side_effect=lambda page: (page, "svc"))
+
+    requested = []
+
+    async def mock_dante_command(page, service, **kwargs):
+        requested.append(page)
+        return _build_rx_page(page, channels=4 if page == 0 else 16)
+
+    rx_channels, subscriptions = await parser.get_rx_channels(device, mock_dante_command, pages=[0, 2])
+
+    assert sorted(requested) == [0, 2]
+    assert list(rx_channels) == [1, 2, 3, 4] + list(range(33, 49))
+    assert len(subscriptions) == 20
+
+
+@pytest.mark.asyncio
+async def test_get_tx_channels_runs_both_passes_concurrently():
+    parser = DanteDeviceParser()
+
+    device = Mock()
+    device.tx_count = 4
+    device.sample_rate = None
+    device.error = None
+    device.commands.command_transmitters = Mock(return_value=("cmd", "svc"))
+
+    active = 0
+    peak = 0
+
+    async def mock_dante_command(*args, **kwargs):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        if "friendly" in kwargs.get("logical_command_name", ""):
+            return TX_FRIENDLY_4CH
+        return TX_RAW_4CH_48K
+
+    tx_channels = await parser.get_tx_channels(device, mock_dante_command)
+
+    assert peak == 2
+    assert tx_channels[1].friendly_name == "mic-mix-high"
+
+
 class TestParseBluetoothStatus:
     def test_connected_extracts_device_name(self, load_fixture):
         response = load_fixture("avio-bt-1_bluetooth_status_connected.bin")
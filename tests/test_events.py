@@ -2,7 +2,14 @@ import asyncio
 
 import pytest
 
-from netaudio.dante.events import DanteEvent, DanteEventDispatcher, EventType
+from netaudio.dante.events import (
+    OVERFLOW_BLOCK,
+    OVERFLOW_COALESCE,
+    OVERFLOW_DROP_OLDEST,
+    DanteEvent,
+    DanteEventDispatcher,
+    EventType,
+)
 
 
 @pytest.fixture
@@ -173,3 +180,195 @@ async def test_start_stop_idempotent(dispatcher):
 
     await dispatcher.stop()
     await dispatcher.stop()  # Should not raise
+
+
+@pytest.mark.asyncio
+async def test_slow_listener_does_not_delay_others(dispatcher):
+    release = asyncio.Event()
+    received = []
+
+    async def slow_callback(event):
+        await release.wait()
+
+    async def fast_callback(event):
+        received.append(event)
+
+    dispatcher.on(EventType.DEVICE_UPDATED, slow_callback)
+    dispatcher.on(EventType.DEVICE_UPDATED, fast_callback)
+    await dispatcher.start()
+
+    for index in range(3):
+        dispatcher.emit_nowait(DanteEvent(type=EventType.DEVICE_UPDATED, server_name=f"dev{index}.local."))
+    await asyncio.sleep(0.05)
+
+    assert len(received) == 3
+
+    release.set()
+    await dispatcher.stop()
+
+
+async def _fill_blocked_listener(dispatcher, overflow, events):
+    release = asyncio.Event()
+    received = []
+
+    async def callback(event):
+        await release.wait()
+        received.append(event.server_name)
+
+    dispatcher.on(EventType.METER_VALUES, callback, max_queue=2, overflow=overflow)
+    await dispatcher.start()
+
+    for server_name in events:
+        dispatcher.emit_nowait(DanteEvent(type=EventType.METER_VALUES, server_name=server_name))
+        await asyncio.sleep(0.01)
+
+    return release, received
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_overflow(dispatcher):
+    release, received = await _fill_blocked_listener(dispatcher, OVERFLOW_DROP_OLDEST, ["a", "b", "c", "d"])
+
+    release.set()
+    await asyncio.sleep(0.05)
+
+    # "a" was already being delivered; "b" fell out of the full queue
+    assert received == ["a", "c", "d"]
+    assert dispatcher.stats()[0]["dropped"] == 1
+    await dispatcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_coalesce_overflow_keeps_latest_per_device(dispatcher):
+    release, received = await _fill_blocked_listener(dispatcher, OVERFLOW_COALESCE, ["a", "b", "c", "b", "b"])
+
+    release.set()
+    await asyncio.sleep(0.05)
+
+    assert received == ["a", "b", "c"]
+    stats = dispatcher.stats()[0]
+    assert stats["coalesced"] == 2
+    assert stats["dropped"] == 0
+    await dispatcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_block_overflow_holds_events_until_space(dispatcher):
+    release, received = await _fill_blocked_listener(dispatcher, OVERFLOW_BLOCK, ["a", "b", "c", "d"])
+
+    assert dispatcher._queue.qsize() == 0
+    assert dispatcher.stats()[0]["depth"] == 2
+
+    release.set()
+    await asyncio.sleep(0.05)
+
+    assert received == ["a", "b", "c", "d"]
+    assert dispatcher.stats()[0]["dropped"] == 0
+    await dispatcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_listener_stats_report_lag(dispatcher):
+    async def callback(event):
+        await asyncio.sleep(0.02)
+
+    dispatcher.on(EventType.DEVICE_UPDATED, callback)
+    await dispatcher.start()
+
+    dispatcher.emit_nowait(DanteEvent(type=EventType.DEVICE_UPDATED, server_name="a"))
+    dispatcher.emit_nowait(DanteEvent(type=EventType.DEVICE_UPDATED, server_name="b"))
+    await asyncio.sleep(0.06)
+
+    stats = dispatcher.stats()[0]
+    assert stats["listener"].endswith("callback")
+    assert stats["delivered"] == 2
+    assert stats["max_lag"] >= 0.015
+    await dispatcher.stop()
+
+
+def test_unknown_overflow_policy(dispatcher):
+    async def callback(event):
+        pass
+
+    with pytest.raises(ValueError):
+        dispatcher.on(EventType.DEVICE_UPDATED, callback, overflow="spill")
+
+
+@pytest.mark.asyncio
+async def test_coalesce_merges_a_burst_into_one_event(dispatcher):
+    received = []
+
+    async def callback(event):
+        received.append(event)
+
+    dispatcher.coalesce(EventType.DEVICE_UPDATED, 0.05, lambda server_name: {"latency"})
+    dispatcher.on(EventType.DEVICE_UPDATED, callback)
+    await dispatcher.start()
+
+    for fields in (["sample_rate"], ["name"], []):
+        dispatcher.emit_nowait(
+            DanteEvent(type=EventType.DEVICE_UPDATED, server_name="a.local.", data={"fields": fields})
+        )
+    dispatcher.emit_nowait(DanteEvent(type=EventType.DEVICE_UPDATED, server_name="b.local."))
+    await asyncio.sleep(0.02)
+
+    assert received == []
+
+    await asyncio.sleep(0.06)
+
+    assert sorted(event.server_name for event in received) == ["a.local.", "b.local."]
+    merged = next(event for event in received if event.server_name == "a.local.")
+    assert merged.data["coalesced"] == 3
+    assert merged.data["fields"] == ["latency", "name", "sample_rate"]
+
+    await dispatcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_coalesced_events_flush_before_other_events_for_the_device(dispatcher):
+    received = []
+
+    async def callback(event):
+        received.append(event.type)
+
+    dispatcher.coalesce(EventType.DEVICE_UPDATED, 10.0)
+    dispatcher.on(EventType.DEVICE_UPDATED, callback)
+    dispatcher.on(EventType.DEVICE_REMOVED, callback)
+    await dispatcher.start()
+
+    dispatcher.emit_nowait(DanteEvent(type=EventType.DEVICE_UPDATED, server_name="a.local."))
+    dispatcher.emit_nowait(DanteEvent(type=EventType.DEVICE_REMOVED, server_name="a.local."))
+    await asyncio.sleep(0.02)
+
+    assert received == [EventType.DEVICE_UPDATED, EventType.DEVICE_REMOVED]
+
+    await dispatcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_one_owner_sees_its_events_in_order_across_types(dispatcher):
+    received = []
+
+    class Consumer:
+        async def on_updated(self, event):
+            await asyncio.sleep(0.02)
+            received.append("updated")
+
+        async def on_removed(self, event):
+            received.append("removed")
+
+    consumer = Consumer()
+    dispatcher.on(EventType.DEVICE_UPDATED, consumer.on_updated, overflow=OVERFLOW_COALESCE)
+    dispatcher.on(EventType.DEVICE_REMOVED, consumer.on_removed)
+    await dispatcher.start()
+
+    dispatcher.emit_nowait(DanteEvent(type=EventType.DEVICE_UPDATED, server_name="a.local."))
+    dispatcher.emit_nowait(DanteEvent(type=EventType.DEVICE_REMOVED, server_name="a.local."))
+    await asyncio.sleep(0.05)
+
+    assert received == ["updated", "removed"]
+
+    dispatcher.off(EventType.DEVICE_UPDATED, consumer.on_updated)
+    dispatcher.off(EventType.DEVICE_REMOVED, consumer.on_removed)
+    assert dispatcher._consumers == {}
+    await dispatcher.stop()
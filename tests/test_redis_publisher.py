@@ -0,0 +1,211 @@
+import asyncio
+
+import pytest
+
+from netaudio.daemon.redis_publisher import RedisPublisher
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def delete(self, *keys):
+        self.commands.append(("delete", *sorted(keys)))
+
+    def hset(self, key, mapping):
+        self.commands.append(("hset", key, mapping))
+
+    def set(self, key, value):
+        self.commands.append(("set", key, value))
+
+    def xadd(self, stream, fields, maxlen=None, approximate=True):
+        self.commands.append(("xadd", stream, fields))
+
+    async def execute(self):
+        if self.redis.fail:
+            raise ConnectionError("redis went away")
+        self.redis.executed.append(self.commands)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.executed = []
+        self.fail = False
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+def _device(name, online="1"):
+    return {"server_name": f"{name}.local.", "name": name, "online": online}
+
+
+class TestRedisPublisher:
+    @pytest.mark.asyncio
+    async def test_devices_are_batched_into_one_pipeline(self):
+        redis = FakeRedis()
+        publisher = RedisPublisher(redis)
+
+        for index in range(50):
+            publisher.hset(f"netaudio:daemon:device:dev{index}", _device(f"dev{index}"))
+        await publisher.flush()
+
+        assert len(redis.executed) == 1
+        assert len(redis.executed[0]) == 50
+        assert publisher.stats()["commands"] == 50
+
+    @pytest.mark.asyncio
+    async def test_only_changed_fields_are_written(self):
+        redis = FakeRedis()
+        publisher = RedisPublisher(redis)
+        key = "netaudio:daemon:device:dev1"
+
+        publisher.hset(key, _device("dev1"))
+        await publisher.flush()
+        publisher.hset(key, _device("dev1", online="0"))
+        await publisher.flush()
+        publisher.hset(key, _device("dev1", online="0"))
+        publisher.set("netaudio:shure:aa", "{}")
+        await publisher.flush()
+        publisher.set("netaudio:shure:aa", "{}")
+        await publisher.flush()
+
+        assert redis.executed[1] == [("hset", key, {"online": "0"})]
+        assert redis.executed[2] == [("set", "netaudio:shure:aa", "{}")]
+        assert len(redis.executed) == 3
+        assert publisher.skipped == 2
+
+    @pytest.mark.asyncio
+    async def test_delete_forgets_the_published_hash(self):
+        redis = FakeRedis()
+        publisher = RedisPublisher(redis)
+        key = "netaudio:daemon:device:dev1"
+
+        publisher.hset(key, _device("dev1"))
+        await publisher.flush()
+        publisher.delete(key)
+        publisher.hset(key, _device("dev1"))
+        await publisher.flush()
+
+        assert redis.executed[1] == [("delete", key), ("hset", key, _device("dev1"))]
+
+    @pytest.mark.asyncio
+    async def test_meters_are_rate_limited_to_the_latest_reading(self):
+        redis = FakeRedis()
+        publisher = RedisPublisher(redis, meter_interval=60)
+        key = "netaudio:shure:meters:aa"
+
+        publisher.set_meter(key, "1")
+        await publisher.flush()
+        publisher.set_meter(key, "2")
+        publisher.set_meter(key, "3")
+        await publisher.flush()
+
+        assert redis.executed == [[("set", key, "1")]]
+        assert publisher.pending
+
+        await publisher.stop()
+        assert redis.executed[-1] == [("set", key, "3")]
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_is_retried_without_clobbering_newer_writes(self):
+        redis = FakeRedis()
+        publisher = RedisPublisher(redis)
+        key = "netaudio:daemon:device:dev1"
+
+        redis.fail = True
+        publisher.hset(key, _device("dev1"))
+        await publisher.flush()
+        publisher.hset(key, {"online": "0"})
+        redis.fail = False
+        await publisher.flush()
+
+        assert redis.executed == [[("hset", key, _device("dev1", online="0"))]]
+
+    @pytest.mark.asyncio
+    async def test_flush_loop_batches_writes_per_interval(self):
+        redis = FakeRedis()
+        publisher = RedisPublisher(redis, flush_interval=0.01)
+        await publisher.start()
+
+        publisher.hset("netaudio:daemon:device:dev1", _device("dev1"))
+        publisher.hset("netaudio:daemon:device:dev2", _device("dev2"))
+        await asyncio.sleep(0.05)
+        await publisher.stop()
+
+        assert len(redis.executed) == 1
+        assert len(redis.executed[0]) == 2
+
+    @pytest.mark.asyncio
+    async def test_stream_entries_keep_their_order_across_a_failed_flush(self):
+        redis = FakeRedis()
+        publisher = RedisPublisher(redis)
+
+        redis.fail = True
+        publisher.xadd("netaudio:daemon:changes", {"op": "add"}, 100)
+        await publisher.flush()
+        publisher.xadd("netaudio:daemon:changes", {"op": "update"}, 100)
+        redis.fail = False
+        await publisher.flush()
+
+        assert redis.executed == [
+            [
+                ("xadd", "netaudio:daemon:changes", {"op": "add"}),
+                ("xadd", "netaudio:daemon:changes", {"op": "update"}),
+            ]
+        ]
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_rewrites_everything_once_redis_is_back(self):
+        redis = FakeRedis()
+        publisher = RedisPublisher(redis)
+        key = "netaudio:daemon:device:dev1"
+
+        publisher.hset(key, _device("dev1"))
+        publisher.set("netaudio:shure:aa", "{}")
+        await publisher.flush()
+        redis.fail = True
+        publisher.hset(key, {"online": "0"})
+        await publisher.flush()
+        redis.fail = False
+        await publisher.flush()
+
+        assert redis.executed[1] == [
+            ("hset", key, _device("dev1", online="0")),
+            ("set", "netaudio:shure:aa", "{}"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_periodic_resync_heals_keys_deleted_behind_its_back(self):
+        redis = FakeRedis()
+        publisher = RedisPublisher(redis, flush_interval=0.01, resync_interval=0.05)
+        key = "netaudio:daemon:device:dev1"
+        await publisher.start()
+
+        publisher.hset(key, _device("dev1"))
+        await asyncio.sleep(0.03)
+        publisher.hset(key, _device("dev1"))
+        await asyncio.sleep(0.05)
+        await publisher.stop()
+
+        assert redis.executed == [[("hset", key, _device("dev1"))], [("hset", key, _device("dev1"))]]
+        assert publisher.stats()["resyncs"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stream_backlog_drops_the_oldest_entries_while_redis_is_down(self):
+        redis = FakeRedis()
+        publisher = RedisPublisher(redis)
+        stream = "netaudio:daemon:changes"
+
+        redis.fail = True
+        for index in range(3):
+            publisher.xadd(stream, {"op": str(index)}, 4)
+        await publisher.flush()
+        for index in range(3, 6):
+            publisher.xadd(stream, {"op": str(index)}, 4)
+        redis.fail = False
+        await publisher.flush()
+
+        assert redis.executed == [[("xadd", stream, {"op": str(index)}) for index in range(2, 6)]]
+        assert publisher.stats()["stream_dropped"] == 2
@@ -0,0 +1,304 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from netaudio.daemon.refresh import channel_pages, merge_rx_channels, merge_tx_channels, written_channels
+from netaudio.daemon.response_cache import DanteResponseCache
+from netaudio.daemon.scheduler import RefreshScheduler
+from netaudio.daemon.server import NetaudioDaemon
+from netaudio.dante.application import DanteApplication
+from netaudio.dante.channel import DanteChannel
+from netaudio.dante.const import SERVICE_ARC
+from netaudio.dante.device import DanteDevice
+from netaudio.dante.device_commands import DanteDeviceCommands
+from netaudio.dante.events import DanteEvent, EventType
+from netaudio.dante.protocol import DeviceSettings
+from netaudio.dante.services.arc import DanteARCService
+from netaudio.dante.services.notification import (
+    NOTIFICATION_ROUTING_DEVICE_CHANGE,
+    NOTIFICATION_SAMPLE_RATE_STATUS,
+    NOTIFICATION_TX_CHANNEL_CHANGE,
+    NOTIFICATION_TX_FLOW_CHANGE,
+)
+from netaudio.dante.subscription import DanteSubscription
+
+DEVICE_IP = "192.168.1.10"
+ARC_PORT = 4440
+
+
+def _channel(number, name, channel_type="rx"):
+    channel = DanteChannel()
+    channel.channel_type = channel_type
+    channel.number = number
+    channel.name = name
+    return channel
+
+
+def _subscription(rx_channel_name, tx_channel_name=None):
+    subscription = DanteSubscription()
+    subscription.rx_channel_name = rx_channel_name
+    subscription.tx_channel_name = tx_channel_name
+    return subscription
+
+
+def _rx_table(numbers, prefix="rx"):
+    channels = {number: _channel(number, f"{prefix}{number}") for number in numbers}
+    subscriptions = [_subscription(channel.name, f"{prefix}-tx{number}") for number, channel in channels.items()]
+    return channels, subscriptions
+
+
+class TestWrittenChannels:
+    def test_channel_renames(self):
+        commands = DanteDeviceCommands()
+
+        assert written_channels(commands.command_set_channel_name("rx", 17, "Vox")[0]) == ("rx", {17})
+        assert written_channels(commands.command_reset_channel_name("tx", 40)[0]) == ("tx", {40})
+
+    def test_subscriptions(self):
+        commands = DanteDeviceCommands()
+        add = commands.command_add_subscriptions([(3, "a", "dev"), (20, "b", "dev"), (33, "c", "dev")])[0]
+
+        assert written_channels(add) == ("rx", {3, 20, 33})
+        assert written_channels(commands.command_remove_subscriptions([5, 64])[0]) == ("rx", {5, 64})
+
+    def test_reads_are_not_writes(self):
+        commands = DanteDeviceCommands()
+
+        assert written_channels(commands.command_receivers(1)[0]) is None
+        assert written_channels(commands.command_set_name("dev")[0]) is None
+
+    def test_channel_pages(self):
+        assert channel_pages({1, 16, 17, 48}, 16) == [0, 1, 2]
+        assert channel_pages({1, 33}, 32) == [0, 1]
+
+
+class TestMerge:
+    def test_rx_pages_replace_only_their_channels(self):
+        device = DanteDevice(server_name="dev1.local.")
+        device.rx_count = 32
+        device.rx_channels, device.subscriptions = _rx_table(range(1, 33))
+
+        rx_channels, subscriptions = _rx_table(range(17, 33), prefix="new")
+        merge_rx_channels(device, rx_channels, subscriptions)
+
+        assert list(device.rx_channels) == list(range(1, 33))
+        assert device.rx_channels[1].name == "rx1"
+        assert device.rx_channels[17].name == "new17"
+        assert [subscription.rx_channel_name for subscription in device.subscriptions] == [
+            channel.name for channel in device.rx_channels.values()
+        ]
+        assert device.subscriptions[16].tx_channel_name == "new-tx17"
+
+    def test_merge_trims_to_the_channel_count(self):
+        device = DanteDevice(server_name="dev1.local.")
+        device.tx_count = 2
+        device.tx_channels = {number: _channel(number, f"tx{number}", "tx") for number in (1, 2, 3)}
+
+        merge_tx_channels(device, {2: _channel(2, "renamed", "tx")})
+
+        assert list(device.tx_channels) == [1, 2]
+        assert device.tx_channels[2].name == "renamed"
+
+
+class FakeARCService:
+    coalescible_commands = DanteARCService.coalescible_commands
+
+    def __init__(self):
+        self.calls = []
+
+    async def request(self, packet, device_ip, port, **kwargs):
+        self.calls.append(("request",))
+        return None
+
+    async def get_device_name(self, device_ip, arc_port):
+        self.calls.append(("get_device_name",))
+        return "dev1"
+
+    async def get_channel_count(self, device_ip, arc_port):
+        self.calls.append(("get_channel_count",))
+        return 4, 32, None
+
+    async def get_tx_channels(self, device, arc_port, pages=None):
+        self.calls.append(("get_tx_channels", pages))
+        return {1: _channel(1, "tx-renamed", "tx")}
+
+    async def get_rx_channels(self, device, arc_port, pages=None):
+        self.calls.append(("get_rx_channels", pages))
+        return _rx_table(range(17, 33), prefix="new")
+
+    async def detect_flow_protocol(self, device_ip, arc_port):
+        self.calls.append(("detect_flow_protocol",))
+        return 0x2204
+
+    async def query_tx_flows(self, device_ip, arc_port, flow_protocol_id):
+        self.calls.append(("query_tx_flows", flow_protocol_id))
+        return [{}, {}]
+
+    async def get_device_settings(self, device_ip, arc_port):
+        self.calls.append(("get_device_settings",))
+        return DeviceSettings(sample_rate=96000, latency_us=1000, min_latency_us=250, max_latency_us=5000)
+
+    async def get_controls(self, device, arc_port):
+        self.calls.append(("get_controls",))
+
+
+def _daemon():
+    daemon = object.__new__(NetaudioDaemon)
+    daemon.application = DanteApplication()
+    daemon.application.arc = FakeARCService()
+    daemon.response_cache = DanteResponseCache()
+    daemon._dirty_channels = {}
+    daemon._redis = None
+    daemon.refresh_scheduler = RefreshScheduler(jitter=0)
+    daemon._service_changes = {}
+
+    device = DanteDevice(server_name="dev1.local.")
+    device.ipv4 = DEVICE_IP
+    device.name = "dev1"
+    device.online = True
+    device.tx_count = 4
+    device.rx_count = 32
+    device.services = {"arc": {"type": SERVICE_ARC, "port": ARC_PORT}}
+    device.tx_channels = {number: _channel(number, f"tx{number}", "tx") for number in range(1, 5)}
+    device.rx_channels, device.subscriptions = _rx_table(range(1, 33))
+    daemon.application.devices[device.server_name] = device
+    return daemon, device
+
+
+def _notification(notification_id):
+    return DanteEvent(
+        type=EventType.NOTIFICATION_RECEIVED,
+        server_name="dev1.local.",
+        data={"notification_id": notification_id},
+    )
+
+
+async def _notify(daemon, notification_id):
+    await daemon._on_refresh_notification(_notification(notification_id))
+    await daemon.refresh_scheduler.join()
+
+
+class TestNotificationRefresh:
+    @pytest.mark.asyncio
+    async def test_routing_change_reads_only_rx_channels(self):
+        daemon, device = _daemon()
+
+        await _notify(daemon, NOTIFICATION_ROUTING_DEVICE_CHANGE)
+
+        assert daemon.application.arc.calls == [("get_rx_channels", None)]
+        assert device.rx_channels[17].name == "new17"
+
+    @pytest.mark.asyncio
+    async def test_proxied_write_narrows_the_refresh_to_its_pages(self):
+        daemon, device = _daemon()
+        packet = DanteDeviceCommands().command_add_subscription(20, "ch", "tx-dev")[0]
+
+        await daemon._proxy_device_request(packet, DEVICE_IP, ARC_PORT)
+        await _notify(daemon, NOTIFICATION_ROUTING_DEVICE_CHANGE)
+
+        assert daemon.application.arc.calls[-1] == ("get_rx_channels", [1])
+        assert device.rx_channels[1].name == "rx1"
+        assert device.rx_channels[20].name == "new20"
+        assert len(device.subscriptions) == 32
+
+        await _notify(daemon, NOTIFICATION_ROUTING_DEVICE_CHANGE)
+        assert daemon.application.arc.calls[-1] == ("get_rx_channels", None)
+
+    @pytest.mark.asyncio
+    async def test_tx_channel_change_leaves_rx_alone(self):
+        daemon, device = _daemon()
+
+        await _notify(daemon, NOTIFICATION_TX_CHANNEL_CHANGE)
+
+        assert daemon.application.arc.calls == [("get_tx_channels", None)]
+        assert device.tx_channels == {1: device.tx_channels[1]}
+
+    @pytest.mark.asyncio
+    async def test_tx_flow_change_sets_flow_count(self):
+        daemon, device = _daemon()
+
+        await _notify(daemon, NOTIFICATION_TX_FLOW_CHANGE)
+
+        assert [call[0] for call in daemon.application.arc.calls] == [
+            "get_channel_count",
+            "detect_flow_protocol",
+            "query_tx_flows",
+        ]
+        assert device.tx_flow_count == 2
+        assert device.flow_protocol_id == 0x2204
+
+    @pytest.mark.asyncio
+    async def test_sample_rate_change_reads_device_settings(self):
+        daemon, device = _daemon()
+
+        await _notify(daemon, NOTIFICATION_SAMPLE_RATE_STATUS)
+
+        assert daemon.application.arc.calls == [("get_device_settings",)]
+        assert device.sample_rate == 96000
+        assert device.latency == 1_000_000
+        assert device.min_latency == 0.25
+
+
+class FakeServiceInfo:
+    def __init__(self, service_type, name):
+        self.port = 14440
+        self.properties = {}
+
+    async def async_request(self, zeroconf, timeout):
+        return True
+
+    def parsed_addresses(self):
+        return [DEVICE_IP]
+
+
+class FakeRecord:
+    server = "dev1.local."
+
+
+@pytest.mark.asyncio
+async def test_service_change_bumps_the_device_version(monkeypatch):
+    from zeroconf import ServiceStateChange
+
+    from netaudio.daemon import server
+
+    monkeypatch.setattr(server, "AsyncServiceInfo", FakeServiceInfo)
+    daemon, device = _daemon()
+    devices = daemon.application.devices
+    version = devices.version
+    zeroconf = SimpleNamespace(cache=SimpleNamespace(entries_with_name=lambda name: [FakeRecord()]))
+
+    name = "dev1._netaudio-arc._udp.local."
+    await daemon.handle_service_change(zeroconf, SERVICE_ARC, name, ServiceStateChange.Updated)
+
+    assert device.services[name]["port"] == 14440
+    assert devices.changes_since(version) == (["dev1.local."], [])
+
+
+@pytest.mark.asyncio
+async def test_service_changes_bypass_the_refresh_pool_in_order():
+    from zeroconf import ServiceStateChange
+
+    daemon, _ = _daemon()
+    daemon.refresh_scheduler = RefreshScheduler(concurrency=1, jitter=0)
+    blocker = asyncio.Event()
+    daemon.refresh_scheduler.schedule("busy", blocker.wait)
+    applied = []
+
+    async def handle_service_change(zeroconf, service_type, name, state_change):
+        await asyncio.sleep(0.01)
+        applied.append(state_change)
+
+    daemon.handle_service_change = handle_service_change
+    name = "dev1._netaudio-arc._udp.local."
+    for state_change in (ServiceStateChange.Added, ServiceStateChange.Updated, ServiceStateChange.Removed):
+        daemon.on_service_state_change(None, SERVICE_ARC, name, state_change)
+        await asyncio.sleep(0)
+    await asyncio.sleep(0.05)
+
+    # The newest change supersedes the one still waiting behind the first
+    assert applied == [ServiceStateChange.Added, ServiceStateChange.Removed]
+    assert daemon._service_changes == {}
+
+    blocker.set()
+    await daemon.refresh_scheduler.join()
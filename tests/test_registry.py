@@ -0,0 +1,207 @@
+from netaudio.dante.application import DanteApplication
+from netaudio.dante.channel import DanteChannel
+from netaudio.dante.device import DanteDevice
+from netaudio.dante.registry import DanteDeviceRegistry
+
+
+def _channel(device, number, name, volume=None):
+    channel = DanteChannel()
+    channel.device = device
+    channel.number = number
+    channel.name = name
+    channel.volume = volume
+    return channel
+
+
+def _device(server_name="dev1.local.", name="dev1", ip="192.168.1.10", mac="00:1D:C1:AA:BB:CC"):
+    device = DanteDevice(server_name=server_name)
+    device.name = name
+    device.ipv4 = ip
+    device.mac_address = mac
+    return device
+
+
+class TestDanteDeviceRegistry:
+    def test_lookup_by_all_keys(self):
+        device = _device()
+        registry = DanteDeviceRegistry()
+        registry[device.server_name] = device
+
+        assert registry.by_ip("192.168.1.10") is device
+        assert registry.by_mac("00-1d-c1-aa-bb-cc") is device
+        assert registry.by_name("dev1") is device
+        assert registry.by_server_name("dev1.local.") is device
+
+    def test_is_a_dict(self):
+        device = _device()
+        registry = DanteDeviceRegistry({device.server_name: device})
+
+        assert registry == {device.server_name: device}
+        assert list(registry.values()) == [device]
+
+    def test_indexes_follow_attribute_changes(self):
+        device = _device()
+        registry = DanteDeviceRegistry()
+        registry[device.server_name] = device
+
+        device.ipv4 = "192.168.1.20"
+        device.name = "renamed"
+        device.mac_address = "00:1d:c1:00:00:01"
+
+        assert registry.by_ip("192.168.1.10") is None
+        assert registry.by_ip("192.168.1.20") is device
+        assert registry.by_name("dev1") is None
+        assert registry.by_name("renamed") is device
+        assert registry.by_mac("00:1D:C1:AA:BB:CC") is None
+        assert registry.by_mac("001dc1000001") is device
+
+    def test_removal_clears_indexes(self):
+        first = _device()
+        second = _device("dev2.local.", "dev2", "192.168.1.11", "00:1d:c1:00:00:02")
+        registry = DanteDeviceRegistry()
+        registry.update({first.server_name: first, second.server_name: second})
+
+        registry.pop(first.server_name)
+        del registry[second.server_name]
+
+        assert registry.by_ip("192.168.1.10") is None
+        assert registry.by_name("dev2") is None
+        assert first._registry is None
+
+        first.ipv4 = "192.168.1.99"
+        assert registry.by_ip("192.168.1.99") is None
+
+    def test_shared_keys_fall_back_to_the_remaining_device(self):
+        first = _device()
+        second = _device("dev2.local.", "dev1", "192.168.1.10", "00:1d:c1:00:00:02")
+        registry = DanteDeviceRegistry()
+        registry.update({first.server_name: first, second.server_name: second})
+
+        assert registry.by_ip("192.168.1.10") is second
+        del registry[second.server_name]
+        assert registry.by_ip("192.168.1.10") is first
+        assert registry.by_name("dev1") is first
+
+        registry[second.server_name] = second
+        first.ipv4 = "192.168.1.20"
+        assert registry.by_ip("192.168.1.10") is second
+        assert registry.by_ip("192.168.1.20") is first
+
+    def test_replacing_device_reindexes(self):
+        old = _device()
+        new = _device(ip="192.168.1.50")
+        registry = DanteDeviceRegistry()
+        registry[old.server_name] = old
+        registry[new.server_name] = new
+
+        assert registry.by_ip("192.168.1.10") is None
+        assert registry.by_ip("192.168.1.50") is new
+
+    def test_clear(self):
+        device = _device()
+        registry = DanteDeviceRegistry({device.server_name: device})
+        registry.clear()
+
+        assert registry.by_ip("192.168.1.10") is None
+        assert registry.by_name("dev1") is None
+
+
+class TestStateVersions:
+    def test_attribute_changes_bump_device_version(self):
+        device = _device()
+        registry = DanteDeviceRegistry({device.server_name: device})
+        version = registry.version
+
+        device.sample_rate = 48000
+        assert registry.version == version + 1
+        assert registry.device_version(device.server_name) == registry.version
+
+        device.sample_rate = 48000
+        device.last_seen = 123.0
+        assert registry.version == version + 1
+
+    def test_rebuilt_channels_only_bump_when_their_values_change(self):
+        device = _device()
+        registry = DanteDeviceRegistry({device.server_name: device})
+        device.tx_channels = {1: _channel(device, 1, "Left")}
+        version = registry.version
+
+        device.tx_channels = {1: _channel(device, 1, "Left")}
+        device.subscriptions = []
+        assert registry.version == version
+
+        device.tx_channels = {1: _channel(device, 1, "Right")}
+        assert registry.version == version + 1
+
+    def test_in_place_volume_updates_bump_the_channels(self):
+        device = _device()
+        device.tx_count_raw = device.rx_count_raw = 1
+        registry = DanteDeviceRegistry({device.server_name: device})
+        device.tx_channels = {1: _channel(device, 1, "Left", volume=254)}
+        device.rx_channels = {1: _channel(device, 1, "In", volume=254)}
+        registry.take_changed_fields(device.server_name)
+        version = registry.version
+
+        device.parse_volume(bytes([10, 254, 0]))
+
+        assert device.tx_channels[1].volume == 10
+        assert registry.version == version + 1
+        assert registry.take_changed_fields(device.server_name) == {"tx_channels"}
+
+    def test_changed_fields_are_recorded_until_taken(self):
+        device = _device()
+        registry = DanteDeviceRegistry({device.server_name: device})
+
+        device.sample_rate = 48000
+        device.name = "renamed"
+        device.last_seen = 123.0
+
+        assert registry.take_changed_fields(device.server_name) == {"sample_rate", "name"}
+        assert registry.take_changed_fields(device.server_name) == set()
+
+    def test_changes_since(self):
+        first = _device()
+        second = _device("dev2.local.", "dev2", "192.168.1.11", "00:1d:c1:00:00:02")
+        registry = DanteDeviceRegistry({first.server_name: first, second.server_name: second})
+        version = registry.version
+
+        second.latency = 2.0
+        registry.pop(first.server_name)
+
+        assert registry.changes_since(version) == (["dev2.local."], ["dev1.local."])
+        assert registry.changes_since(registry.version) == ([], [])
+
+    def test_detached_device_does_not_bump(self):
+        device = _device()
+        registry = DanteDeviceRegistry({device.server_name: device})
+        registry.pop(device.server_name)
+        version = registry.version
+
+        device.latency = 1.0
+        assert registry.version == version
+
+    def test_unknown_versions_need_full_resync(self, monkeypatch):
+        monkeypatch.setattr("netaudio.dante.registry.REMOVED_HISTORY_LIMIT", 1)
+        registry = DanteDeviceRegistry()
+        for index in range(3):
+            device = _device(f"dev{index}.local.", f"dev{index}", f"192.168.1.{index}", None)
+            registry[device.server_name] = device
+
+        registry.pop("dev0.local.")
+        registry.pop("dev1.local.")
+
+        assert registry.changes_since(0) is None
+        assert registry.changes_since(registry.version + 1) is None
+        assert registry.changes_since(registry.version - 1) == ([], ["dev1.local."])
+
+
+class TestApplicationLookup:
+    def test_device_by_ip_uses_registry(self):
+        application = DanteApplication()
+        device = _device()
+        application.devices[device.server_name] = device
+
+        assert application._device_by_ip("192.168.1.10") is device
+        device.ipv4 = "192.168.1.30"
+        assert application._device_by_ip("192.168.1.30") is device
+        assert application._device_by_ip("192.168.1.10") is None
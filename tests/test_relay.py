@@ -0,0 +1,379 @@
+import asyncio
+import gzip
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from netaudio.daemon.relay import SSE_CLIENT_QUEUE_SIZE, SSE_EVENT_LOG_SIZE, RelayServer, _SSEClient
+from netaudio.dante.channel import DanteChannel
+from netaudio.dante.device import DanteDevice
+from netaudio.dante.registry import DanteDeviceRegistry
+
+
+def _device(index):
+    device = DanteDevice(server_name=f"dev{index}.local.")
+    device.name = f"dev{index}"
+    device.ipv4 = f"10.0.0.{index + 1}"
+    device.online = True
+    for number in range(1, 9):
+        channel = DanteChannel()
+        channel.channel_type = "tx"
+        channel.number = number
+        channel.name = f"tx{number}"
+        device.tx_channels[number] = channel
+    return device
+
+
+def _relay(device_count=10):
+    devices = DanteDeviceRegistry()
+    for index in range(device_count):
+        device = _device(index)
+        devices[device.server_name] = device
+    return RelayServer(SimpleNamespace(devices=devices, shure=None))
+
+
+async def _serve(relay):
+    server = await asyncio.start_server(relay.handle_connection, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    return server, reader, writer
+
+
+async def _read_response(reader):
+    status_line = await reader.readline()
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        key, value = line.decode().split(":", 1)
+        headers[key.strip().lower()] = value.strip()
+
+    body = await reader.readexactly(int(headers.get("content-length", "0")))
+    return int(status_line.split()[1]), headers, body
+
+
+def _get(path, *headers):
+    lines = [f"GET {path} HTTP/1.1", "Host: relay", *headers]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode()
+
+
+class TestRelayHttp:
+    @pytest.mark.asyncio
+    async def test_pipelined_requests_share_one_connection(self):
+        relay = _relay()
+        server, reader, writer = await _serve(relay)
+
+        writer.write(_get("/devices") + _get("/devices/dev3") + _get("/nope"))
+        first = await _read_response(reader)
+        second = await _read_response(reader)
+        third = await _read_response(reader)
+
+        assert first[0] == 200 and len(json.loads(first[2])) == 10
+        assert first[1]["connection"] == "keep-alive"
+        assert json.loads(second[2])["name"] == "dev3"
+        assert third[0] == 404
+
+        writer.close()
+        server.close()
+        await server.wait_closed()
+
+    @pytest.mark.asyncio
+    async def test_connection_close_is_honoured(self):
+        relay = _relay()
+        server, reader, writer = await _serve(relay)
+
+        writer.write(_get("/devices", "Connection: close"))
+        status, headers, _ = await _read_response(reader)
+
+        assert status == 200
+        assert headers["connection"] == "close"
+        assert await reader.read() == b""
+
+        server.close()
+        await server.wait_closed()
+
+    @pytest.mark.asyncio
+    async def test_unchanged_devices_return_not_modified(self):
+        relay = _relay()
+        server, reader, writer = await _serve(relay)
+
+        writer.write(_get("/devices"))
+        _, headers, _ = await _read_response(reader)
+        etag = headers["etag"]
+
+        writer.write(_get("/devices", f"If-None-Match: {etag}"))
+        status, headers, body = await _read_response(reader)
+        assert status == 304
+        assert body == b""
+
+        relay.daemon.devices["dev1.local."].online = False
+        writer.write(_get("/devices", f"If-None-Match: {etag}"))
+        status, headers, body = await _read_response(reader)
+        assert status == 200
+        assert headers["etag"] != etag
+        assert json.loads(body)["dev1.local."]["online"] is False
+
+        writer.close()
+        server.close()
+        await server.wait_closed()
+
+    @pytest.mark.asyncio
+    async def test_device_etag_tracks_that_device_only(self):
+        relay = _relay()
+        server, reader, writer = await _serve(relay)
+
+        writer.write(_get("/devices/dev1"))
+        _, headers, _ = await _read_response(reader)
+        etag = headers["etag"]
+
+        relay.daemon.devices["dev2.local."].online = False
+        writer.write(_get("/devices/dev1", f"If-None-Match: {etag}"))
+        status, _, _ = await _read_response(reader)
+        assert status == 304
+
+        writer.close()
+        server.close()
+        await server.wait_closed()
+
+    @pytest.mark.asyncio
+    async def test_large_bodies_are_gzipped_when_accepted(self):
+        relay = _relay()
+        server, reader, writer = await _serve(relay)
+
+        writer.write(_get("/devices", "Accept-Encoding: gzip, deflate"))
+        _, headers, body = await _read_response(reader)
+        writer.write(_get("/devices"))
+        _, plain_headers, plain_body = await _read_response(reader)
+
+        assert headers["content-encoding"] == "gzip"
+        assert gzip.decompress(body) == plain_body
+        assert len(body) < len(plain_body)
+        assert "content-encoding" not in plain_headers
+
+        writer.close()
+        server.close()
+        await server.wait_closed()
+
+
+class StalledWriter:
+    def __init__(self):
+        self.chunks = []
+        self.unblocked = asyncio.Event()
+
+    def write(self, data):
+        self.chunks.append(data)
+
+    async def drain(self):
+        await self.unblocked.wait()
+
+    def get_extra_info(self, name):
+        return ("10.0.0.99", 5000)
+
+    def frames(self):
+        return [_frame(frame)[1] for frame in b"".join(self.chunks).decode().split("\n\n") if frame]
+
+
+def _frame(raw):
+    fields = dict(line.split(": ", 1) for line in (raw.decode() if isinstance(raw, bytes) else raw).strip().split("\n"))
+    return fields.get("id"), json.loads(fields["data"])
+
+
+def _sse_client(relay, writer, max_queue=SSE_CLIENT_QUEUE_SIZE):
+    client = _SSEClient(writer, relay._sse_snapshot, max_queue)
+    client.task = asyncio.create_task(client.run())
+    relay.sse_clients.append(client)
+    return client
+
+
+def _meter(server_name, level):
+    return {"event": "meter_values", "server_name": server_name, "tx": {"1": level}, "rx": {}}
+
+
+class TestRelaySSE:
+    @pytest.mark.asyncio
+    async def test_stalled_client_does_not_hold_up_the_others(self):
+        relay = _relay(2)
+        stalled, healthy = StalledWriter(), StalledWriter()
+        healthy.unblocked.set()
+        stalled_client = _sse_client(relay, stalled)
+        _sse_client(relay, healthy)
+        await asyncio.sleep(0)
+
+        for index in range(5):
+            await asyncio.wait_for(relay._broadcast_sse({"event": "subscription_pending", "index": index}), 0.1)
+        await asyncio.sleep(0)
+
+        assert [frame["event"] for frame in healthy.frames()] == ["snapshot"] + ["subscription_pending"] * 5
+        assert [frame["event"] for frame in stalled.frames()] == ["snapshot"]
+        assert stalled_client.stats()["depth"] == 5
+
+        for client in relay.sse_clients:
+            client.task.cancel()
+
+    @pytest.mark.asyncio
+    async def test_meter_frames_coalesce_while_a_client_is_behind(self):
+        relay = _relay(2)
+        writer = StalledWriter()
+        client = _sse_client(relay, writer)
+        await asyncio.sleep(0)
+
+        for level in range(10):
+            await relay._broadcast_sse(_meter("dev0.local.", level))
+            await relay._broadcast_sse(_meter("dev1.local.", level))
+        await relay._broadcast_sse({"event": "device_removed", "server_name": "dev1.local."})
+        writer.unblocked.set()
+        await asyncio.sleep(0.01)
+
+        frames = writer.frames()[1:]
+        assert [(frame["event"], frame.get("tx")) for frame in frames] == [
+            ("meter_values", {"1": 9}),
+            ("meter_values", {"1": 9}),
+            ("device_removed", None),
+        ]
+        assert client.coalesced == 18
+        client.task.cancel()
+
+    @pytest.mark.asyncio
+    async def test_overflow_drops_the_backlog_for_a_fresh_snapshot(self):
+        relay = _relay(2)
+        writer = StalledWriter()
+        client = _sse_client(relay, writer, max_queue=4)
+        await asyncio.sleep(0)
+
+        for index in range(10):
+            await relay._broadcast_sse({"event": "subscription_pending", "index": index})
+        relay.daemon.devices["dev1.local."].online = False
+        writer.unblocked.set()
+        await asyncio.sleep(0.01)
+
+        frames = writer.frames()
+        assert [frame["event"] for frame in frames] == ["snapshot", "snapshot"]
+        assert frames[1]["devices"]["dev1.local."]["online"] is False
+        assert client.resyncs == 1
+
+        await relay._broadcast_sse({"event": "subscription_pending", "index": 10})
+        await asyncio.sleep(0.01)
+        assert writer.frames()[-1]["index"] == 10
+        client.task.cancel()
+
+    @pytest.mark.asyncio
+    async def test_events_stream_over_a_socket(self):
+        relay = _relay(2)
+        server, reader, writer = await _serve(relay)
+
+        writer.write(_get("/events"))
+        status, headers, _ = await _read_response(reader)
+        _, snapshot = _frame(await reader.readuntil(b"\n\n"))
+        await relay._broadcast_sse(_meter("dev0.local.", 3))
+        _, meter = _frame(await reader.readuntil(b"\n\n"))
+
+        assert status == 200 and headers["content-type"] == "text/event-stream"
+        assert sorted(snapshot["devices"]) == ["dev0.local.", "dev1.local."]
+        assert meter["tx"] == {"1": 3}
+
+        writer.close()
+        await asyncio.sleep(0.01)
+        assert relay.sse_clients == []
+        server.close()
+        await server.wait_closed()
+
+
+def _events_request(last_event_id=None):
+    if last_event_id is None:
+        return _get("/events")
+    return _get("/events", f"Last-Event-ID: {last_event_id}")
+
+
+async def _open_events(relay, last_event_id=None):
+    server, reader, writer = await _serve(relay)
+    writer.write(_events_request(last_event_id))
+    await _read_response(reader)
+    return server, reader, writer
+
+
+async def _close(server, writer):
+    writer.close()
+    await asyncio.sleep(0.01)
+    server.close()
+    await server.wait_closed()
+
+
+class TestRelaySSEDeltas:
+    @pytest.mark.asyncio
+    async def test_device_updates_send_only_changed_fields(self):
+        relay = _relay(2)
+        device = relay.daemon.devices["dev0.local."]
+        writer = StalledWriter()
+        writer.unblocked.set()
+        client = _sse_client(relay, writer)
+        await asyncio.sleep(0)
+
+        await relay._broadcast_device(device, "device_updated")
+        device.online = False
+        await relay._broadcast_device(device, "device_updated")
+        await relay._broadcast_device(device, "device_updated")
+        await asyncio.sleep(0.01)
+
+        frames = writer.frames()
+        assert [frame["event"] for frame in frames] == ["snapshot", "device_updated", "device_updated"]
+        assert frames[1]["device"]["name"] == "dev0"
+        assert frames[2]["changes"] == {"online": False}
+        client.task.cancel()
+
+    @pytest.mark.asyncio
+    async def test_snapshot_is_reused_until_state_changes(self):
+        relay = _relay(3)
+
+        first = relay._sse_snapshot()
+        assert relay._sse_snapshot() is first
+
+        relay.daemon.devices["dev2.local."].online = False
+        second = relay._sse_snapshot()
+        event_id, snapshot = _frame(second)
+
+        assert second is not first
+        assert event_id == f"{relay._sse_epoch}:0"
+        assert snapshot["devices"]["dev2.local."]["online"] is False
+        assert sorted(snapshot["devices"]) == ["dev0.local.", "dev1.local.", "dev2.local."]
+
+    @pytest.mark.asyncio
+    async def test_reconnect_replays_only_missed_events(self):
+        relay = _relay(2)
+        server, reader, writer = await _open_events(relay)
+        snapshot_id, _ = _frame(await reader.readuntil(b"\n\n"))
+        await relay._broadcast_sse({"event": "device_removed", "server_name": "dev0.local."})
+        seen_id, _ = _frame(await reader.readuntil(b"\n\n"))
+        await _close(server, writer)
+
+        await relay._broadcast_sse({"event": "device_removed", "server_name": "dev1.local."})
+        await relay._broadcast_sse(_meter("dev1.local.", 1))
+
+        server, reader, writer = await _open_events(relay, seen_id)
+        event_id, missed = _frame(await reader.readuntil(b"\n\n"))
+        await relay._broadcast_sse({"event": "subscription_pending"})
+        _, live = _frame(await reader.readuntil(b"\n\n"))
+        await _close(server, writer)
+
+        assert snapshot_id == f"{relay._sse_epoch}:0"
+        assert seen_id == f"{relay._sse_epoch}:1"
+        assert (event_id, missed["server_name"]) == (f"{relay._sse_epoch}:2", "dev1.local.")
+        assert live["event"] == "subscription_pending"
+
+    @pytest.mark.asyncio
+    async def test_unknown_or_expired_ids_get_a_snapshot(self):
+        relay = _relay(2)
+        for _ in range(SSE_EVENT_LOG_SIZE + 5):
+            await relay._broadcast_sse({"event": "subscription_pending"})
+
+        assert relay._sse_replay(f"{relay._sse_epoch}:2") is None
+        assert relay._sse_replay("other:5") is None
+        assert relay._sse_replay(f"{relay._sse_epoch}:{relay._sse_sequence + 1}") is None
+        assert relay._sse_replay(f"{relay._sse_epoch}:{relay._sse_sequence}") == []
+
+        server, reader, writer = await _open_events(relay, "other:5")
+        _, first = _frame(await reader.readuntil(b"\n\n"))
+        await _close(server, writer)
+
+        assert first["event"] == "snapshot"
@@ -0,0 +1,163 @@
+import asyncio
+
+import pytest
+
+from netaudio.daemon.response_cache import DanteResponseCache
+from netaudio.daemon.server import NetaudioDaemon
+from netaudio.dante.application import DanteApplication
+from netaudio.dante.device import DanteDevice
+from netaudio.dante.events import DanteEvent, EventType
+from netaudio.dante.services import DanteARCService
+from netaudio.dante.services.notification import (
+    NOTIFICATION_DEVICE_REBOOT,
+    NOTIFICATION_RX_CHANNEL_CHANGE,
+    NOTIFICATION_TX_CHANNEL_CHANGE,
+)
+
+from tests.test_service import SlowProtocol
+
+DEVICE_IP = "192.168.1.10"
+NAME_QUERY = b"\x27\xff\x00\x0a\x00\x00\x10\x02\x00\x00"
+NAME_SET = b"\x27\xff\x00\x0e\x00\x00\x10\x01\x00\x00new\x00"
+TX_NAMES_PAGE_1 = b"\x27\xff\x00\x10\x00\x00\x20\x10\x00\x00\x00\x01\x00\x01\x00\x00"
+TX_NAMES_PAGE_2 = b"\x27\xff\x00\x10\x00\x00\x20\x10\x00\x00\x00\x01\x00\x11\x00\x00"
+RX_CHANNELS = b"\x27\xff\x00\x10\x00\x00\x30\x00\x00\x00\x00\x01\x00\x01\x00\x00"
+
+
+def _key(packet, device_ip=DEVICE_IP):
+    return (device_ip, 4440, packet[:4] + b"\x00\x00" + packet[6:])
+
+
+def _cached_service():
+    service = DanteARCService()
+    service._protocol = SlowProtocol()
+    service.response_cache = DanteResponseCache()
+    return service
+
+
+class TestDanteResponseCache:
+    def test_notification_invalidates_only_matching_opcodes(self):
+        cache = DanteResponseCache()
+        for packet in (TX_NAMES_PAGE_1, TX_NAMES_PAGE_2, RX_CHANNELS, NAME_QUERY):
+            cache.store(_key(packet), packet, cache.generation(DEVICE_IP))
+
+        assert cache.invalidate_for_notification(DEVICE_IP, NOTIFICATION_TX_CHANNEL_CHANGE) == 2
+
+        assert cache.get(_key(TX_NAMES_PAGE_1)) is None
+        assert cache.get(_key(TX_NAMES_PAGE_2)) is None
+        assert cache.get(_key(RX_CHANNELS)) == RX_CHANNELS
+        assert cache.get(_key(NAME_QUERY)) == NAME_QUERY
+
+    def test_device_wide_notifications_drop_everything(self):
+        cache = DanteResponseCache()
+        cache.store(_key(NAME_QUERY), NAME_QUERY, 0)
+        cache.store(_key(NAME_QUERY, "192.168.1.11"), NAME_QUERY, 0)
+
+        assert cache.invalidate_for_notification(DEVICE_IP, NOTIFICATION_DEVICE_REBOOT) == 1
+        assert cache.get(_key(NAME_QUERY)) is None
+        assert cache.get(_key(NAME_QUERY, "192.168.1.11")) == NAME_QUERY
+
+    def test_reads_started_before_invalidation_are_not_stored(self):
+        cache = DanteResponseCache()
+        generation = cache.generation(DEVICE_IP)
+
+        cache.invalidate_for_notification(DEVICE_IP, NOTIFICATION_RX_CHANNEL_CHANGE)
+        cache.store(_key(RX_CHANNELS), RX_CHANNELS, generation)
+
+        assert cache.get(_key(RX_CHANNELS)) is None
+
+    def test_entries_expire(self, monkeypatch):
+        cache = DanteResponseCache(ttl=10.0)
+        monkeypatch.setattr("netaudio.daemon.response_cache.time.monotonic", lambda: 100.0)
+        cache.store(_key(NAME_QUERY), NAME_QUERY, 0)
+
+        monkeypatch.setattr("netaudio.daemon.response_cache.time.monotonic", lambda: 111.0)
+        assert cache.get(_key(NAME_QUERY)) is None
+
+
+class TestCachedService:
+    @pytest.mark.asyncio
+    async def test_repeated_reads_are_answered_from_cache(self):
+        service = _cached_service()
+
+        first = await service.request(NAME_QUERY, DEVICE_IP, 4440)
+        second = await service.request(NAME_QUERY[:4] + b"\x12\x34" + NAME_QUERY[6:], DEVICE_IP, 4440)
+
+        assert len(service._protocol.sent) == 1
+        assert second[4:6] == b"\x12\x34"
+        assert second[6:] == first[6:]
+        assert service.response_cache.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_writes_are_never_cached(self):
+        service = _cached_service()
+
+        await service.request(NAME_SET, DEVICE_IP, 4440)
+        await service.request(NAME_SET, DEVICE_IP, 4440)
+
+        assert len(service._protocol.sent) == 2
+        assert len(service.response_cache) == 0
+
+
+def _daemon():
+    daemon = object.__new__(NetaudioDaemon)
+    daemon.application = DanteApplication()
+    daemon.application.arc._protocol = SlowProtocol()
+    daemon.response_cache = DanteResponseCache()
+    daemon.application.arc.response_cache = daemon.response_cache
+
+    device = DanteDevice(server_name="dev1.local.")
+    device.ipv4 = DEVICE_IP
+    daemon.application.devices[device.server_name] = device
+    return daemon
+
+
+class TestDaemonResponseCache:
+    @pytest.mark.asyncio
+    async def test_proxied_reads_skip_the_network(self):
+        daemon = _daemon()
+        sent = daemon.application.arc._protocol.sent
+
+        await daemon._proxy_device_request(TX_NAMES_PAGE_1, DEVICE_IP, 4440)
+        await daemon._proxy_device_request(TX_NAMES_PAGE_1, DEVICE_IP, 4440)
+        assert len(sent) == 1
+
+        await daemon._proxy_device_request(TX_NAMES_PAGE_2, DEVICE_IP, 4440)
+        assert len(sent) == 2
+
+    @pytest.mark.asyncio
+    async def test_proxied_writes_invalidate_the_device(self):
+        daemon = _daemon()
+        sent = daemon.application.arc._protocol.sent
+
+        await daemon._proxy_device_request(NAME_QUERY, DEVICE_IP, 4440)
+        await daemon._proxy_device_request(NAME_SET, DEVICE_IP, 4440)
+        await daemon._proxy_device_request(NAME_QUERY, DEVICE_IP, 4440)
+
+        assert len(sent) == 3
+
+    @pytest.mark.asyncio
+    async def test_notifications_invalidate_before_handlers_refetch(self):
+        daemon = _daemon()
+        sent = daemon.application.arc._protocol.sent
+        refetched = []
+
+        async def refetch(event):
+            refetched.append(await daemon.application.arc.request(RX_CHANNELS, DEVICE_IP, 4440))
+
+        daemon._register_event_listeners()
+        daemon.application.on_notification(NOTIFICATION_RX_CHANNEL_CHANGE, refetch)
+
+        await daemon._proxy_device_request(RX_CHANNELS, DEVICE_IP, 4440)
+        await daemon._proxy_device_request(TX_NAMES_PAGE_1, DEVICE_IP, 4440)
+
+        event = DanteEvent(
+            type=EventType.NOTIFICATION_RECEIVED,
+            server_name="dev1.local.",
+            data={"notification_id": NOTIFICATION_RX_CHANNEL_CHANGE},
+        )
+        await daemon.application._dispatch_notification(event)
+        await daemon._proxy_device_request(TX_NAMES_PAGE_1, DEVICE_IP, 4440)
+
+        assert [packet[6:8] for packet, _, _ in sent] == [b"\x30\x00", b"\x20\x10", b"\x30\x00"]
+        assert refetched and refetched[0] is not None
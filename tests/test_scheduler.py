@@ -0,0 +1,172 @@
+import asyncio
+
+import pytest
+
+from netaudio.daemon.scheduler import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_NOTIFICATION,
+    PRIORITY_USER,
+    RefreshScheduler,
+)
+
+
+class Recorder:
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.order = []
+        self.active = 0
+        self.peak = 0
+
+    def job(self, name):
+        async def run():
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.order.append(name)
+            await asyncio.sleep(self.delay)
+            self.active -= 1
+
+        return run
+
+
+class TestRefreshScheduler:
+    @pytest.mark.asyncio
+    async def test_concurrency_is_capped(self):
+        scheduler = RefreshScheduler(concurrency=3, jitter=0)
+        recorder = Recorder()
+
+        for index in range(20):
+            scheduler.schedule(f"dev{index}", recorder.job(index), PRIORITY_NOTIFICATION)
+        await scheduler.join()
+
+        assert recorder.peak == 3
+        assert len(recorder.order) == 20
+        assert scheduler.completed == 20
+
+    @pytest.mark.asyncio
+    async def test_higher_priority_runs_first(self):
+        scheduler = RefreshScheduler(concurrency=1, jitter=0)
+        recorder = Recorder()
+
+        scheduler.schedule("busy", recorder.job("busy"), PRIORITY_USER)
+        scheduler.schedule("background", recorder.job("background"), PRIORITY_BACKGROUND)
+        scheduler.schedule("notification", recorder.job("notification"), PRIORITY_NOTIFICATION)
+        scheduler.schedule("user", recorder.job("user"), PRIORITY_USER)
+        await asyncio.sleep(0.001)
+        await scheduler.join()
+
+        assert recorder.order == ["busy", "user", "notification", "background"]
+
+    @pytest.mark.asyncio
+    async def test_queued_duplicates_collapse_and_promote(self):
+        scheduler = RefreshScheduler(concurrency=1, jitter=0)
+        recorder = Recorder()
+
+        scheduler.schedule("busy", recorder.job("busy"), PRIORITY_USER)
+        scheduler.schedule("other", recorder.job("other"), PRIORITY_NOTIFICATION)
+        first = scheduler.schedule("dev", recorder.job("old"), PRIORITY_BACKGROUND)
+        second = scheduler.schedule("dev", recorder.job("new"), PRIORITY_USER)
+        await scheduler.join()
+
+        assert first is second
+        assert recorder.order == ["busy", "new", "other"]
+
+    @pytest.mark.asyncio
+    async def test_jobs_for_one_key_never_overlap(self):
+        scheduler = RefreshScheduler(concurrency=4, jitter=0)
+        recorder = Recorder()
+
+        scheduler.schedule("dev", recorder.job("first"), PRIORITY_NOTIFICATION)
+        await asyncio.sleep(0)
+        queued = scheduler.schedule("dev", recorder.job("second"), PRIORITY_NOTIFICATION)
+        newest = scheduler.schedule("dev", recorder.job("newest"), PRIORITY_BACKGROUND)
+        await scheduler.join()
+
+        assert queued is newest
+        assert recorder.peak == 1
+        assert recorder.order == ["first", "newest"]
+
+    @pytest.mark.asyncio
+    async def test_background_work_queues_behind_a_running_job(self):
+        scheduler = RefreshScheduler(concurrency=4, jitter=0)
+        recorder = Recorder()
+
+        running = scheduler.schedule(("mdns", "arc", "dev"), recorder.job("added"), PRIORITY_BACKGROUND)
+        await asyncio.sleep(0)
+        queued = scheduler.schedule(("mdns", "arc", "dev"), recorder.job("removed"), PRIORITY_BACKGROUND)
+        await scheduler.join()
+
+        assert queued is not running
+        assert recorder.peak == 1
+        assert recorder.order == ["added", "removed"]
+
+    @pytest.mark.asyncio
+    async def test_jobs_in_one_group_never_overlap(self):
+        scheduler = RefreshScheduler(concurrency=4, jitter=0)
+        recorder = Recorder()
+
+        scheduler.schedule(("dev", "controls"), recorder.job("controls"), PRIORITY_NOTIFICATION, group="dev")
+        scheduler.schedule(("dev", "subscriptions"), recorder.job("subscriptions"), PRIORITY_NOTIFICATION, group="dev")
+        scheduler.schedule(("other", "controls"), recorder.job("other"), PRIORITY_NOTIFICATION, group="other")
+        await scheduler.join()
+
+        assert recorder.peak == 2
+        assert recorder.order == ["controls", "other", "subscriptions"]
+
+    @pytest.mark.asyncio
+    async def test_a_full_job_absorbs_the_narrower_jobs_of_its_group(self):
+        scheduler = RefreshScheduler(concurrency=1, jitter=0)
+        recorder = Recorder()
+
+        scheduler.schedule("busy", recorder.job("busy"), PRIORITY_USER)
+        pages = scheduler.schedule(("dev", "pages"), recorder.job("pages"), PRIORITY_NOTIFICATION, group="dev")
+        controls = scheduler.schedule(
+            ("dev", "controls"), recorder.job("controls"), PRIORITY_BACKGROUND, group="dev", full=True
+        )
+        later = scheduler.schedule(("dev", "subscriptions"), recorder.job("subscriptions"), PRIORITY_USER, group="dev")
+        await scheduler.join()
+
+        assert later is controls
+        assert pages.done()
+        assert recorder.order == ["busy", "controls"]
+
+    @pytest.mark.asyncio
+    async def test_background_work_is_jittered(self):
+        scheduler = RefreshScheduler(concurrency=4, jitter=0.05)
+        recorder = Recorder(delay=0)
+
+        scheduler.schedule("dev", recorder.job("background"), PRIORITY_BACKGROUND)
+        assert scheduler.stats()["delayed"] == 1
+        assert recorder.order == []
+
+        await scheduler.schedule("user", recorder.job("user"), PRIORITY_USER)
+        await scheduler.join()
+
+        assert recorder.order == ["user", "background"]
+
+    @pytest.mark.asyncio
+    async def test_stats_report_depth_and_wait(self):
+        scheduler = RefreshScheduler(concurrency=1, jitter=0)
+        recorder = Recorder()
+
+        for index in range(3):
+            scheduler.schedule(index, recorder.job(index), PRIORITY_NOTIFICATION)
+
+        stats = scheduler.stats()
+        assert stats["running"] == 1
+        assert stats["queued"] == 2
+
+        await scheduler.join()
+        wait = scheduler.stats()["wait"]["notification"]
+        assert wait["count"] == 3
+        assert wait["max"] >= 0.015
+
+    @pytest.mark.asyncio
+    async def test_failures_are_counted(self):
+        scheduler = RefreshScheduler(jitter=0)
+
+        async def fail():
+            raise RuntimeError("boom")
+
+        await scheduler.schedule("dev", fail, PRIORITY_USER)
+
+        assert scheduler.failed == 1
@@ -4,6 +4,28 @@ import struct
 import pytest
 
 from netaudio.dante.service import DanteMulticastService, DanteUnicastService
+from netaudio.dante.services import DanteARCService, DanteCMCService, DanteSettingsService
+from netaudio.dante.transport import RETRANSMIT_LIMIT
+
+
+class SlowProtocol:
+    def __init__(self):
+        self.transport = None
+        self.active = 0
+        self.peak = 0
+        self.sent = []
+        self.retransmits = []
+
+    async def send_and_expect(
+        self, data, remote_addr, transaction_id, timeout=None, logical_command_name="", retransmits=2
+    ):
+        self.sent.append((data, remote_addr, transaction_id))
+        self.retransmits.append(retransmits)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return data
 
 
 class TestUnicastService:
@@ -53,6 +75,141 @@ class TestUnicastService:
         assert service._protocol is None
 
 
+class TestTransactionIdSpace:
+    ARC_PACKET = b'\x27\xFF\x00\x0A\x00\x00\x30\x10\x00\x00'
+    SETTINGS_PACKET = b'\xFF\xFF\x00\x0C\x03\xD4\x00\x00\x00\x00\x00\x00'
+
+    def test_per_device_sequences(self):
+        service = DanteUnicastService()
+        assert service._next_transaction_id("192.168.1.1") == 1
+        assert service._next_transaction_id("192.168.1.1") == 2
+        assert service._next_transaction_id("192.168.1.2") == 1
+        assert service._transaction_counter == 0
+
+    def test_arc_packets_are_stamped(self):
+        service = DanteARCService()
+        first = service._stamp_transaction_id(self.ARC_PACKET, "192.168.1.1")
+        second = service._stamp_transaction_id(self.ARC_PACKET, "192.168.1.1")
+        assert DanteUnicastService._extract_transaction_id(first) == 1
+        assert DanteUnicastService._extract_transaction_id(second) == 2
+        assert first[6:] == self.ARC_PACKET[6:]
+
+    def test_settings_packets_are_not_stamped(self):
+        service = DanteSettingsService()
+        assert service._stamp_transaction_id(self.SETTINGS_PACKET, "192.168.1.1") == self.SETTINGS_PACKET
+
+
+class TestInFlightWindow:
+    ARC_PACKET = TestTransactionIdSpace.ARC_PACKET
+
+    def test_per_service_defaults(self):
+        assert DanteSettingsService().max_in_flight == 1
+        assert DanteARCService(max_in_flight=8).max_in_flight == 8
+
+    @pytest.mark.asyncio
+    async def test_window_bounds_concurrency_per_device(self):
+        service = DanteARCService(max_in_flight=2)
+        service._protocol = SlowProtocol()
+
+        await asyncio.gather(*[service.request(self.ARC_PACKET, "192.168.1.1", 4440) for _ in range(6)])
+
+        assert service._protocol.peak == 2
+        assert service.in_flight("192.168.1.1") == 0
+        transaction_ids = [transaction_id for _, _, transaction_id in service._protocol.sent]
+        assert sorted(transaction_ids) == [1, 2, 3, 4, 5, 6]
+
+    @pytest.mark.asyncio
+    async def test_devices_have_independent_windows(self):
+        service = DanteARCService(max_in_flight=1)
+        service._protocol = SlowProtocol()
+
+        await asyncio.gather(
+            service.request(self.ARC_PACKET, "192.168.1.1", 4440),
+            service.request(self.ARC_PACKET, "192.168.1.2", 4440),
+        )
+
+        assert service._protocol.peak == 2
+
+
+class TestRequestCoalescing:
+    NAME_QUERY = b'\x27\xFF\x00\x0A\x00\x00\x10\x02\x00\x00'
+    NAME_SET = b'\x27\xFF\x00\x0E\x00\x00\x10\x01\x00\x00new\x00'
+
+    @pytest.mark.asyncio
+    async def test_identical_reads_share_one_request(self):
+        service = DanteARCService()
+        service._protocol = SlowProtocol()
+
+        responses = await asyncio.gather(*[service.request(self.NAME_QUERY, "192.168.1.1", 4440) for _ in range(5)])
+
+        assert len(service._protocol.sent) == 1
+        assert all(response == responses[0] for response in responses)
+        assert service._coalesced == {}
+
+    @pytest.mark.asyncio
+    async def test_reads_differing_only_in_transaction_id_coalesce(self):
+        service = DanteARCService()
+        service._protocol = SlowProtocol()
+        other = self.NAME_QUERY[:4] + b'\x12\x34' + self.NAME_QUERY[6:]
+
+        await asyncio.gather(
+            service.request(self.NAME_QUERY, "192.168.1.1", 4440),
+            service.request(other, "192.168.1.1", 4440),
+        )
+
+        assert len(service._protocol.sent) == 1
+
+    @pytest.mark.asyncio
+    async def test_reads_to_different_devices_are_not_coalesced(self):
+        service = DanteARCService()
+        service._protocol = SlowProtocol()
+
+        await asyncio.gather(
+            service.request(self.NAME_QUERY, "192.168.1.1", 4440),
+            service.request(self.NAME_QUERY, "192.168.1.2", 4440),
+        )
+
+        assert len(service._protocol.sent) == 2
+
+    @pytest.mark.asyncio
+    async def test_mutating_requests_bypass_coalescing(self):
+        service = DanteARCService()
+        service._protocol = SlowProtocol()
+
+        await asyncio.gather(*[service.request(self.NAME_SET, "192.168.1.1", 4440) for _ in range(3)])
+
+        assert len(service._protocol.sent) == 3
+
+    @pytest.mark.asyncio
+    async def test_only_reads_are_retransmitted(self):
+        service = DanteARCService()
+        service._protocol = SlowProtocol()
+
+        await service.request(self.NAME_QUERY, "192.168.1.1", 4440)
+        await service.request(self.NAME_SET, "192.168.1.1", 4440)
+
+        assert service._protocol.retransmits == [RETRANSMIT_LIMIT, 0]
+
+    @pytest.mark.asyncio
+    async def test_cmc_registration_is_retransmitted(self):
+        service = DanteCMCService()
+        service._protocol = SlowProtocol()
+
+        await service.register_device("192.168.1.1")
+
+        assert service._protocol.retransmits == [RETRANSMIT_LIMIT]
+
+    @pytest.mark.asyncio
+    async def test_sequential_reads_are_sent_again(self):
+        service = DanteARCService()
+        service._protocol = SlowProtocol()
+
+        await service.request(self.NAME_QUERY, "192.168.1.1", 4440)
+        await service.request(self.NAME_QUERY, "192.168.1.1", 4440)
+
+        assert len(service._protocol.sent) == 2
+
+
 class TestMulticastService:
     def test_initial_state(self):
         service = DanteMulticastService("224.0.0.231", 8702)
@@ -1,3 +1,6 @@
+import asyncio
+from types import SimpleNamespace
+
 import pytest
 
 from netaudio.dante.services.arc import DanteARCService
@@ -33,6 +36,98 @@ class TestDanteARCService:
         assert result is None
 
 
+def _control_device():
+    return SimpleNamespace(
+        ipv4="192.168.1.1",
+        name=None,
+        server_name="dev._netaudio-arc._udp.local.",
+        aes67_configured=None,
+        tx_count=None,
+        rx_count=None,
+        tx_count_raw=None,
+        rx_count_raw=None,
+        is_locked=None,
+        tx_channels={},
+        rx_channels={},
+        subscriptions=[],
+        error="stale",
+    )
+
+
+class TestGetControls:
+    @pytest.mark.asyncio
+    async def test_phases_run_concurrently(self):
+        service = DanteARCService()
+        device = _control_device()
+        active = 0
+        peaks = {}
+
+        async def step(label, phase, result):
+            nonlocal active
+            active += 1
+            peaks[phase] = max(peaks.get(phase, 0), active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return result
+
+        service.get_device_name = lambda ip, port: step("name", 1, "dev")
+        service.get_channel_count = lambda ip, port: step("counts", 1, (2, 4, True))
+        service.get_aes67_configured = lambda ip, port: step("aes67", 1, False)
+        service.get_tx_channels = lambda dev, port: step("tx", 2, {1: "tx1"})
+        service.get_rx_channels = lambda dev, port: step("rx", 2, ({1: "rx1"}, ["sub"]))
+
+        await service.get_controls(device, 4440)
+
+        assert peaks == {1: 3, 2: 2}
+        assert device.name == "dev"
+        assert (device.tx_count, device.rx_count, device.is_locked) == (2, 4, True)
+        assert device.aes67_configured is False
+        assert device.tx_channels == {1: "tx1"}
+        assert device.rx_channels == {1: "rx1"}
+        assert device.subscriptions == ["sub"]
+        assert device.error is None
+
+    @pytest.mark.asyncio
+    async def test_channel_count_error_is_recorded(self):
+        service = DanteARCService()
+        device = _control_device()
+        error = RuntimeError("boom")
+
+        async def fail(ip, port):
+            raise error
+
+        async def none(*args):
+            return None
+
+        service.get_device_name = none
+        service.get_channel_count = fail
+        service.get_aes67_configured = none
+
+        await service.get_controls(device, 4440)
+
+        assert device.error is error
+
+    @pytest.mark.asyncio
+    async def test_aes67_error_is_not_fatal(self):
+        service = DanteARCService()
+        device = _control_device()
+        device.name = "dev"
+
+        async def fail(ip, port):
+            raise RuntimeError("aes67")
+
+        async def counts(ip, port):
+            return (0, 0, None)
+
+        service.get_channel_count = counts
+        service.get_aes67_configured = fail
+
+        await service.get_controls(device, 4440)
+
+        assert device.error is None
+        assert device.tx_count == 0
+
+
 class TestDanteSettingsService:
     def test_instantiation(self):
         service = DanteSettingsService()
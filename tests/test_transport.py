@@ -3,7 +3,29 @@ import struct
 
 import pytest
 
-from netaudio.dante.transport import DanteMulticastProtocol, DanteUnicastProtocol
+from netaudio.dante.transport import (
+    RTO_INITIAL,
+    RTO_MAX,
+    RTO_MIN,
+    DanteMulticastProtocol,
+    DanteUnicastProtocol,
+    RoundTripEstimator,
+)
+
+
+class FakeTransport:
+    def __init__(self, protocol=None, reply_on_attempt=None):
+        self.sent = []
+        self._protocol = protocol
+        self._reply_on_attempt = reply_on_attempt
+
+    def sendto(self, data, addr):
+        self.sent.append((data, addr))
+        if self._reply_on_attempt is not None and len(self.sent) == self._reply_on_attempt:
+            asyncio.get_running_loop().call_soon(self._protocol.datagram_received, data, addr)
+
+    def close(self):
+        pass
 
 
 class TestUnicastProtocol:
@@ -72,6 +94,111 @@ class TestUnicastProtocol:
         protocol.close()
 
 
+class TestRoundTripEstimator:
+    def test_initial_rto(self):
+        assert RoundTripEstimator().rto == RTO_INITIAL
+
+    def test_first_sample(self):
+        estimator = RoundTripEstimator()
+        estimator.observe(0.2)
+        assert estimator.srtt == pytest.approx(0.2)
+        assert estimator.rttvar == pytest.approx(0.1)
+        assert estimator.rto == pytest.approx(0.6)
+
+    def test_smoothing(self):
+        estimator = RoundTripEstimator()
+        estimator.observe(0.2)
+        estimator.observe(0.4)
+        assert estimator.rttvar == pytest.approx(0.75 * 0.1 + 0.25 * 0.2)
+        assert estimator.srtt == pytest.approx(0.875 * 0.2 + 0.125 * 0.4)
+        assert estimator.samples == 2
+
+    def test_rto_clamped(self):
+        fast = RoundTripEstimator()
+        fast.observe(0.001)
+        assert fast.rto == RTO_MIN
+
+        slow = RoundTripEstimator()
+        slow.observe(5.0)
+        assert slow.rto == RTO_MAX
+
+
+class TestSendAndExpect:
+    PACKET = b'\x27\xFF\x00\x0A' + struct.pack(">H", 0x0042) + b'\x10\x00'
+    ADDR = ("192.168.1.1", 4440)
+
+    @pytest.mark.asyncio
+    async def test_reply_updates_estimator(self):
+        protocol = DanteUnicastProtocol()
+        protocol.transport = FakeTransport(protocol, reply_on_attempt=1)
+
+        response = await protocol.send_and_expect(self.PACKET, self.ADDR, 0x0042)
+
+        assert response == self.PACKET
+        assert len(protocol.transport.sent) == 1
+        assert protocol.estimator(self.ADDR).samples == 1
+        assert protocol._pending == {}
+
+    @pytest.mark.asyncio
+    async def test_retransmits_after_loss(self):
+        protocol = DanteUnicastProtocol()
+        protocol.transport = FakeTransport(protocol, reply_on_attempt=2)
+        protocol.estimator(self.ADDR).observe(0.001)
+
+        response = await protocol.send_and_expect(self.PACKET, self.ADDR, 0x0042)
+
+        assert response == self.PACKET
+        assert len(protocol.transport.sent) == 2
+        # Replies to retransmissions are ambiguous and must not be sampled
+        assert protocol.estimator(self.ADDR).samples == 1
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_retransmits(self):
+        protocol = DanteUnicastProtocol()
+        protocol.transport = FakeTransport()
+        protocol.estimator(self.ADDR).observe(0.001)
+
+        response = await protocol.send_and_expect(self.PACKET, self.ADDR, 0x0042, retransmits=2)
+
+        assert response is None
+        assert len(protocol.transport.sent) == 3
+        assert protocol._pending == {}
+
+    @pytest.mark.asyncio
+    async def test_explicit_timeout_bounds_all_attempts(self):
+        protocol = DanteUnicastProtocol()
+        protocol.transport = FakeTransport()
+        protocol.estimator(self.ADDR).observe(0.02)
+        loop = asyncio.get_running_loop()
+
+        started = loop.time()
+        response = await protocol.send_and_expect(self.PACKET, self.ADDR, 0x0042, timeout=0.5, retransmits=2)
+        elapsed = loop.time() - started
+
+        assert response is None
+        assert len(protocol.transport.sent) == 3
+        assert elapsed == pytest.approx(0.5, abs=0.05)
+
+    @pytest.mark.asyncio
+    async def test_single_attempt_without_retransmits(self):
+        protocol = DanteUnicastProtocol()
+        protocol.transport = FakeTransport()
+        protocol.estimator(self.ADDR).observe(0.001)
+
+        response = await protocol.send_and_expect(self.PACKET, self.ADDR, 0x0042, timeout=0.05, retransmits=0)
+
+        assert response is None
+        assert len(protocol.transport.sent) == 1
+
+    @pytest.mark.asyncio
+    async def test_estimators_are_per_address(self):
+        protocol = DanteUnicastProtocol()
+        protocol.estimator(("192.168.1.1", 4440)).observe(0.05)
+
+        assert protocol.estimator(("192.168.1.1", 8800)).rto == RTO_INITIAL
+        assert protocol.estimator(("192.168.1.2", 4440)).rto == RTO_INITIAL
+
+
 class TestMulticastProtocol:
     def test_callback_invoked(self):
         received = []
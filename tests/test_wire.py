@@ -0,0 +1,108 @@
+import pytest
+
+from netaudio.daemon import wire
+from netaudio.dante.channel import DanteChannel
+from netaudio.dante.device import DanteDevice
+from netaudio.dante.subscription import DanteSubscription
+
+
+def _channel(number, name, friendly_name=None):
+    channel = DanteChannel()
+    channel.number = number
+    channel.name = name
+    channel.friendly_name = friendly_name
+    channel.volume = 42
+    return channel
+
+
+def _device():
+    device = DanteDevice(server_name="dev1.local.")
+    device.name = "dev1"
+    device.ipv4 = "192.168.1.10"
+    device.mac_address = "00:1d:c1:aa:bb:cc"
+    device.sample_rate = 48000
+    device.services = {"dev1._netaudio-arc._udp.local.": {"port": 4440, "properties": {"model": "X"}}}
+    device.tx_channels = {1: _channel(1, "01", "Kick"), 2: _channel(2, "02")}
+    device.rx_channels = {1: _channel(1, "in")}
+
+    subscription = DanteSubscription()
+    subscription.rx_channel_name = "in"
+    subscription.rx_device_name = "dev1"
+    subscription.tx_channel_name = "01"
+    subscription.tx_device_name = "dev2"
+    subscription.status_code = 9
+    subscription.rx_channel_status_code = 9
+    device.subscriptions = [subscription]
+    return device
+
+
+class TestWireFormat:
+    def test_round_trip_views(self):
+        payload = wire.encode_devices({"dev1.local.": _device()})
+        view = wire.decode_devices(payload)["dev1.local."]
+
+        assert view.name == "dev1"
+        assert str(view.ipv4) == "192.168.1.10"
+        assert view.sample_rate == 48000
+        assert view.tx_channels[1].friendly_name == "Kick"
+        assert str(view.tx_channels[1]) == "1:Kick [42]"
+        assert view.rx_channels[1].name == "in"
+        assert view.subscriptions[0].tx_device_name == "dev2"
+        assert view.services["dev1._netaudio-arc._udp.local."]["port"] == 4440
+
+    def test_views_are_read_only(self):
+        view = wire.decode_devices(wire.encode_devices({"dev1.local.": _device()}))["dev1.local."]
+
+        with pytest.raises(AttributeError):
+            view.name = "other"
+        with pytest.raises(AttributeError):
+            view.tx_channels[1].name = "other"
+
+    def test_to_device(self):
+        view = wire.decode_devices(wire.encode_devices({"dev1.local.": _device()}))["dev1.local."]
+        device = view.to_device()
+
+        assert isinstance(device, DanteDevice)
+        assert device.name == "dev1"
+        assert device.mac_address == "00:1d:c1:aa:bb:cc"
+        assert device.tx_channels[2].name == "02"
+        assert device.tx_channels[2].device is device
+        assert device.subscriptions[0].status_code == 9
+        assert device.subscriptions[0].rx_channel_status_code == 9
+
+    def test_decoding_follows_payload_schema(self):
+        record = wire.device_record(_device())
+        fields = list(wire.DEVICE_FIELDS)
+        fields.reverse()
+        schema = {**wire.SCHEMA, "device": fields + ["added_later"]}
+
+        views = wire.device_views(schema, [list(reversed(record)) + ["x"]])
+
+        assert views["dev1.local."].name == "dev1"
+        assert views["dev1.local."].added_later == "x"
+        assert views["dev1.local."].not_in_schema is None
+
+    def test_rejects_foreign_payloads(self):
+        with pytest.raises(wire.WireFormatError):
+            wire.decode_document(b"\x80\x04}q\x00.")
+
+    def test_device_map_materialises_only_what_is_read(self):
+        from netaudio._common import find_device
+        from netaudio.daemon.query import DeviceQuery
+
+        devices = {}
+        for index in range(3):
+            device = _device()
+            device.server_name = f"dev{index}.local."
+            device.name = f"dev{index}"
+            devices[device.server_name] = device
+        device_map = wire.DeviceMap(wire.decode_devices(wire.encode_devices(devices)))
+
+        found = find_device(device_map, "dev1")
+        selected = DeviceQuery(names=["dev2"]).select(device_map)
+
+        assert isinstance(found, DanteDevice)
+        assert found.tx_channels[1].friendly_name == "Kick"
+        assert list(device_map._devices) == ["dev1.local."]
+        assert list(selected) == ["dev2.local."]
+        assert device_map["dev1.local."] is found